@@ -2,4 +2,9 @@
 Fermentation simulator core package.
 Exposes high-level APIs for simulation and control.
 """
+import time
+
+# Reference point for import/startup timing reported via /meta/metrics
+IMPORT_STARTED = time.perf_counter()
+
 __all__ = ["config"]
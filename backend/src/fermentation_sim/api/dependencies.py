@@ -1,11 +1,22 @@
+import time
 from functools import lru_cache
 
 from fermentation_sim.config import settings
 from ..services.simulation_service import SimulationService
 from fermentation_sim.utils.logging_config import configure_logging
+from fermentation_sim.utils.metrics import STARTUP_SECONDS
+from fermentation_sim.utils.singleflight import SingleFlight
 
 
 @lru_cache(maxsize=1)
 def get_simulation_service() -> SimulationService:
     configure_logging(debug=settings.debug)
-    return SimulationService()
+    started = time.perf_counter()
+    service = SimulationService()  # cheap: the C library and presets load on first use
+    STARTUP_SECONDS.set(time.perf_counter() - started, phase="service_init")
+    return service
+
+
+@lru_cache(maxsize=1)
+def get_run_coalescer() -> SingleFlight:
+    return SingleFlight()
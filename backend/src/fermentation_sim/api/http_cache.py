@@ -0,0 +1,44 @@
+import hashlib
+import json
+from dataclasses import dataclass
+
+from fastapi import Request, Response
+
+from fermentation_sim.config import settings
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """Pre-serialized JSON body with a strong ETag derived from its content and data version."""
+
+    body: bytes
+    etag: str
+    version: str
+
+
+def freeze_json(content, version: str) -> CachedBody:
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:24]
+    return CachedBody(body=body, etag=f'"{version}-{digest}"', version=version)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2)
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def cached_json_response(request: Request, cached: CachedBody) -> Response:
+    """Serve `cached` as-is, or 304 when the client already holds this version."""
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={settings.static_cache_max_age}",
+        "X-Data-Version": cached.version,
+    }
+    if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
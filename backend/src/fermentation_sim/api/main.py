@@ -1,11 +1,26 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from fermentation_sim.api.routes import simulation, metadata, presets
+import fermentation_sim
+from fermentation_sim.api.routes import jobs, simulation, metadata, presets
 from fermentation_sim.config import settings
+from fermentation_sim.models.base import SolverError
+from fermentation_sim.services.job_queue import shutdown_job_workers
+from fermentation_sim.utils.metrics import STARTUP_SECONDS
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_job_workers()
 
 
 def create_app() -> FastAPI:
+    started = time.perf_counter()
     app = FastAPI(
         title=settings.api_title,
         version=settings.api_version,
@@ -13,6 +28,7 @@ def create_app() -> FastAPI:
             "Virtual fermentation simulator for process development, training "
             "and control strategy prototyping. Not validated for regulatory use."
         ),
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -23,10 +39,20 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    @app.exception_handler(SolverError)
+    async def solver_error_handler(request: Request, exc: SolverError) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Integration failed", "reason": exc.reason, "message": exc.detail},
+        )
+
     app.include_router(metadata.router)
     app.include_router(presets.router)
     app.include_router(simulation.router)
+    app.include_router(jobs.router)
+    STARTUP_SECONDS.set(time.perf_counter() - started, phase="create_app")
     return app
 
 
+STARTUP_SECONDS.set(time.perf_counter() - fermentation_sim.IMPORT_STARTED, phase="import")
 app = create_app()
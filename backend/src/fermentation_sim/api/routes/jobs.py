@@ -0,0 +1,144 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from fermentation_sim.config import settings
+from fermentation_sim.services.job_queue import (
+    TERMINAL_STATES,
+    ensure_job_workers,
+    get_job_store,
+)
+from fermentation_sim.services.resources import (
+    RESPONSE_BYTES_PER_POINT,
+    ResourceLimitExceeded,
+    check_job,
+    estimate_run,
+)
+from fermentation_sim.utils.serialization import clean_non_finite, column_to_list
+from fermentation_sim.utils.validation import SimulationRequest
+
+router = APIRouter(prefix="/simulation/jobs", tags=["jobs"])
+
+_PUBLIC_FIELDS = (
+    "id", "status", "priority", "mode", "progress", "error",
+    "created_at", "started_at", "finished_at", "max_seconds", "max_memory_mb",
+)
+
+
+def _public(job: dict) -> dict:
+    view = {k: job[k] for k in _PUBLIC_FIELDS}
+    view["links"] = {
+        "self": f"/simulation/jobs/{job['id']}",
+        "events": f"/simulation/jobs/{job['id']}/events",
+        "result": f"/simulation/jobs/{job['id']}/result",
+    }
+    return view
+
+
+def _get_or_404(job_id: str) -> dict:
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("", status_code=202)
+def submit_job(
+    payload: SimulationRequest,
+    mode: str = Query("batch", pattern="^(batch|fed_batch)$"),
+    priority: int = Query(0, ge=0, le=9, description="Higher runs first; >= job_interactive_priority uses reserved workers"),
+    max_seconds: float | None = Query(None, gt=0, description="Wall-clock limit for the run"),
+    max_memory_mb: int | None = Query(None, gt=0, description="Address-space limit for the run"),
+):
+    """Queue a simulation for a local worker process; poll or subscribe for progress."""
+    try:
+        check_job(estimate_run(payload))
+    except ResourceLimitExceeded as exc:
+        raise HTTPException(status_code=413, detail=exc.detail())
+    return enqueue(payload, mode, priority, max_seconds, max_memory_mb)
+
+
+def enqueue(
+    payload: SimulationRequest,
+    mode: str,
+    priority: int = 0,
+    max_seconds: float | None = None,
+    max_memory_mb: int | None = None,
+) -> dict:
+    """Submit a job (starting local workers if configured); returns its public view."""
+    if settings.job_autostart_workers:
+        ensure_job_workers()
+    job_id = get_job_store().submit(
+        payload, mode=mode, priority=priority, max_seconds=max_seconds, max_memory_mb=max_memory_mb
+    )
+    return _public(_get_or_404(job_id))
+
+
+@router.get("/{job_id}")
+def job_status(job_id: str):
+    return _public(_get_or_404(job_id))
+
+
+@router.delete("/{job_id}")
+def cancel_job(job_id: str):
+    _get_or_404(job_id)
+    return _public(get_job_store().cancel(job_id))
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str, interval: float = Query(0.5, gt=0, le=10)):
+    """Server-sent events with the job status whenever it changes, until it finishes."""
+    await run_in_threadpool(_get_or_404, job_id)
+
+    async def stream():
+        last = None
+        while True:
+            job = await run_in_threadpool(get_job_store().get, job_id)
+            view = _public(job)
+            if view != last:
+                yield f"event: status\ndata: {json.dumps(view)}\n\n"
+                last = view
+            if job["status"] in TERMINAL_STATES:
+                return
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+@router.get("/{job_id}/result")
+def job_result(job_id: str, format: str = Query("json", pattern="^(json|npz)$")):
+    """Fetch a finished job as the /simulation/run JSON shape or as an .npz (time, state)."""
+    job = _get_or_404(job_id)
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    store = get_job_store()
+    if format == "npz":
+        body = store.result_bytes(job_id)
+        if body is None:
+            raise HTTPException(status_code=410, detail="Result file no longer available")
+        return Response(
+            content=body,
+            media_type="application/x-npz",
+            headers={"Content-Disposition": f'attachment; filename="{job_id}.npz"'},
+        )
+
+    arrays = store.load_result(job_id)
+    if arrays is None:
+        raise HTTPException(status_code=410, detail="Result file no longer available")
+    if arrays["time"].size * RESPONSE_BYTES_PER_POINT > settings.max_inline_memory_mb * 2**20:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{arrays['time'].size} points exceed max_inline_memory_mb as JSON; use format=npz",
+        )
+    state = arrays["state"]
+    content = {
+        "meta": {**job["result_meta"], "job_id": job_id},
+        "time": arrays["time"].tolist(),
+        "states": {
+            name: column_to_list(state[:, i]) for i, name in enumerate(("X", "S", "P", "DO", "T", "V"))
+        },
+    }
+    return JSONResponse(content=clean_non_finite(content))
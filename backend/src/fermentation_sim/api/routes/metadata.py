@@ -1,23 +1,43 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from fermentation_sim.api.http_cache import cached_json_response, freeze_json
+from fermentation_sim.config import settings
+from fermentation_sim.models.c_binding import c_library_status
+from fermentation_sim.utils.metrics import REGISTRY
 
 router = APIRouter(prefix="/meta", tags=["metadata"])
 
 
 @router.get("/health")
 async def health_check() -> dict:
-    return {"status": "ok"}
+    # Reports the C core without forcing a load; "unavailable" means Python fallback only
+    c_core = c_library_status()
+    return {"status": "ok", "degraded": c_core["state"] == "unavailable", "c_core": c_core}
+
+
+VARIABLES = {
+    "states": [
+        {"name": "X", "label": "Biomass", "unit": "g/L"},
+        {"name": "S", "label": "Substrate", "unit": "g/L"},
+        {"name": "P", "label": "Product", "unit": "g/L"},
+        {"name": "DO", "label": "Dissolved Oxygen", "unit": "g/L"},
+        {"name": "T", "label": "Temperature", "unit": "°C"},
+    ],
+    "modes": ["batch", "fed_batch"],
+}
+
+# Static per deploy: serialized once, versioned by the API version
+_VARIABLES_BODY = freeze_json(VARIABLES, settings.api_version)
 
 
 @router.get("/variables")
-async def variables() -> dict:
+async def variables(request: Request):
     """Describe variables for the frontend."""
-    return {
-        "states": [
-            {"name": "X", "label": "Biomass", "unit": "g/L"},
-            {"name": "S", "label": "Substrate", "unit": "g/L"},
-            {"name": "P", "label": "Product", "unit": "g/L"},
-            {"name": "DO", "label": "Dissolved Oxygen", "unit": "g/L"},
-            {"name": "T", "label": "Temperature", "unit": "°C"},
-        ],
-        "modes": ["batch", "fed_batch"],
-    }
+    return cached_json_response(request, _VARIABLES_BODY)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text-format export of in-process counters and histograms."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -1,34 +1,65 @@
-from fastapi import APIRouter, HTTPException
+from functools import lru_cache
 
+from fastapi import APIRouter, HTTPException, Request
+
+from fermentation_sim.api.http_cache import CachedBody, cached_json_response, freeze_json
 from fermentation_sim.data.preset_service import list_microbes, list_substrates, get_preset, flatten_preset
+from fermentation_sim.data.preset_store import get_preset_store
 
 router = APIRouter(prefix="/presets", tags=["presets"])
 
+# Bodies are keyed by the preset store version, so swapping the store (or its
+# file) invalidates both the server-side copies and client ETags.
 
-@router.get("/microbes")
-async def microbes():
-    return {"microbes": list_microbes()}
 
+@lru_cache(maxsize=4)
+def _microbes_body(version: str) -> CachedBody:
+    return freeze_json({"microbes": list_microbes()}, version)
 
-@router.get("/microbes/{microbe_id}/substrates")
-async def substrates(microbe_id: str):
+
+@lru_cache(maxsize=1024)
+def _substrates_body(version: str, microbe_id: str) -> CachedBody | None:
     subs = list_substrates(microbe_id)
     if not subs:
-        raise HTTPException(status_code=404, detail="Microbe not found or no substrates")
-    return {"microbe_id": microbe_id, "substrates": subs}
+        return None
+    return freeze_json({"microbe_id": microbe_id, "substrates": subs}, version)
 
 
-@router.get("/microbes/{microbe_id}/substrates/{substrate_id}")
-async def preset(microbe_id: str, substrate_id: str):
+@lru_cache(maxsize=4096)
+def _preset_body(version: str, microbe_id: str, substrate_id: str) -> CachedBody | None:
     preset_obj = get_preset(microbe_id, substrate_id)
     if not preset_obj:
-        raise HTTPException(status_code=404, detail="Preset not found")
-    return {
-        "microbe_id": microbe_id,
-        "substrate_id": substrate_id,
-        "label": preset_obj.get("label", f"{microbe_id} on {substrate_id}"),
-        "preset": {
-            "defaults": flatten_preset(preset_obj),
-            "sections": preset_obj,
+        return None
+    return freeze_json(
+        {
+            "microbe_id": microbe_id,
+            "substrate_id": substrate_id,
+            "label": preset_obj.get("label", f"{microbe_id} on {substrate_id}"),
+            "preset": {
+                "defaults": flatten_preset(preset_obj),
+                "sections": preset_obj,
+            },
         },
-    }
+        version,
+    )
+
+
+@router.get("/microbes")
+async def microbes(request: Request):
+    return cached_json_response(request, _microbes_body(get_preset_store().version))
+
+
+@router.get("/microbes/{microbe_id}/substrates")
+async def substrates(microbe_id: str, request: Request):
+    cached = _substrates_body(get_preset_store().version, microbe_id)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Microbe not found or no substrates")
+    return cached_json_response(request, cached)
+
+
+@router.get("/microbes/{microbe_id}/substrates/{substrate_id}")
+async def preset(microbe_id: str, substrate_id: str, request: Request):
+    cached = _preset_body(get_preset_store().version, microbe_id, substrate_id)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Preset not found")
+    return cached_json_response(request, cached)
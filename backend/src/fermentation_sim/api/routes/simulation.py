@@ -1,9 +1,42 @@
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import JSONResponse
+import asyncio
+import io
+import json
+import time
+from typing import Iterator
 
-from fermentation_sim.api.dependencies import get_simulation_service
-from fermentation_sim.services.simulation_service import SimulationService
-from fermentation_sim.utils.validation import SimulationRequest
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from fermentation_sim.api.dependencies import get_run_coalescer, get_simulation_service
+from fermentation_sim.api.routes.jobs import enqueue
+from fermentation_sim.config import settings
+from fermentation_sim.data.preset_service import merge_request_with_preset
+from fermentation_sim.data.result_store import get_result_store
+from fermentation_sim.models.base import SolverError
+from fermentation_sim.services.resources import (
+    ResourceLimitExceeded,
+    check_optimize,
+    estimate_bulk,
+    estimate_optimize,
+    estimate_plant,
+    estimate_run,
+    plan_execution,
+)
+from fermentation_sim.services.simulation_service import STATE_NAMES, SimulationService
+from fermentation_sim.utils.hashing import request_hash
+from fermentation_sim.utils.metrics import EXECUTION_PATHS, REQUEST_SECONDS
+from fermentation_sim.utils.profiling import PhaseTimer
+from fermentation_sim.utils.serialization import clean_non_finite, column_to_list
+from fermentation_sim.utils.singleflight import SingleFlight
+from fermentation_sim.utils.validation import (
+    BulkSimulationRequest,
+    BulkValidationError,
+    OptimizationRequest,
+    PlantRequest,
+    SimulationRequest,
+)
 
 router = APIRouter(prefix="/simulation", tags=["simulation"])
 
@@ -12,28 +45,319 @@ router = APIRouter(prefix="/simulation", tags=["simulation"])
 async def run_simulation(
     payload: SimulationRequest,
     mode: str = Query("batch", pattern="^(batch|fed_batch)$"),
+    timings: bool = Query(False, description="Include per-phase timings in meta.timings"),
+    store: bool = Query(False, description="Archive the trajectory; key returned in meta.result_key"),
+    summary: bool = Query(False, description="Add integrator-tracked key metrics under `summary`"),
+    summary_only: bool = Query(False, description="Return only meta and summary, no trajectory"),
     svc: SimulationService = Depends(get_simulation_service),
+    coalescer: SingleFlight = Depends(get_run_coalescer),
 ):
     """
     Run a fermentation simulation.
 
     Body: SimulationRequest (all parameters).
-    Query param: mode=batch|fed_batch
+    Query param: mode=batch|fed_batch, timings=true to return phase timings (ms),
+    store=true to archive the trajectory in the result store, summary=true to add
+    key metrics (depletion time, DO minimum, T peak, titer, productivity),
+    summary_only=true to skip materializing and shipping the trajectory.
+    Concurrent identical requests share one run and receive the same bytes
+    (header X-Coalesced: true on the joining ones); concurrent runs on the
+    same time grid are integrated together by the micro-batcher.
+
+    Runs whose estimated memory or CPU cost exceeds the inline limits in
+    Settings are, per Settings.oversize_policy, streamed as NDJSON chunks
+    (X-Execution: stream) or queued as a job (202 with the job, X-Execution:
+    job); runs that fit no path, or that need the whole trajectory in memory
+    (store, summary), get 413 with the estimate.
     """
-    result = svc.run_simulation(payload, mode=mode)  # type: ignore[arg-type]
-    import math
+    if summary_only and store:
+        raise HTTPException(status_code=422, detail="summary_only cannot be combined with store")
+    started = time.perf_counter()
+    if store or summary or summary_only:
+        deferrable: tuple = ()
+    else:
+        deferrable = ("job",) if payload.dense_output else ("stream", "job")
+    estimate = estimate_run(payload, svc.c_available, materialize=not summary_only)
+    try:
+        execution = plan_execution(estimate, deferrable)
+    except ResourceLimitExceeded as exc:
+        EXECUTION_PATHS.inc(path="rejected")
+        raise HTTPException(status_code=413, detail=exc.detail())
+    EXECUTION_PATHS.inc(path=execution)
+    if execution == "job":
+        job = await run_in_threadpool(enqueue, payload, mode)
+        headers = {"Location": job["links"]["self"], "X-Execution": "job"}
+        return JSONResponse(status_code=202, content=job, headers=headers)
+    if execution == "stream":
+        merged = merge_request_with_preset(payload)
+        chunks = _ndjson_chunks(svc, merged, mode)
+        return StreamingResponse(chunks, media_type="application/x-ndjson", headers={"X-Execution": "stream"})
+
+    async def compute() -> tuple[bytes, float]:
+        timer = PhaseTimer()
+        with timer.phase("preset_merge"):
+            merged = merge_request_with_preset(payload)
+        result = await svc.simulate_async(
+            merged, mode, summary=summary or summary_only, materialize=not summary_only  # type: ignore[arg-type]
+        )
+        return await run_in_threadpool(render, merged, result, timer)
+
+    def render(merged: SimulationRequest, result, timer: PhaseTimer) -> tuple[bytes, float]:
+        """(body, serialize seconds); the body is encoded once, so its own encoding is not in meta.timings."""
+        response = svc.respond(merged, mode, result, timer, store=store, summary_only=summary_only)
+
+        # Clean NaNs before returning:
+        with timer.phase("clean"):
+            content = clean_non_finite(response)
+        if timings:
+            content["meta"]["timings"] = timer.as_ms()
+        with timer.phase("serialize"):
+            body = JSONResponse(content=content).body
+        return body, timer.timings["serialize"]
+
+    headers = {}
+    if settings.coalesce_requests:
+        key = _run_key(payload, mode, timings, store, summary, summary_only)
+        try:
+            (body, serialize_s), shared = await coalescer.run(
+                key, compute, timeout=settings.coalesce_wait_seconds
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Identical simulation still running; retry later")
+        headers["X-Coalesced"] = "true" if shared else "false"
+    else:
+        body, serialize_s = await compute()
+    if timings:
+        headers["Server-Timing"] = f"serialize;dur={serialize_s * 1e3:.4f}"
+    REQUEST_SECONDS.observe(time.perf_counter() - started, mode=mode)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _ndjson_chunks(svc: SimulationService, payload: SimulationRequest, mode: str) -> Iterator[bytes]:
+    """
+    A chunked run as NDJSON: a `meta` line, one line per chunk with its
+    `time` and `states` rows, and an `end` line with the run's backend, RHS
+    evaluations and stop reason (or an `error` line if the run fails).
+    """
+    meta = {
+        "mode": mode,
+        "n_points": payload.n_points,
+        "state_dim": len(STATE_NAMES),
+        "dtype": payload.output_precision,
+        "execution": "stream",
+        "request": payload.model_dump(),
+    }
+    yield _ndjson({"meta": meta})
+    rows, rhs_evals, backends, fallback_reason, stop_reason = 0, 0, set(), None, None
+    try:
+        for part in svc.iter_chunks(payload, mode, settings.stream_chunk_points):  # type: ignore[arg-type]
+            rows += part.time.size
+            stop_reason = part.stop_reason
+            if part.rhs_evals:
+                rhs_evals += part.rhs_evals
+                backends.add(part.backend)
+                fallback_reason = fallback_reason or part.fallback_reason
+            states = {name: column_to_list(part.state[:, k]) for k, name in enumerate(STATE_NAMES)}
+            yield _ndjson({"time": part.time.tolist(), "states": states})
+    except SolverError as exc:
+        yield _ndjson({"error": {"reason": exc.reason, "message": exc.detail}})
+        return
+    end = {
+        "n_points": rows,
+        "backend": "c" if backends == {"c"} else "python",
+        "rhs_evals": rhs_evals,
+        "fallback_reason": fallback_reason,
+        "stop_reason": stop_reason,
+    }
+    yield _ndjson({"end": end})
+
 
-    # Clean NaNs before returning:
-    def clean(obj):
-        if isinstance(obj, float):
-            if math.isnan(obj) or math.isinf(obj):
-                return None
-            return obj
-        if isinstance(obj, dict):
-            return {k: clean(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [clean(x) for x in obj]
-        return obj
+def _ndjson(content: dict) -> bytes:
+    return json.dumps(clean_non_finite(content), separators=(",", ":")).encode() + b"\n"
 
-    return JSONResponse(content=clean(result))
 
+def _run_key(payload: SimulationRequest, mode: str, *flags: bool) -> tuple:
+    """
+    Requests coalesce when their canonical hash, query flags and explicitly
+    set fields match; the last matters because presets only fill unset fields.
+    """
+    return (request_hash(payload, mode), tuple(sorted(payload.model_fields_set)), flags)
+
+
+@router.post("/bulk", response_model=dict)
+async def run_bulk(
+    payload: BulkSimulationRequest,
+    trajectories: bool = Query(False, description="Return every scenario's trajectory, not just final states"),
+    format: str = Query("json", pattern="^(json|npz)$"),
+    timings: bool = Query(False, description="Include per-phase timings in meta.timings"),
+    svc: SimulationService = Depends(get_simulation_service),
+):
+    """
+    Run many scenarios on one time grid, submitted column-wise.
+
+    Body: BulkSimulationRequest; `columns` maps SimulationRequest fields to a
+    list with one value per scenario (null: preset or default) or to a
+    scalar shared by all. Constraint violations are returned as 422 with the
+    failing column and row. The response carries the final state of every
+    scenario (`final.<var>[i]`), plus `states.<var>[i]` with trajectories=true;
+    format=npz returns time, final (N, 6), backend and state (N, n_points, 6).
+    Submissions over the inline resource limits get 413 with the estimate.
+    """
+    try:
+        plan_execution(estimate_bulk(payload, svc.c_available, trajectories), deferrable=())
+    except ResourceLimitExceeded as exc:
+        EXECUTION_PATHS.inc(path="rejected")
+        raise HTTPException(status_code=413, detail=exc.detail())
+    EXECUTION_PATHS.inc(path="inline")
+    started = time.perf_counter()
+    timer = PhaseTimer()
+    try:
+        result = await run_in_threadpool(svc.run_bulk, payload, timer, trajectories)
+    except BulkValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors)
+    REQUEST_SECONDS.observe(time.perf_counter() - started, mode="bulk")
+
+    if format == "npz":
+        arrays = {"time": result.time, "final": result.final, "backend": result.backend}
+        if result.state is not None:
+            arrays["state"] = result.state
+        return _slice_response(arrays, format, {})
+    backends, counts = np.unique(result.backend, return_counts=True)
+    with timer.phase("tolist"):
+        content = {
+            "meta": {
+                "n_scenarios": int(result.final.shape[0]),
+                "n_points": int(result.time.size),
+                "dtype": result.final.dtype.name,
+                "backends": {str(b): int(c) for b, c in zip(backends, counts)},
+                "fallback_rows": np.flatnonzero(result.backend != "c").tolist(),
+                "rhs_evals": int(result.rhs_evals.sum()),
+            },
+            "time": result.time.tolist(),
+            "final": {name: column_to_list(result.final[:, k]) for k, name in enumerate(STATE_NAMES)},
+        }
+        if result.state is not None:
+            content["states"] = {
+                name: [column_to_list(row) for row in result.state[:, :, k]] for k, name in enumerate(STATE_NAMES)
+            }
+    with timer.phase("clean"):
+        content = clean_non_finite(content)
+    if timings:
+        content["meta"]["timings"] = timer.as_ms()
+    return JSONResponse(content=content)
+
+
+@router.post("/plant", response_model=dict)
+async def run_plant(
+    payload: PlantRequest,
+    timings: bool = Query(False, description="Include per-phase timings in meta.timings"),
+    svc: SimulationService = Depends(get_simulation_service),
+):
+    """
+    Simulate several vessels as one coupled system: seed -> production transfers,
+    a shared coolant loop and a shared air supply. Per-vessel states are under
+    `vessels.<name>`, utility trajectories under `utilities`.
+    Runs over the inline resource limits get 413 with the estimate.
+    """
+    try:
+        plan_execution(estimate_plant(payload), deferrable=())
+    except ResourceLimitExceeded as exc:
+        EXECUTION_PATHS.inc(path="rejected")
+        raise HTTPException(status_code=413, detail=exc.detail())
+    EXECUTION_PATHS.inc(path="inline")
+    started = time.perf_counter()
+    timer = PhaseTimer()
+    result = await run_in_threadpool(svc.run_plant, payload, timer)
+    with timer.phase("clean"):
+        content = clean_non_finite(result)
+    if timings:
+        content["meta"]["timings"] = timer.as_ms()
+    REQUEST_SECONDS.observe(time.perf_counter() - started, mode="plant")
+    return JSONResponse(content=content)
+
+
+@router.post("/optimize", response_model=dict)
+async def optimize_feed(
+    payload: OptimizationRequest,
+    timings: bool = Query(False, description="Include per-phase timings in meta.timings"),
+    svc: SimulationService = Depends(get_simulation_service),
+):
+    """
+    Search feed parameters within `bounds` for each requested feed mode,
+    maximizing titer, productivity or yield subject to the optional min_DO,
+    max_T and max_volume limits. Returns the best strategy overall, the best
+    per mode (with a ready-to-run request) and the per-generation history.
+    Searches whose estimated cost exceeds max_optimize_cpu_seconds or
+    max_inline_memory_mb get 413 with the estimate.
+    """
+    try:
+        check_optimize(estimate_optimize(payload))
+    except ResourceLimitExceeded as exc:
+        EXECUTION_PATHS.inc(path="rejected")
+        raise HTTPException(status_code=413, detail=exc.detail())
+    EXECUTION_PATHS.inc(path="inline")
+    started = time.perf_counter()
+    timer = PhaseTimer()
+    result = await run_in_threadpool(svc.optimize, payload, timer)
+    with timer.phase("clean"):
+        content = clean_non_finite(result)
+    if timings:
+        content["meta"]["timings"] = timer.as_ms()
+    REQUEST_SECONDS.observe(time.perf_counter() - started, mode="optimize")
+    return JSONResponse(content=content)
+
+
+def _slice_response(slices: dict, format: str, meta: dict) -> Response:
+    if format == "npz":
+        buf = io.BytesIO()
+        np.savez(buf, **{name: np.asarray(arr) for name, arr in slices.items()})
+        return Response(content=buf.getvalue(), media_type="application/x-npz")
+    content = {"meta": meta, **{name: column_to_list(np.asarray(arr)) for name, arr in slices.items()}}
+    return JSONResponse(content=clean_non_finite(content))
+
+
+@router.get("/results/{key}")
+def stored_result(
+    key: str,
+    variables: str | None = Query(None, description="Comma-separated subset of X,S,P,DO,T,V"),
+    t_min: float | None = None,
+    t_max: float | None = None,
+    format: str = Query("json", pattern="^(json|npz)$"),
+):
+    """Slice an archived trajectory by variable and time window."""
+    names = variables.split(",") if variables else None
+    try:
+        data = get_result_store().read(key, names, t_min, t_max)
+    except KeyError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if data is None:
+        raise HTTPException(status_code=404, detail="Result not found")
+    info = get_result_store().info(key)
+    return _slice_response(data, format, {"key": key, "mode": info.mode, "n_points": info.n_points})
+
+
+@router.get("/results")
+def stored_results(
+    keys: str = Query(..., description="Comma-separated result keys"),
+    variable: str = Query("X", pattern="^(X|S|P|DO|T|V)$"),
+    t_min: float | None = None,
+    t_max: float | None = None,
+    format: str = Query("json", pattern="^(json|npz)$"),
+):
+    """One variable over a time window for a subset of archived scenarios."""
+    found = get_result_store().read_many(keys.split(","), variable, t_min, t_max)
+    if format == "npz":
+        flat = {}
+        for key, data in found.items():
+            flat[f"{key}/time"] = data["time"]
+            flat[f"{key}/{variable}"] = data[variable]
+        return _slice_response(flat, format, {})
+    content = {
+        "variable": variable,
+        "results": {
+            key: {"time": np.asarray(d["time"]).tolist(), variable: column_to_list(np.asarray(d[variable]))}
+            for key, d in found.items()
+        },
+        "missing": [k for k in keys.split(",") if k not in found],
+    }
+    return JSONResponse(content=clean_non_finite(content))
@@ -1,4 +1,6 @@
+import tempfile
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -12,6 +14,68 @@ class Settings(BaseModel):
     c_library_path: str = Field(
         default=str(Path(__file__).resolve().parents[3] / "c_core" / "libfermentation.so")
     )
+    # JSON (.json) or SQLite (.sqlite/.db) preset file
+    preset_path: str = Field(
+        default=str(Path(__file__).resolve().parent / "data" / "presets.json")
+    )
+
+    # Browser/proxy cache lifetime for static preset and metadata responses
+    static_cache_max_age: int = Field(300, ge=0, description="Cache-Control max-age (s)")
+
+    # What to do when the C integrator fails: fall back to Python, raise, or
+    # retry the C core on a refined grid before falling back.
+    c_failure_policy: Literal["fallback", "fail_fast", "retry_smaller_step"] = "fallback"
+    c_retry_refine: int = Field(4, ge=2, description="Grid refinement factor for C retries")
+    c_breaker_threshold: int = Field(5, ge=1, description="Consecutive C failures before opening")
+    c_breaker_reset_s: float = Field(60.0, gt=0, description="Seconds before a half-open C trial")
+
+    # Recent trajectories kept for suffix-only re-simulation (feed parameter tweaks)
+    incremental_cache_entries: int = Field(32, ge=1)
+
+    # Identical concurrent /simulation/run requests share one computation
+    coalesce_requests: bool = True
+    coalesce_wait_seconds: float = Field(
+        30.0, gt=0, description="Longest a joining request waits for the shared run (s)"
+    )
+
+    # Concurrent /simulation/run requests on the same grid are integrated together;
+    # the first waits up to the window for others to join (0 disables batching)
+    micro_batch_window_ms: float = Field(2.0, ge=0)
+    micro_batch_max: int = Field(64, ge=1, description="Dispatch as soon as this many are waiting")
+
+    # Dense-output runs given t_eval without solver_dt choose their solver step by
+    # step doubling to these tolerances, down to dense_solver_dt at the finest
+    dense_solver_dt: float = Field(
+        0.01, gt=0, description="Smallest chosen solver step (h); the step used without the C core"
+    )
+    dense_rtol: float = Field(1e-3, gt=0, description="Default relative tolerance of the chosen step")
+    dense_atol: float = Field(1e-6, gt=0, description="Absolute tolerance of the chosen step")
+
+    # Asynchronous job queue (SQLite + result files under job_dir, local worker processes)
+    job_dir: str = Field(default=str(Path(tempfile.gettempdir()) / "fermentation_sim" / "jobs"))
+    job_autostart_workers: bool = Field(True, description="Spawn local workers on first submit")
+    job_workers: int = Field(2, ge=1)
+    job_interactive_workers: int = Field(1, ge=0, description="Workers reserved for high priority")
+    job_interactive_priority: int = Field(5, ge=0, le=9)
+    job_chunk_points: int = Field(2000, ge=2, description="Output points per progress checkpoint")
+
+    # Per-request resource limits, checked against an estimate made before running
+    # (services/resources.py). Runs over the inline limits are streamed as NDJSON
+    # chunks or queued as jobs per oversize_policy, else rejected with 413.
+    max_inline_memory_mb: float = Field(512.0, gt=0, description="Largest response built in memory")
+    max_inline_cpu_seconds: float = Field(30.0, gt=0, description="Longest run served synchronously")
+    max_job_memory_mb: float = Field(4096.0, gt=0, description="Largest chunked run admitted as a job")
+    max_optimize_cpu_seconds: float = Field(
+        120.0, gt=0, description="Longest feed-strategy search accepted by /simulation/optimize"
+    )
+    oversize_policy: Literal["job", "stream", "reject"] = "job"
+    stream_chunk_points: int = Field(10000, ge=2, description="Output points per streamed NDJSON line")
+
+    # Memory-mapped trajectory archive keyed by request hash
+    result_store_dir: str = Field(
+        default=str(Path(tempfile.gettempdir()) / "fermentation_sim" / "results")
+    )
+    result_chunk_rows: int = Field(65536, ge=1, description="Time rows per on-disk state chunk")
 
 
 settings = Settings()
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+from typing import Dict
+
+import numpy as np
+
 from fermentation_sim.data.microbe_database import (
     flatten_preset,
     get_preset,
     list_microbes,
     list_substrates,
 )
-from fermentation_sim.utils.validation import SimulationRequest
+from fermentation_sim.data.preset_store import get_preset_store
+from fermentation_sim.utils.validation import SCENARIO_FIELDS, STRING_FIELDS, SimulationRequest
 
 
 def merge_request_with_preset(payload: SimulationRequest) -> SimulationRequest:
@@ -15,31 +20,68 @@ def merge_request_with_preset(payload: SimulationRequest) -> SimulationRequest:
 
     - If microbe_id/substrate_id missing or preset not found: return payload as-is.
     - Uses model_fields_set to detect user-provided overrides; preset only fills missing fields.
+    - Presets are pre-validated by the store, so no second validation pass runs here.
     """
     if not payload.microbe_id or not payload.substrate_id:
         return payload
 
-    preset = get_preset(payload.microbe_id, payload.substrate_id)
-    if not preset:
+    preset = get_preset_store().get(payload.microbe_id, payload.substrate_id)
+    if preset is None:
         return payload
+    return preset.apply(payload)
+
+
+def merge_columns_with_presets(columns: Dict[str, np.ndarray], n: int) -> Dict[str, np.ndarray]:
+    """
+    Column-wise merge_request_with_preset for `n` scenarios: unset entries
+    (missing column, NaN or None) take the value of the scenario's preset,
+    looked up once per distinct microbe/substrate pair, else the field
+    default. Returns a complete set of scenario columns; `columns` is not
+    modified.
+    """
+    merged = {name: columns[name].copy() for name in columns}
+    store = get_preset_store()
+    microbes = columns.get("microbe_id", np.full(n, None, dtype=object))
+    substrates = columns.get("substrate_id", np.full(n, None, dtype=object))
+    pairs: Dict[tuple, list] = {}
+    for row, pair in enumerate(zip(microbes, substrates)):
+        pairs.setdefault(pair, []).append(row)
+
+    for (microbe_id, substrate_id), rows in pairs.items():
+        preset = store.get(microbe_id, substrate_id) if microbe_id and substrate_id else None
+        if preset is None:
+            continue
+        rows = np.asarray(rows)
+        for name, value in preset.defaults.items():
+            if name not in SCENARIO_FIELDS:
+                continue  # the time grid is shared by the whole submission
+            column = merged.get(name)
+            if column is None:
+                column = merged[name] = _unset_column(name, n)
+            unset = rows[_is_unset(column[rows])]
+            column[unset] = value
+
+    for name in SCENARIO_FIELDS:
+        column = merged.get(name)
+        if column is None:
+            column = merged[name] = _unset_column(name, n)
+        column[_is_unset(column)] = SimulationRequest.model_fields[name].default
+    return merged
+
 
-    provided = payload.model_fields_set
-    data = payload.model_dump()
-    preset_flat = flatten_preset(preset)
+def _unset_column(name: str, n: int) -> np.ndarray:
+    return np.full(n, None, dtype=object) if name in STRING_FIELDS else np.full(n, np.nan)
 
-    for key, val in preset_flat.items():
-        if key not in provided:
-            data[key] = val
 
-    # keep the selectors
-    data["microbe_id"] = payload.microbe_id
-    data["substrate_id"] = payload.substrate_id
-    return SimulationRequest(**data)
+def _is_unset(values: np.ndarray) -> np.ndarray:
+    return np.isnan(values) if values.dtype.kind == "f" else np.equal(values, None)
 
 
 __all__ = [
     "list_microbes",
     "list_substrates",
     "get_preset",
+    "flatten_preset",
+    "merge_columns_with_presets",
     "merge_request_with_preset",
 ]
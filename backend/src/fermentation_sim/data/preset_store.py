@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+
+from fermentation_sim.config import settings
+from fermentation_sim.utils.metrics import STARTUP_SECONDS
+from fermentation_sim.utils.validation import SimulationRequest
+
+# Preset sections merged (in order) into flat SimulationRequest defaults.
+SECTIONS = ("default_initials", "kinetics", "thermal", "mass_transfer", "operations")
+
+
+def flatten_preset(preset: dict) -> dict:
+    """Flatten preset sections into a single dict keyed by SimulationRequest fields."""
+    merged: dict = {}
+    for section in SECTIONS:
+        merged.update(preset.get(section, {}))
+    return merged
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPreset:
+    """A microbe/substrate preset flattened and validated once, held read-only."""
+
+    microbe_id: str
+    substrate_id: str
+    label: str
+    sections: Mapping[str, Mapping[str, float]]
+    defaults: Mapping[str, float]
+
+    def apply(self, payload: SimulationRequest) -> SimulationRequest:
+        """
+        Fill fields the user did not set from the preset.
+
+        Defaults were validated at compile time and user fields when the payload
+        was parsed, so the merge is a plain model copy without re-validation.
+        """
+        provided = payload.model_fields_set
+        update = {k: v for k, v in self.defaults.items() if k not in provided}
+        update["microbe_id"] = self.microbe_id
+        update["substrate_id"] = self.substrate_id
+        return payload.model_copy(update=update)
+
+
+def compile_preset(microbe_id: str, substrate_id: str, preset: dict) -> CompiledPreset:
+    """Validate a raw preset against SimulationRequest; raises ValidationError if invalid."""
+    flat = flatten_preset(preset)
+    known = {k: v for k, v in flat.items() if k in SimulationRequest.model_fields}
+    validated = SimulationRequest(**known)
+    defaults = {k: getattr(validated, k) for k in known}
+    return CompiledPreset(
+        microbe_id=microbe_id,
+        substrate_id=substrate_id,
+        label=preset.get("label", f"{microbe_id} on {substrate_id}"),
+        sections=MappingProxyType(
+            {name: MappingProxyType(dict(preset[name])) for name in SECTIONS if name in preset}
+        ),
+        defaults=MappingProxyType(defaults),
+    )
+
+
+class _JsonBackend:
+    """`{"format": 1, "microbes": {microbe_id: {substrate_id: preset}}}` loaded in one read."""
+
+    def __init__(self, path: Path) -> None:
+        with path.open("r", encoding="utf-8") as fh:
+            self._data: Dict[str, Dict[str, dict]] = json.load(fh)["microbes"]
+
+    def index(self) -> Dict[str, Dict[str, str]]:
+        return {
+            microbe_id: {sub_id: p.get("label", sub_id) for sub_id, p in subs.items()}
+            for microbe_id, subs in self._data.items()
+        }
+
+    def load(self, microbe_id: str, substrate_id: str) -> Optional[dict]:
+        return self._data.get(microbe_id, {}).get(substrate_id)
+
+
+class _SqliteBackend:
+    """Table `presets(microbe_id, substrate_id, label, data)`; rows are fetched on demand."""
+
+    def __init__(self, path: Path) -> None:
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def index(self) -> Dict[str, Dict[str, str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT microbe_id, substrate_id, label FROM presets ORDER BY rowid"
+            ).fetchall()
+        index: Dict[str, Dict[str, str]] = {}
+        for microbe_id, substrate_id, label in rows:
+            index.setdefault(microbe_id, {})[substrate_id] = label
+        return index
+
+    def load(self, microbe_id: str, substrate_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT label, data FROM presets WHERE microbe_id = ? AND substrate_id = ?",
+                (microbe_id, substrate_id),
+            ).fetchone()
+        if row is None:
+            return None
+        preset = json.loads(row[1])
+        preset.setdefault("label", row[0])
+        return preset
+
+
+def export_sqlite(store: "PresetStore", path: str | Path) -> Path:
+    """Write every preset of `store` into an indexed SQLite file."""
+    path = Path(path)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS presets ("
+            " microbe_id TEXT NOT NULL, substrate_id TEXT NOT NULL, label TEXT NOT NULL,"
+            " data TEXT NOT NULL, PRIMARY KEY (microbe_id, substrate_id))"
+        )
+        for microbe_id, subs in store.index().items():
+            for substrate_id, label in subs.items():
+                conn.execute(
+                    "INSERT OR REPLACE INTO presets VALUES (?, ?, ?, ?)",
+                    (microbe_id, substrate_id, label, json.dumps(store.raw(microbe_id, substrate_id))),
+                )
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+class PresetStore:
+    """
+    Indexed, read-only preset store backed by a JSON or SQLite file.
+
+    The index (ids and labels) is read on first use; presets are compiled on
+    first lookup and cached for the lifetime of the store.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._backend: _JsonBackend | _SqliteBackend | None = None
+        self._index: Dict[str, Dict[str, str]] | None = None
+        self._compiled: Dict[tuple, Optional[CompiledPreset]] = {}
+        self._version: str | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        if self._index is not None:
+            return
+        with self._lock:
+            if self._index is not None:
+                return
+            started = time.perf_counter()
+            if self.path.suffix in (".sqlite", ".sqlite3", ".db"):
+                backend: _JsonBackend | _SqliteBackend = _SqliteBackend(self.path)
+            else:
+                backend = _JsonBackend(self.path)
+            self._backend = backend
+            self._index = backend.index()
+            STARTUP_SECONDS.set(time.perf_counter() - started, phase="presets_load")
+
+    @property
+    def version(self) -> str:
+        """Content hash of the backing file; changes whenever the presets change."""
+        if self._version is None:
+            self._version = hashlib.sha256(self.path.read_bytes()).hexdigest()[:16]
+        return self._version
+
+    def index(self) -> Dict[str, Dict[str, str]]:
+        self._ensure_loaded()
+        return self._index  # type: ignore[return-value]
+
+    def list_microbes(self) -> List[dict]:
+        return [
+            {"id": microbe_id, "label": next(iter(subs.values()), microbe_id).split(" on ")[0].strip()}
+            for microbe_id, subs in self.index().items()
+        ]
+
+    def list_substrates(self, microbe_id: str) -> List[dict]:
+        subs = self.index().get(microbe_id, {})
+        return [{"id": substrate_id, "label": label} for substrate_id, label in subs.items()]
+
+    def raw(self, microbe_id: str, substrate_id: str) -> Optional[dict]:
+        if substrate_id not in self.index().get(microbe_id, {}):
+            return None
+        return self._backend.load(microbe_id, substrate_id)  # type: ignore[union-attr]
+
+    def get(self, microbe_id: str, substrate_id: str) -> Optional[CompiledPreset]:
+        key = (microbe_id, substrate_id)
+        if key not in self._compiled:
+            raw = self.raw(microbe_id, substrate_id)
+            self._compiled[key] = compile_preset(microbe_id, substrate_id, raw) if raw else None
+        return self._compiled[key]
+
+    def compile_all(self) -> int:
+        """Compile (and thereby validate) every preset; returns the count."""
+        count = 0
+        for microbe_id, subs in self.index().items():
+            for substrate_id in subs:
+                count += self.get(microbe_id, substrate_id) is not None
+        return count
+
+
+@lru_cache(maxsize=1)
+def get_preset_store() -> PresetStore:
+    return PresetStore(settings.preset_path)
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from fermentation_sim.config import settings
+
+STATE_NAMES = ("X", "S", "P", "DO", "T", "V")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    mode TEXT NOT NULL,
+    n_points INTEGER NOT NULL,
+    state_dim INTEGER NOT NULL,
+    dtype TEXT NOT NULL,
+    chunk_rows INTEGER NOT NULL,
+    n_chunks INTEGER NOT NULL,
+    t_start REAL NOT NULL,
+    t_end REAL NOT NULL,
+    meta TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_mode ON results (mode, created_at);
+"""
+
+
+@dataclass(frozen=True)
+class StoredResult:
+    key: str
+    mode: str
+    n_points: int
+    state_dim: int
+    dtype: str
+    chunk_rows: int
+    n_chunks: int
+    t_start: float
+    t_end: float
+    meta: dict
+
+
+class ResultStore:
+    """
+    On-disk trajectory archive keyed by request hash.
+
+    Layout per result: `<root>/<key[:2]>/<key>/time.npy` plus
+    `state/<chunk>.npy`, each chunk holding `chunk_rows` time rows stored
+    variable-major (state_dim, rows) so a single variable over a time window is
+    one contiguous run inside a chunk. Files are opened memory-mapped; reads
+    that fall inside one chunk are zero-copy views, reads spanning chunks are
+    concatenated.
+    """
+
+    def __init__(self, root: str | Path, chunk_rows: int = 65536) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.chunk_rows = chunk_rows
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """An autocommit connection, closed on exit (sqlite3's own context manager does not close)."""
+        conn = sqlite3.connect(self.root / "index.sqlite", timeout=30.0, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def _dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def info(self, key: str) -> Optional[StoredResult]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT key, mode, n_points, state_dim, dtype, chunk_rows, n_chunks, t_start, t_end, meta"
+                " FROM results WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredResult(*row[:9], meta=json.loads(row[9]) if row[9] else {})
+
+    def __contains__(self, key: str) -> bool:
+        return self.info(key) is not None
+
+    def keys(self, mode: str | None = None, limit: int = 1000) -> List[str]:
+        query, args = "SELECT key FROM results", ()
+        if mode:
+            query, args = query + " WHERE mode = ?", (mode,)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY created_at DESC LIMIT ?", (*args, limit))
+            return [r[0] for r in rows.fetchall()]
+
+    def write(
+        self, key: str, time_arr: np.ndarray, state: np.ndarray, mode: str = "batch", meta: dict | None = None
+    ) -> StoredResult:
+        """Persist a trajectory; a key that already exists is left untouched."""
+        existing = self.info(key)
+        if existing is not None:
+            return existing
+        final = self._dir(key)
+        tmp = final.parent / f".{key}.{uuid.uuid4().hex}.tmp"
+        (tmp / "state").mkdir(parents=True)
+        np.save(tmp / "time.npy", np.ascontiguousarray(time_arr))
+        n_chunks = 0
+        for lo in range(0, state.shape[0], self.chunk_rows):
+            chunk = np.ascontiguousarray(state[lo : lo + self.chunk_rows].T)
+            np.save(tmp / "state" / f"{n_chunks:06d}.npy", chunk)
+            n_chunks += 1
+        with self._lock:
+            if final.exists():
+                shutil.rmtree(tmp)
+            else:
+                os.replace(tmp, final)
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        mode,
+                        int(state.shape[0]),
+                        int(state.shape[1]),
+                        state.dtype.str,
+                        self.chunk_rows,
+                        n_chunks,
+                        float(time_arr[0]),
+                        float(time_arr[-1]),
+                        json.dumps(meta or {}),
+                        time.time(),
+                    ),
+                )
+        return self.info(key)  # type: ignore[return-value]
+
+    def _chunk(self, key: str, index: int) -> np.ndarray:
+        return np.load(self._dir(key) / "state" / f"{index:06d}.npy", mmap_mode="r")
+
+    def time(self, key: str) -> np.ndarray:
+        return np.load(self._dir(key) / "time.npy", mmap_mode="r")
+
+    def read(
+        self,
+        key: str,
+        variables: Sequence[str] | None = None,
+        t_min: float | None = None,
+        t_max: float | None = None,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Return {"time": ..., <variable>: ...} for the rows with t_min <= t <= t_max.
+        Arrays are read-only memory-mapped views when the window lies in one chunk.
+        """
+        info = self.info(key)
+        if info is None:
+            return None
+        names = list(variables or STATE_NAMES[: info.state_dim])
+        unknown = [n for n in names if n not in STATE_NAMES[: info.state_dim]]
+        if unknown:
+            raise KeyError(f"Unknown variables: {', '.join(unknown)}")
+        cols = [STATE_NAMES.index(n) for n in names]
+
+        t = self.time(key)
+        lo = 0 if t_min is None else int(np.searchsorted(t, t_min, side="left"))
+        hi = t.size if t_max is None else int(np.searchsorted(t, t_max, side="right"))
+        out: Dict[str, np.ndarray] = {"time": t[lo:hi]}
+        if hi <= lo:
+            return {**out, **{n: np.empty(0, dtype=info.dtype) for n in names}}
+
+        first, last = lo // info.chunk_rows, (hi - 1) // info.chunk_rows
+        parts: Dict[str, List[np.ndarray]] = {n: [] for n in names}
+        for c in range(first, last + 1):
+            chunk = self._chunk(key, c)
+            c_lo = max(lo - c * info.chunk_rows, 0)
+            c_hi = min(hi - c * info.chunk_rows, chunk.shape[1])
+            for name, col in zip(names, cols):
+                parts[name].append(chunk[col, c_lo:c_hi])
+        for name in names:
+            out[name] = parts[name][0] if len(parts[name]) == 1 else np.concatenate(parts[name])
+        return out
+
+    def read_many(
+        self,
+        keys: Iterable[str],
+        variable: str,
+        t_min: float | None = None,
+        t_max: float | None = None,
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """One variable over a time window for a subset of scenarios; unknown keys are skipped."""
+        found = {}
+        for key in keys:
+            data = self.read(key, [variable], t_min, t_max)
+            if data is not None:
+                found[key] = data
+        return found
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            with self._connect() as conn:
+                deleted = conn.execute("DELETE FROM results WHERE key = ?", (key,)).rowcount
+            shutil.rmtree(self._dir(key), ignore_errors=True)
+        return bool(deleted)
+
+
+@lru_cache(maxsize=1)
+def get_result_store() -> ResultStore:
+    return ResultStore(settings.result_store_dir, chunk_rows=settings.result_chunk_rows)
@@ -0,0 +1,427 @@
+"""
+Load-test harness for the API. Serves `api.main:app` with uvicorn in a child
+process on a free localhost port, drives it with a weighted mix of preset
+lookups and simulation runs drawn from the preset database, and reports
+throughput, latency percentiles/histograms and server CPU and memory.
+
+    python -m fermentation_sim.loadtest --concurrency 16 --duration 30 \\
+        --mix preset=4,short=4,long=1,fed_batch=1 --out report.json --compare baseline.json
+
+Reports are JSON so runs on different commits or settings can be compared.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+
+from fermentation_sim.data.microbe_database import get_microbe_db
+
+SCENARIOS = ("preset", "short", "long", "fed_batch")
+DEFAULT_MIX = "preset=4,short=4,long=1,fed_batch=1"
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000,
+)
+FEED_MODES = ("constant", "ramp", "exponential")
+
+RequestSpec = Tuple[str, str, Optional[dict]]  # method, path, JSON body
+
+
+@dataclass
+class Sample:
+    scenario: str
+    started: float  # seconds since the measured phase began
+    latency: float  # seconds
+    status: int  # HTTP status, 0 for transport errors and timeouts
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'preset=4,short=1' -> {'preset': 4.0, 'short': 1.0}; unknown scenarios are rejected."""
+    mix: Dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; expected one of {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1.0)
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight for {name!r}")
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Mix needs at least one scenario with a positive weight")
+    return mix
+
+
+def preset_pairs() -> List[Tuple[str, str]]:
+    return sorted((m, s) for m, subs in get_microbe_db().items() for s in subs)
+
+
+def build_request(scenario: str, rng: random.Random, pairs: Sequence[Tuple[str, str]]) -> RequestSpec:
+    """One request of `scenario` for a random preset pair, with perturbed initial conditions."""
+    microbe, substrate = rng.choice(pairs)
+    if scenario == "preset":
+        return "GET", f"/presets/microbes/{microbe}/substrates/{substrate}", None
+    body = {
+        "microbe_id": microbe,
+        "substrate_id": substrate,
+        "S0": round(rng.uniform(10.0, 40.0), 2),
+        "X0": round(rng.uniform(0.5, 2.0), 2),
+    }
+    if scenario == "short":
+        body.update(t_end=12.0, n_points=121)
+        return "POST", "/simulation/run?mode=batch", body
+    if scenario == "long":
+        body.update(t_end=72.0, n_points=5001)
+        return "POST", "/simulation/run?mode=batch", body
+    feed_rate = round(rng.uniform(0.005, 0.05), 4)
+    body.update(
+        t_end=48.0,
+        n_points=481,
+        feed_mode=rng.choice(FEED_MODES),
+        feed_rate=feed_rate,
+        feed_rate_end=round(feed_rate * rng.uniform(1.0, 3.0), 4),
+        feed_start=round(rng.uniform(2.0, 12.0), 1),
+    )
+    return "POST", "/simulation/run?mode=fed_batch", body
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """uvicorn serving the API in a child process; `pid` is sampled for resource use."""
+
+    def __init__(self, workers: int = 1, startup_timeout: float = 30.0) -> None:
+        self.workers = workers
+        self.startup_timeout = startup_timeout
+        self.port = _free_port()
+        self.proc: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.proc.pid if self.proc is not None else None
+
+    def __enter__(self) -> "LocalServer":
+        src = str(Path(__file__).resolve().parents[1])
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")])))
+        cmd = [
+            sys.executable, "-m", "uvicorn", "fermentation_sim.api.main:app",
+            "--host", "127.0.0.1", "--port", str(self.port), "--log-level", "warning",
+        ]
+        if self.workers > 1:
+            cmd += ["--workers", str(self.workers)]
+        self.proc = subprocess.Popen(cmd, env=env)
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"Server exited during startup (code {self.proc.returncode})")
+            try:
+                if httpx.get(f"{self.url}/meta/health", timeout=1.0).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"Server did not become healthy within {self.startup_timeout}s")
+
+    def __exit__(self, *exc) -> None:
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+
+
+class ResourceSampler:
+    """
+    Samples RSS and CPU time of a process (and its children, e.g. uvicorn
+    workers) from /proc every `interval` seconds. Reports nothing where /proc
+    is unavailable.
+    """
+
+    def __init__(self, pid: Optional[int], interval: float = 0.2) -> None:
+        self.pid = pid
+        self.interval = interval
+        self._rss: List[float] = []
+        self._cpu: List[Tuple[float, float]] = []  # (wall, cpu seconds)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _pids(pid: int) -> List[int]:
+        children = Path(f"/proc/{pid}/task/{pid}/children")
+        found = [pid]
+        if children.exists():
+            for child in children.read_text().split():
+                found += ResourceSampler._pids(int(child))
+        return found
+
+    def _read(self) -> Optional[Tuple[float, float]]:
+        """(RSS bytes, CPU seconds) summed over the process tree."""
+        rss = cpu = 0.0
+        ticks = os.sysconf("SC_CLK_TCK")
+        try:
+            for pid in self._pids(self.pid):
+                stat = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+                cpu += (int(stat[11]) + int(stat[12])) / ticks  # utime + stime
+                rss += int(stat[21]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, IndexError, ValueError):
+            return None
+        return rss, cpu
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            reading = self._read()
+            if reading is not None:
+                self._rss.append(reading[0])
+                self._cpu.append((time.monotonic(), reading[1]))
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "ResourceSampler":
+        if self.pid is not None and Path(f"/proc/{self.pid}").exists():
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def report(self) -> dict:
+        if len(self._cpu) < 2:
+            return {}
+        (t0, c0), (t1, c1) = self._cpu[0], self._cpu[-1]
+        return {
+            "rss_peak_mb": max(self._rss) / 2**20,
+            "rss_mean_mb": float(np.mean(self._rss)) / 2**20,
+            "cpu_seconds": c1 - c0,
+            "cpu_percent_mean": 100.0 * (c1 - c0) / max(t1 - t0, 1e-9),
+            "samples": len(self._rss),
+        }
+
+
+async def drive(
+    base_url: str,
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int] = None,
+    seed: int = 0,
+    timeout: float = 60.0,
+) -> List[Sample]:
+    """
+    `concurrency` closed-loop clients send requests drawn from `mix` until
+    `duration` seconds have passed or `max_requests` were sent.
+    """
+    pairs = preset_pairs()
+    names, weights = list(mix), list(mix.values())
+    samples: List[Sample] = []
+    sent = 0
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def client_loop(client: httpx.AsyncClient, rng: random.Random) -> None:
+        nonlocal sent
+        while time.perf_counter() < deadline and (max_requests is None or sent < max_requests):
+            sent += 1
+            scenario = rng.choices(names, weights)[0]
+            method, path, body = build_request(scenario, rng, pairs)
+            t0 = time.perf_counter()
+            try:
+                resp = await client.request(method, path, json=body)
+                await resp.aread()
+                status = resp.status_code
+            except httpx.HTTPError:
+                status = 0
+            samples.append(Sample(scenario, t0 - started, time.perf_counter() - t0, status))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        await asyncio.gather(*(client_loop(client, random.Random(seed + i)) for i in range(concurrency)))
+    return samples
+
+
+def latency_stats(latencies: Sequence[float], errors: int, elapsed: float) -> dict:
+    """Percentiles (ms), throughput and a per-bucket histogram (upper bounds in ms)."""
+    ms = np.asarray(latencies, dtype="float64") * 1e3
+    edges = np.array(LATENCY_BUCKETS_MS + (np.inf,))
+    counts = np.bincount(np.searchsorted(edges, ms, side="left"), minlength=edges.size)
+    stats = {
+        "count": int(ms.size),
+        "errors": int(errors),
+        "rps": ms.size / elapsed if elapsed > 0 else 0.0,
+        "histogram_ms": {("+Inf" if np.isinf(e) else f"{e:g}"): int(c) for e, c in zip(edges, counts)},
+    }
+    if ms.size:
+        p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+        stats.update(
+            mean_ms=float(ms.mean()),
+            p50_ms=float(p50),
+            p90_ms=float(p90),
+            p99_ms=float(p99),
+            max_ms=float(ms.max()),
+        )
+    return stats
+
+
+def summarize(samples: Sequence[Sample], elapsed: float) -> dict:
+    """Stats over all samples and per scenario; non-2xx/3xx responses count as errors."""
+
+    def stats(group: Sequence[Sample]) -> dict:
+        errors = sum(1 for s in group if not 200 <= s.status < 400)
+        return latency_stats([s.latency for s in group], errors, elapsed)
+
+    scenarios = sorted({s.scenario for s in samples})
+    return {
+        "total": stats(samples),
+        "scenarios": {name: stats([s for s in samples if s.scenario == name]) for name in scenarios},
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_load_test(
+    mix: Dict[str, float],
+    concurrency: int = 8,
+    duration: float = 10.0,
+    warmup: float = 2.0,
+    max_requests: Optional[int] = None,
+    seed: int = 0,
+    url: Optional[str] = None,
+    server_pid: Optional[int] = None,
+    workers: int = 1,
+) -> dict:
+    """
+    Full run: start a local server (unless `url` is given), warm up, then
+    measure. Returns the JSON-ready report.
+    """
+    config = {
+        "mix": mix, "concurrency": concurrency, "duration": duration, "warmup": warmup,
+        "max_requests": max_requests, "seed": seed, "workers": workers if url is None else None,
+    }
+
+    def measure(base_url: str, pid: Optional[int]) -> dict:
+        if warmup > 0:
+            asyncio.run(drive(base_url, mix, concurrency, warmup, seed=seed + 10_000))
+        with ResourceSampler(pid) as sampler:
+            started = time.perf_counter()
+            samples = asyncio.run(drive(base_url, mix, concurrency, duration, max_requests, seed))
+            elapsed = time.perf_counter() - started
+        return {"elapsed_s": elapsed, "latency": summarize(samples, elapsed), "server": sampler.report()}
+
+    if url is not None:
+        measured = measure(url.rstrip("/"), server_pid)
+    else:
+        with LocalServer(workers=workers) as server:
+            measured = measure(server.url, server.pid)
+    return {
+        "config": config,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "commit": _git_commit(),
+        },
+        **measured,
+    }
+
+
+def _change(new: Optional[float], old: Optional[float]) -> str:
+    if new is None or not old:
+        return ""
+    return f" ({100.0 * (new - old) / old:+.1f}%)"
+
+
+def format_report(report: dict, baseline: Optional[dict] = None) -> str:
+    """Text table of the report; with `baseline`, each figure carries its relative change."""
+    lines = [
+        f"elapsed {report['elapsed_s']:.1f}s, concurrency {report['config']['concurrency']}, "
+        f"commit {report['environment'].get('commit') or '?'}",
+        f"{'scenario':<10} {'count':>7} {'err':>5} {'rps':>18} {'p50 ms':>18} {'p99 ms':>18}",
+    ]
+    latency = report["latency"]
+    base_latency = (baseline or {}).get("latency", {})
+    rows = [("total", latency["total"], base_latency.get("total", {}))]
+    base_scenarios = base_latency.get("scenarios", {})
+    rows += [(name, stats, base_scenarios.get(name, {})) for name, stats in latency["scenarios"].items()]
+    for name, stats, base in rows:
+        cells = [
+            f"{stats[key]:.1f}{_change(stats[key], base.get(key))}" if key in stats else "-"
+            for key in ("rps", "p50_ms", "p99_ms")
+        ]
+        counts = f"{name:<10} {stats['count']:>7} {stats['errors']:>5}"
+        lines.append(f"{counts} {cells[0]:>18} {cells[1]:>18} {cells[2]:>18}")
+    server = report.get("server") or {}
+    if server:
+        base_server = (baseline or {}).get("server") or {}
+        rss, cpu = server["rss_peak_mb"], server["cpu_percent_mean"]
+        lines.append(
+            f"server: peak RSS {rss:.0f} MB{_change(rss, base_server.get('rss_peak_mb'))}, "
+            f"CPU {cpu:.0f}%{_change(cpu, base_server.get('cpu_percent_mean'))}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m fermentation_sim.loadtest", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights, from {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent closed-loop clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn processes for the local server")
+    parser.add_argument("--url", default=None, help="Target a running server instead of starting one")
+    parser.add_argument("--server-pid", type=int, default=None, help="PID to sample when --url is given")
+    parser.add_argument("--out", default=None, help="Write the JSON report here")
+    parser.add_argument("--compare", default=None, help="Baseline JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+    report = run_load_test(
+        mix, args.concurrency, args.duration, args.warmup, args.requests, args.seed,
+        args.url, args.server_pid, args.workers,
+    )
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print(format_report(report, baseline))
+    return 0 if report["latency"]["total"]["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,15 @@ class SimulationResult(Protocol):
     state: np.ndarray
 
 
+class SolverError(RuntimeError):
+    """Raised when integration fails and the failure policy forbids a fallback."""
+
+    def __init__(self, reason: str, detail: str = "") -> None:
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+        self.detail = detail
+
+
 class BaseFermentationModel(ABC):
     """Abstract base class for fermentation models."""
 
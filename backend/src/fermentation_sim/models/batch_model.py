@@ -1,92 +1,125 @@
-from dataclasses import dataclass
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Sequence
 
 import numpy as np
+from loguru import logger
 
-from .base import BaseFermentationModel
+from .base import BaseFermentationModel, SolverError
 from .c_binding import (
+    KINETIC_DTYPE,
+    OPERATING_DTYPE,
     FermentationCLib,
     KineticParams,
     OperatingConditions,
+    StopConditions as CStopConditions,
+    SummaryMetrics,
+    load_c_library,
 )
-from ..utils.validation import SimulationRequest
+from .circuit_breaker import CircuitBreaker
+from .compiled import FEED_MODES, KINETIC_FIELDS, OPERATING_FIELDS, CompiledParams
+from .dense import DenseOutput
+from .stopping import STATE_INDEX, STOP_REASONS, StopMonitor, threshold_reason
+from .summary import SummaryTracker, summary_from_trajectory
+from .vectorized import derive_params, integrate_batched, stack_params
+from ..config import settings
+from ..utils.metrics import C_CIRCUIT_OPEN, C_FALLBACKS
+from ..utils.validation import SimulationRequest, StopConditions
+
+
+# SimulationRequest fields that pack_columns reads
+PACKED_FIELDS = ("X0", "S0", "P0", "DO0", "T0", "volume", "feed_mode") + KINETIC_FIELDS + OPERATING_FIELDS
 
 
 @dataclass
 class BatchSimulationResult:
     time: np.ndarray
-    state: np.ndarray  # shape (n_points, 6) : X, S, P, DO, T, V
+    state: np.ndarray  # shape (n_points, 6) : X, S, P, DO, T, V; float32 in reduced-precision mode
+    backend: str = "python"  # integrator that produced `state`: "c" or "python"
+    rhs_evals: int = 0
+    timings: dict = field(default_factory=dict)  # seconds per model phase
+    fallback_reason: str | None = None  # why the C path was not used, if it was tried
+    summary: dict | None = None  # key metrics tracked during integration (see models/summary.py)
+    stop_reason: str | None = None  # early termination criterion that ended the run, if any
+    dense: DenseOutput | None = None  # interpolant over the solver steps (dense-output runs)
+    resumed_from: float | None = None  # checkpoint time when only a suffix was recomputed
+
+
+@dataclass
+class BulkSimulationResult:
+    """Column-wise batch output: scenario i is final[i] / state[i] / backend[i]."""
+
+    time: np.ndarray
+    final: np.ndarray  # shape (N, 6): state at time[-1]
+    backend: np.ndarray  # (N,) "c" or "numpy"
+    state: np.ndarray | None = None  # shape (N, n_points, 6) when trajectories were requested
+    rhs_evals: np.ndarray | None = None  # (N,) RHS evaluations per scenario
+    timings: dict = field(default_factory=dict)
+
+
+@dataclass
+class IntegratorRun:
+    """Output of one integrator attempt; `time` ends early when a stop condition fired."""
+
+    time: np.ndarray
+    state: np.ndarray
+    rhs_evals: int = 0
+    summary: dict | None = None
+    stop_reason: str | None = None
+
+
+@dataclass
+class CFailure:
+    reason: str  # missing_lib | unsupported | circuit_open | exception | nonzero_status | non_finite
+    detail: str = ""
+    status: int | None = None
+    step: int | None = None  # first output row with NaN/Inf
 
 
 class BatchFermentationModel(BaseFermentationModel):
     """Batch (and base fed-batch) fermentation model with dilution/feed dynamics."""
 
-    def __init__(self, c_lib: FermentationCLib | None = None) -> None:
-        self.c_lib = c_lib or FermentationCLib()
+    def __init__(
+        self,
+        c_lib: FermentationCLib | None = None,
+        failure_policy: str | None = None,
+        breaker: CircuitBreaker | None = None,
+        use_c: bool = True,
+    ) -> None:
+        # The C library is resolved on first use so construction never touches disk;
+        # use_c=False runs the Python integrators only (as when the library is missing)
+        self._c_lib = c_lib if use_c else None
+        self._c_lib_resolved = c_lib is not None or not use_c
         self._max_dt = 0.01  # tighter internal step to avoid stiffness blow-ups
+        self.failure_policy = failure_policy or settings.c_failure_policy
+        self.breaker = breaker or CircuitBreaker(
+            threshold=settings.c_breaker_threshold, reset_after=settings.c_breaker_reset_s
+        )
+
+    @property
+    def c_lib(self) -> FermentationCLib | None:
+        if not self._c_lib_resolved:
+            self._c_lib = load_c_library()
+            self._c_lib_resolved = True
+        return self._c_lib
 
-    def _build_param_maps(self, request: SimulationRequest) -> tuple[dict, dict]:
-        params = {
-            "mu_max": request.mu_max,
-            "Ks": request.Ks,
-            "Yxs": request.Yxs,
-            "Ypx": request.Ypx,
-            "kd": request.kd,
-            "Kio": request.Kio,
-            "Kp": request.Kp,
-            "maintenance": request.maintenance,
-            "Q10": request.Q10,
-            "T_ref": request.T_ref,
-            "Kla": request.Kla,
-            "C_star": request.C_star,
-            "O2_maintenance": request.O2_maintenance,
-            "delta_H": request.delta_H,
-            "Cp": request.Cp,
-            "U": request.U,
-            "A": request.A,
-            "rho": request.rho,
-        }
-        ops = {
-            "volume": request.volume,
-            "feed_rate": request.feed_rate,
-            "feed_substrate_conc": request.feed_substrate_conc,
-            "feed_start": request.feed_start,
-            "feed_rate_end": request.feed_rate_end,
-            "feed_tau": request.feed_tau,
-            "feed_mode": request.feed_mode,
-            "do_setpoint": request.do_setpoint,
-            "do_Kp": request.do_Kp,
-            "aeration_rate": request.aeration_rate,
-            "agitation_speed": request.agitation_speed,
-            "cooling_temp": request.cooling_temp,
-            "coolant_flow": request.coolant_flow,
-            "agit_power_coeff": request.agit_power_coeff,
-            "agit_heat_eff": request.agit_heat_eff,
-        }
-        return params, ops
-
-    def _compute_feed_rate(self, t: float, DO: float, ops: dict) -> float:
-        if t < ops["feed_start"]:
+    @staticmethod
+    def _compute_feed_rate(t: float, DO: float, p: CompiledParams) -> float:
+        if t < p.feed_start:
             return 0.0
-        fr0 = ops["feed_rate"]
-        fr1 = ops["feed_rate_end"]
-        mode = ops.get("feed_mode", "constant")
-        if mode == "ramp":
-            dt = t - ops["feed_start"]
-            if fr1 > fr0 and ops["feed_tau"] > 0:
-                slope = (fr1 - fr0) / ops["feed_tau"]
-                return min(fr1, fr0 + slope * dt)
-            return fr0
-        if mode == "exponential":
-            dt = t - ops["feed_start"]
-            tau = max(ops["feed_tau"], 1e-6)
-            target = fr1 if fr1 > 0 else fr0
-            return target + (fr0 - target) * np.exp(-dt / tau)
-        if mode == "do_control":
-            error = ops.get("do_setpoint", 0.0) - DO
-            return max(0.0, fr0 + ops.get("do_Kp", 0.0) * error)
-        return fr0
-
-    def _derivatives(self, t: float, state: np.ndarray, params: dict, ops: dict) -> np.ndarray:
+        mode = p.feed_mode_code
+        if mode == 1:  # ramp
+            if p.ramp_on:
+                return min(p.feed_rate_end, p.feed_rate + p.ramp_slope * (t - p.feed_start))
+            return p.feed_rate
+        if mode == 2:  # exponential
+            return p.exp_target + (p.feed_rate - p.exp_target) * math.exp(-(t - p.feed_start) / p.exp_tau)
+        if mode == 3:  # do_control
+            return max(0.0, p.feed_rate + p.do_Kp * (p.do_setpoint - DO))
+        return p.feed_rate
+
+    def _derivatives(self, t: float, state: np.ndarray, p: CompiledParams) -> np.ndarray:
         X, S, P, DO, T, V = state
 
         # Keep state in physical bounds to avoid runaway stiffness
@@ -97,86 +130,254 @@ class BatchFermentationModel(BaseFermentationModel):
         DO_safe = max(DO, 1e-8)
         S_safe = max(S, 1e-8)
 
-        temp_factor = params["Q10"] ** ((T - params["T_ref"]) / 10.0)
-        mu_monod = params["mu_max"] * temp_factor * S_safe / (params["Ks"] + S_safe)
-        o2_factor = DO_safe / (params["Kio"] + DO_safe)
-        product_factor = 1.0 / (1.0 + P / params["Kp"])
+        temp_factor = p.Q10 ** ((T - p.T_ref) / 10.0)
+        mu_monod = p.mu_max * temp_factor * S_safe / (p.Ks + S_safe)
+        o2_factor = DO_safe / (p.Kio + DO_safe)
+        product_factor = 1.0 / (1.0 + P / p.Kp)
         mu = mu_monod * o2_factor * product_factor
 
-        feed_rate = self._compute_feed_rate(t, DO_safe, ops)
+        feed_rate = self._compute_feed_rate(t, DO_safe, p)
         dilution = feed_rate / V_safe
 
-        rX = (mu - params["kd"] - dilution) * X
-        rS = (
-            -(1.0 / params["Yxs"]) * mu * X
-            - params["maintenance"] * X
-            + dilution * (ops["feed_substrate_conc"] - S)
-        )
-        rP = params["Ypx"] * mu * X - dilution * P
+        rX = (mu - p.kd - dilution) * X
+        rS = -p.inv_Yxs * mu * X - p.maintenance * X + dilution * (p.feed_substrate_conc - S)
+        rP = p.Ypx * mu * X - dilution * P
 
         # Oxygen transfer with saturation clamp
-        kla_effective = max(
-            params["Kla"]
-            * max(ops["aeration_rate"], 1e-6) ** 0.5
-            * (max(ops["agitation_speed"], 1e-6) / 300.0) ** 0.7,
-            0.0,
-        )
-        OTR = kla_effective * max(params["C_star"] - DO, 0.0)
-        OUR = params["O2_maintenance"] * X
+        OTR = p.kla_effective * max(p.C_star - DO, 0.0)
+        OUR = p.O2_maintenance * X
         dDOdt = OTR - OUR - dilution * DO
 
         # Simple heat balance with dynamic volume
-        Q_gen = params["delta_H"] * mu * X * V_safe
-        Q_loss = params["U"] * params["A"] * (T - ops["cooling_temp"])
-        agit_power = ops["agit_power_coeff"] * V_safe * max(ops["agitation_speed"], 0.0) ** 3
-        Q_agit = ops["agit_heat_eff"] * agit_power
-        dTdt = (Q_gen + Q_agit - Q_loss) / (params["rho"] * V_safe * params["Cp"])
+        Q_gen = p.delta_H * mu * X * V_safe
+        Q_loss = p.UA * (T - p.cooling_temp)
+        Q_agit = p.agit_heat_eff * (p.agit_power_coeff * V_safe * p.agit_pow3)
+        dTdt = (Q_gen + Q_agit - Q_loss) / (p.rho * V_safe * p.Cp)
         dVdt = feed_rate
 
         return np.array([rX, rS, rP, dDOdt, dTdt, dVdt], dtype="float64")
 
     def _integrate_fallback(
-        self, t: np.ndarray, y0: np.ndarray, params: dict, ops: dict
-    ) -> np.ndarray:
-        """Numerically integrate with internal sub-steps and clamping."""
+        self,
+        t: np.ndarray,
+        y0: np.ndarray,
+        p: CompiledParams,
+        tracker: SummaryTracker | None = None,
+        materialize: bool = True,
+        monitor: StopMonitor | None = None,
+        dtype: str = "float64",
+    ) -> IntegratorRun:
+        """
+        Numerically integrate with internal sub-steps and clamping. `tracker`
+        and `monitor` observe every sub-step; an early stop ends the output at
+        the stopping sub-step. Without `materialize` only the final state is
+        kept and returned as a single row. The state is always integrated in
+        float64; `dtype` only sets the output rows.
+        """
         n_points = t.size
         state_dim = y0.size
-        y = np.zeros((n_points, state_dim), dtype="float64")
+        y = np.zeros((n_points if materialize else 1, state_dim), dtype=dtype)
         y[0] = y0
         current = y0.copy()
+        rhs_evals = 0
+        stopped_at = None  # (segment, time) of an early stop
 
         for i in range(1, n_points):
             segment_dt = t[i] - t[i - 1]
             steps = max(1, int(np.ceil(segment_dt / self._max_dt)))
             dt = segment_dt / steps
 
-            for _ in range(steps):
-                k1 = self._derivatives(t[i - 1], current, params, ops)
-                k2 = self._derivatives(t[i - 1] + 0.5 * dt, current + 0.5 * dt * k1, params, ops)
-                k3 = self._derivatives(t[i - 1] + 0.5 * dt, current + 0.5 * dt * k2, params, ops)
-                k4 = self._derivatives(t[i - 1] + dt, current + dt * k3, params, ops)
+            for k in range(steps):
+                previous = current
+                k1 = self._derivatives(t[i - 1], current, p)
+                k2 = self._derivatives(t[i - 1] + 0.5 * dt, current + 0.5 * dt * k1, p)
+                k3 = self._derivatives(t[i - 1] + 0.5 * dt, current + 0.5 * dt * k2, p)
+                k4 = self._derivatives(t[i - 1] + dt, current + dt * k3, p)
                 current = current + dt * (k1 + 2 * k2 + 2 * k3 + k4) / 6.0
+                rhs_evals += 4
 
                 # Clamp to physical/finite ranges
                 current = np.where(np.isfinite(current), current, 0.0)
                 current[:4] = np.maximum(current[:4], 0.0)
-                current[3] = min(current[3], params["C_star"] * 1.5)
+                current[3] = min(current[3], p.DO_cap)
                 current[4] = max(current[4], 0.0)
                 current[5] = max(current[5], 1e-6)
 
-            y[i] = current
+                if tracker is None and monitor is None:
+                    continue
+                t_prev = t[i - 1] + k * dt
+                t_now = t[i] if k == steps - 1 else t[i - 1] + (k + 1) * dt
+                if tracker is not None:
+                    tracker.step(t_prev, previous, k1, t_now, current)
+                if monitor is not None and monitor.check(t_prev, k1, t_now, current, rhs_evals):
+                    stopped_at = (i, t_now)
+                    break
 
-        return y
+            if materialize:
+                y[i] = current
+            if stopped_at is not None:
+                break
 
-    def simulate(self, request: SimulationRequest) -> BatchSimulationResult:
-        t = np.linspace(request.t_start, request.t_end, request.n_points)
-        y0 = np.array(
+        time_out = t
+        if stopped_at is not None:
+            i, t_stop = stopped_at
+            time_out = t[: i + 1].copy()
+            time_out[-1] = t_stop  # may fall inside segment i
+        if materialize:
+            state = y[: time_out.size]
+        else:
+            state, time_out = current[None, :].astype(dtype), time_out[-1:]
+        return IntegratorRun(
+            time=time_out,
+            state=state,
+            rhs_evals=rhs_evals,
+            stop_reason=monitor.reason if monitor is not None else None,
+        )
+
+    @staticmethod
+    def _build_stop(conditions: StopConditions) -> CStopConditions:
+        c_stop = CStopConditions(
+            n_thresholds=len(conditions.thresholds),
+            steady_tol=conditions.steady_state_tol or 0.0,
+            steady_hold=conditions.steady_state_hold,
+            max_wall_seconds=conditions.max_wall_seconds or 0.0,
+            max_rhs_evals=conditions.max_rhs_evals or 0,
+        )
+        for k, th in enumerate(conditions.thresholds):
+            c_stop.threshold_var[k] = STATE_INDEX[th.variable]
+            c_stop.threshold_dir[k] = -1 if th.op == "<=" else 1
+            c_stop.threshold_value[k] = th.value
+        return c_stop
+
+    def _integrate_c(
+        self,
+        t: np.ndarray,
+        y0: np.ndarray,
+        kinetic: KineticParams,
+        ops: OperatingConditions,
+        refine: int = 1,
+        s_threshold: float | None = None,
+        materialize: bool = True,
+        stop: StopConditions | None = None,
+        dtype: str = "float64",
+    ) -> tuple[IntegratorRun | None, CFailure | None]:
+        """
+        Run the C core, optionally on a grid refined `refine` times, and classify
+        failures. With `s_threshold` the integrator tracks summary metrics, with
+        `stop` it may end early; without `materialize` (summary runs only) just
+        the final state row is returned. `dtype` sets the output precision.
+        """
+        grid = t
+        if refine > 1:
+            offsets = np.arange(refine) / refine
+            grid = np.append((t[:-1, None] + np.diff(t)[:, None] * offsets).ravel(), t[-1])
+        c_summary = c_stop = None
+        if self.c_lib.supports("integrate_fermentation_rk4_ex"):
+            if s_threshold is not None:
+                c_summary = SummaryMetrics(s_threshold=s_threshold)
+            if stop is not None:
+                c_stop = self._build_stop(stop)
+        # Older builds without the float32 writer integrate in float64 and cast below
+        c_dtype = dtype if self.c_lib.supports("integrate_fermentation_rk4_f32") else "float64"
+        materialize = materialize or c_summary is None
+        try:
+            if c_summary is not None or c_stop is not None or c_dtype != "float64":
+                status, y_out = self.c_lib.integrate_ex(
+                    grid, y0, kinetic, ops, c_summary, c_stop, materialize=materialize, dtype=c_dtype
+                )
+            else:
+                status, y_out = self.c_lib.integrate(grid, y0, kinetic, ops)
+        except Exception as exc:  # ctypes/ABI errors surface here
+            return None, CFailure("exception", detail=f"{type(exc).__name__}: {exc}")
+        if status != 0:
+            return None, CFailure("nonzero_status", detail=f"status={status}", status=status)
+
+        n = int(c_stop.n_completed) if c_stop is not None else grid.size
+        if materialize:
+            y_out = y_out[:n]
+            rows = np.arange(0, n, refine)
+            if rows[-1] != n - 1:
+                rows = np.append(rows, n - 1)  # keep an off-grid stopping row
+        else:
+            y_out, rows = np.array([c_summary.y_final[:]], dtype=dtype), np.array([n - 1])
+
+        finite_rows = np.isfinite(y_out).all(axis=1)
+        if not finite_rows.all():
+            step = int(np.argmin(finite_rows)) if materialize else n - 1
+            if refine > 1:
+                step = -(-step // refine)  # report in output-grid rows
+            return None, CFailure("non_finite", detail=f"NaN/Inf at step {step}", step=step)
+
+        stop_reason = None
+        if c_stop is not None and c_stop.reason:
+            stop_reason = (
+                threshold_reason(stop, c_stop.which) if c_stop.reason == 1 else STOP_REASONS[c_stop.reason]
+            )
+        run = IntegratorRun(
+            time=grid[rows],
+            state=(y_out[rows] if materialize else y_out).astype(dtype, copy=False),
+            rhs_evals=4 * (n - 1) + (1 if c_summary is not None else 0),
+            summary=c_summary.as_dict() if c_summary is not None else None,
+            stop_reason=stop_reason,
+        )
+        return run, None
+
+    def _report_fallback(self, failure: CFailure, attempt: str = "primary") -> None:
+        C_FALLBACKS.inc(reason=failure.reason)
+        C_CIRCUIT_OPEN.set(1.0 if self.breaker.state == "open" else 0.0)
+        event = logger.bind(
+            event="c_integrator_failure",
+            reason=failure.reason,
+            status=failure.status,
+            step=failure.step,
+            attempt=attempt,
+            policy=self.failure_policy,
+        )
+        # An open circuit is reported once when it trips; per-request repeats stay quiet
+        level = "DEBUG" if failure.reason == "circuit_open" else "WARNING"
+        event.log(level, "C integrator failed ({}): {}", failure.reason, failure.detail)
+
+    def _run_c_path(
+        self,
+        t: np.ndarray,
+        y0: np.ndarray,
+        kinetic: KineticParams,
+        ops: OperatingConditions,
+        s_threshold: float | None = None,
+        materialize: bool = True,
+        stop: StopConditions | None = None,
+        dtype: str = "float64",
+    ) -> tuple[IntegratorRun | None, CFailure | None, int]:
+        """Apply breaker and retry policy around the C core; returns (run, failure, rhs_evals)."""
+        if self.c_lib is None:
+            return None, CFailure("missing_lib", detail="C library not loaded"), 0
+        if stop is not None and not self.c_lib.supports("integrate_fermentation_rk4_ex"):
+            return None, CFailure("unsupported", detail="C build lacks early termination"), 0
+        if not self.breaker.allow():
+            return None, CFailure("circuit_open", detail="C path disabled after repeated failures"), 0
+
+        options = dict(s_threshold=s_threshold, materialize=materialize, stop=stop, dtype=dtype)
+        run, failure = self._integrate_c(t, y0, kinetic, ops, **options)
+        rhs_evals = run.rhs_evals if run is not None else 4 * (t.size - 1)
+        if failure is not None and self.failure_policy == "retry_smaller_step":
+            self._report_fallback(failure, attempt="primary")
+            refine = settings.c_retry_refine
+            run, failure = self._integrate_c(t, y0, kinetic, ops, refine=refine, **options)
+            rhs_evals += run.rhs_evals if run is not None else 4 * refine * (t.size - 1)
+            if failure is not None:
+                failure.detail = f"after retry at 1/{refine} step: {failure.detail}"
+        self.breaker.record(failure is None)
+        C_CIRCUIT_OPEN.set(1.0 if self.breaker.state == "open" else 0.0)
+        return run, failure, rhs_evals
+
+    @staticmethod
+    def initial_state(request: SimulationRequest) -> np.ndarray:
+        return np.array(
             [request.X0, request.S0, request.P0, request.DO0, request.T0, request.volume],
             dtype="float64",
         )
 
-        use_c = self.c_lib is not None
-
+    def _build_structs(self, request: SimulationRequest) -> tuple[KineticParams, OperatingConditions]:
         kinetic = KineticParams(
             mu_max=request.mu_max,
             Ks=request.Ks,
@@ -215,22 +416,393 @@ class BatchFermentationModel(BaseFermentationModel):
             agit_power_coeff=request.agit_power_coeff,
             agit_heat_eff=request.agit_heat_eff,
         )
+        return kinetic, ops
+
+    def simulate(
+        self, request: SimulationRequest, summary: bool = False, materialize: bool = True
+    ) -> BatchSimulationResult:
+        if request.dense_output:
+            return self._simulate_dense(request, summary, materialize)
+        t = np.linspace(request.t_start, request.t_end, request.n_points)
+        return self.integrate(request, t, self.initial_state(request), summary, materialize)
+
+    def _simulate_dense(
+        self, request: SimulationRequest, summary: bool, materialize: bool
+    ) -> BatchSimulationResult:
+        """
+        Step on a solver grid of its own (see `_dense_grid`) and sample the
+        outputs (`t_eval`, else n_points evenly spaced) from the Hermite
+        interpolant of the steps.
+        """
+        started = time.perf_counter()
+        grid, selection_evals = self._dense_grid(request)
+        selection_seconds = time.perf_counter() - started
+        result = self.integrate(
+            request, grid, self.initial_state(request), summary, materialize, dtype="float64"
+        )
+        result.rhs_evals += selection_evals
+        result.timings["step_selection"] = selection_seconds
+        if not materialize:
+            result.state = result.state.astype(request.output_precision)
+            return result
+
+        started = time.perf_counter()
+        t_out = self._dense_times(request)
+        t_out = t_out[t_out <= result.time[-1]]  # an early stop ends the outputs too
+        result.dense = DenseOutput.from_steps(result.time, result.state, stack_params([request]))
+        result.time = t_out
+        result.state = result.dense(t_out).astype(request.output_precision)
+        result.rhs_evals += result.dense.rhs_evals
+        result.timings["dense_output"] = time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def _dense_times(request: SimulationRequest) -> np.ndarray:
+        if request.t_eval is not None:
+            return np.asarray(request.t_eval, dtype="float64")
+        return np.linspace(request.t_start, request.t_end, request.n_points)
+
+    def _dense_grid(self, request: SimulationRequest) -> tuple[np.ndarray, int]:
+        """
+        Solver grid of a dense-output run and the RHS evaluations spent choosing
+        it. A given `solver_dt` is a fixed step. Otherwise the step is chosen by
+        step doubling on the C core: starting from the mean output spacing, the
+        step is halved until two successive runs agree at the outputs within
+        `solver_rtol` (default Settings.dense_rtol, relative to each variable's
+        largest output) and Settings.dense_atol. It never goes below
+        Settings.dense_solver_dt, which is also the step used without the C core.
+        """
+        span = request.t_end - request.t_start
+
+        def grid(steps: int) -> np.ndarray:
+            return np.linspace(request.t_start, request.t_end, steps + 1)
+
+        if request.solver_dt is not None:
+            return grid(max(1, int(np.ceil(span / request.solver_dt)))), 0
+        finest = max(1, int(np.ceil(span / settings.dense_solver_dt)))
+        if self.c_lib is None or self.breaker.state == "open":
+            return grid(finest), 0
+
+        t_out = self._dense_times(request)
+        rtol = request.solver_rtol or settings.dense_rtol
+        y0 = self.initial_state(request)
+        kinetic, ops = self._build_structs(request)
+        p = stack_params([request])
+        # Oxygen transfer is the stiff mode: RK4 diverges for steps above ~2.8 / kLa
+        kla = float(p["kla_base"][0]) * math.sqrt(max(request.aeration_rate, 1e-6))
+        coarsest = max(1, t_out.size - 1, int(np.ceil(span * kla / 2.5)))
+        # Coarsest level first; the finest is left to the run itself
+        levels, steps = [], finest // 2
+        while steps >= coarsest:
+            levels.insert(0, steps)
+            steps //= 2
+        previous, rhs_evals = None, 0
+        for steps in levels:
+            # Trial runs bypass breaker and fallback: a diverging trial only means too coarse a step
+            run, failure = self._integrate_c(grid(steps), y0, kinetic, ops)
+            rhs_evals += 4 * steps
+            current = None
+            if failure is None:
+                dense = DenseOutput.from_steps(run.time, run.state, p)
+                current = dense(t_out)
+                rhs_evals += dense.rhs_evals
+                if previous is not None and (
+                    np.abs(current - previous) <= settings.dense_atol + rtol * np.abs(current).max(axis=0)
+                ).all():
+                    return grid(steps), rhs_evals
+            previous = current
+        return grid(finest), rhs_evals
+
+    def integrate_many(
+        self, requests: Sequence[SimulationRequest], t: np.ndarray
+    ) -> list[BatchSimulationResult | SolverError]:
+        """
+        Integrate several requests from their initial states over one shared
+        grid `t`. With the C batch entry point they run in one C call; builds
+        without it try the C core per request as `integrate` does. Those that
+        fall back run the scalar Python integrator, as a lone request would, so
+        a result does not depend on which requests it was grouped with. Under
+        the fail_fast policy a failing request's entry is its SolverError, so
+        one bad request does not fail the others.
+        """
+        results: list = [None] * len(requests)
+
+        def on_failure(k: int, failure: CFailure, rhs_evals: int) -> None:
+            self._report_fallback(failure, attempt="final")
+            if self.failure_policy == "fail_fast":
+                results[k] = SolverError(failure.reason, failure.detail)
+                return
+            started = time.perf_counter()
+            request = requests[k]
+            compiled = CompiledParams.from_request(request)
+            y0 = self.initial_state(request)
+            run = self._integrate_fallback(t, y0, compiled, dtype=request.output_precision)
+            results[k] = BatchSimulationResult(
+                time=run.time,
+                state=run.state,
+                backend="python",
+                rhs_evals=rhs_evals + run.rhs_evals,
+                timings={"integrate": time.perf_counter() - started},
+                fallback_reason=failure.reason,
+            )
+
+        single: Sequence[int] = range(len(requests))
+        if self.c_lib is not None and self.c_lib.supports("integrate_fermentation_rk4_batch"):
+            single = self._integrate_many_c(requests, t, results, on_failure)
+        for k in single:
+            request = requests[k]
+            started = time.perf_counter()
+            y0 = self.initial_state(request)
+            kinetic, ops = self._build_structs(request)
+            run, failure, rhs_evals = self._run_c_path(t, y0, kinetic, ops, dtype=request.output_precision)
+            if failure is None:
+                if np.allclose(run.state[:, 5], 0):
+                    run.state[:, 5] = y0[5]
+                results[k] = BatchSimulationResult(
+                    time=run.time,
+                    state=run.state,
+                    backend="c",
+                    rhs_evals=rhs_evals,
+                    timings={"integrate": time.perf_counter() - started},
+                )
+            else:
+                on_failure(k, failure, rhs_evals)
+
+        return results
 
-        y_out = None
-        if use_c:
-            try:
-                status, y_out = self.c_lib.integrate(t, y0, kinetic, ops)
-                if status != 0 or not np.isfinite(y_out).all():
-                    y_out = None
-            except Exception:
-                y_out = None
-
-        if y_out is None:
-            params_map, ops_map = self._build_param_maps(request)
-            y_out = self._integrate_fallback(t, y0, params_map, ops_map)
+    def _integrate_many_c(
+        self,
+        requests: Sequence[SimulationRequest],
+        t: np.ndarray,
+        results: list,
+        on_failure: Callable[[int, CFailure, int], None],
+    ) -> list[int]:
+        """
+        C batch half of integrate_many: fills `results` for the requests the C
+        core integrated and hands the failed ones to `on_failure`. Returns the
+        requests left for the per-request C path: all failures under
+        retry_smaller_step (which refines per request), and every request
+        when the batch call itself did not run.
+        """
+        started = time.perf_counter()
+        columns = {name: np.array([getattr(r, name) for r in requests]) for name in PACKED_FIELDS}
+        y0, kinetic, ops = self.pack_columns(columns)
+        final = np.empty(y0.shape, dtype="float64")
+        state = np.empty((y0.shape[0], t.size, y0.shape[1]), dtype="float64")
+        failed, reason = self._integrate_columns_c(t, y0, kinetic, ops, final, state, {})
+        elapsed = time.perf_counter() - started
+
+        for k in np.setdiff1d(np.arange(y0.shape[0]), failed):
+            if np.allclose(state[k, :, 5], 0):
+                state[k, :, 5] = y0[k, 5]
+            results[k] = BatchSimulationResult(
+                time=t,
+                state=state[k].astype(requests[k].output_precision),
+                backend="c",
+                rhs_evals=4 * (t.size - 1),
+                timings={"integrate": elapsed},
+            )
+        if reason in ("circuit_open", "exception") or self.failure_policy == "retry_smaller_step":
+            return failed.tolist()
+        for k in failed.tolist():
+            on_failure(k, CFailure(reason, detail="failed in the C batch"), 4 * (t.size - 1))
+        return []
+
+    @staticmethod
+    def pack_columns(columns: Dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Complete scenario columns -> (y0 (N, 6), KINETIC_DTYPE array,
+        OPERATING_DTYPE array), written field by field with no per-row objects.
+        """
+        n = columns["volume"].size
+        y0 = np.column_stack([columns[name] for name in ("X0", "S0", "P0", "DO0", "T0", "volume")])
+        kinetic = np.zeros(n, dtype=KINETIC_DTYPE)
+        for name in KINETIC_FIELDS:
+            kinetic[name] = columns[name]
+        ops = np.zeros(n, dtype=OPERATING_DTYPE)
+        for name in OPERATING_FIELDS + ("volume",):
+            ops[name] = columns[name]
+        for mode, code in FEED_MODES.items():
+            ops["feed_mode"][columns["feed_mode"] == mode] = code
+        return np.ascontiguousarray(y0, dtype="float64"), kinetic, ops
+
+    @staticmethod
+    def _column_params(kinetic: np.ndarray, ops: np.ndarray) -> dict:
+        """Vectorized-integrator parameters for packed scenarios (cf. stack_params)."""
+        p = {name: kinetic[name].copy() for name in KINETIC_FIELDS}
+        p.update({name: ops[name].copy() for name in OPERATING_FIELDS})
+        p["feed_mode"] = ops["feed_mode"].astype(int)
+        return derive_params(p)
+
+    def integrate_columns(
+        self,
+        columns: Dict[str, np.ndarray],
+        t: np.ndarray,
+        materialize: bool = False,
+        dtype: str = "float64",
+    ) -> BulkSimulationResult:
+        """
+        Integrate N scenarios given as complete, validated columns over one grid.
+        They run through the C batch entry point in a single call when the
+        build has it; scenarios it fails (and all of them without it) are
+        integrated together by the vectorized NumPy integrator, or raise
+        SolverError under fail_fast. Only the final states are kept unless
+        `materialize`.
+        """
+        timings: dict = {}
+        started = time.perf_counter()
+        y0, kinetic, ops = self.pack_columns(columns)
+        n = y0.shape[0]
+        timings["pack"] = time.perf_counter() - started
+
+        final = np.empty((n, y0.shape[1]), dtype="float64")
+        state = np.empty((n, t.size, y0.shape[1]), dtype="float64") if materialize else None
+        backend = np.full(n, "c", dtype="<U5")
+        failed, reason = self._integrate_columns_c(t, y0, kinetic, ops, final, state, timings)
+        rhs_evals = np.full(n, 4 * (t.size - 1))  # a failed C run still spent its steps
+
+        if failed.size:
+            C_FALLBACKS.inc(failed.size, reason=reason)
+            if self.failure_policy == "fail_fast":
+                rows = ", ".join(str(row) for row in failed[:5])
+                raise SolverError(reason, f"{failed.size} scenario(s) failed, first rows: {rows}")
+            started = time.perf_counter()
+            params = self._column_params(kinetic[failed], ops[failed])
+            states = integrate_batched(t, y0[failed], params, self._max_dt)
+            final[failed] = states[-1]
+            if state is not None:
+                state[failed] = states.transpose(1, 0, 2)
+            backend[failed] = "numpy"
+            steps = int(np.maximum(1, np.ceil(np.diff(t) / self._max_dt)).sum())
+            if reason in ("missing_lib", "unsupported", "circuit_open", "exception"):
+                rhs_evals[failed] = 0
+            rhs_evals[failed] += 4 * steps
+            timings["integrate_numpy"] = time.perf_counter() - started
+
+        return BulkSimulationResult(
+            time=t,
+            final=final.astype(dtype, copy=False),
+            backend=backend,
+            state=state.astype(dtype, copy=False) if state is not None else None,
+            rhs_evals=rhs_evals,
+            timings=timings,
+        )
+
+    def _integrate_columns_c(
+        self,
+        t: np.ndarray,
+        y0: np.ndarray,
+        kinetic: np.ndarray,
+        ops: np.ndarray,
+        final: np.ndarray,
+        state: np.ndarray | None,
+        timings: dict,
+    ) -> tuple[np.ndarray, str]:
+        """
+        C half of integrate_columns: fills `final` / `state` for the scenarios
+        it integrates and returns (indices of the rest, fallback reason).
+        The breaker sees the batch as one call, failed only when no scenario ran.
+        """
+        everything = np.arange(y0.shape[0])
+        if self.c_lib is None:
+            return everything, "missing_lib"
+        if not self.c_lib.supports("integrate_fermentation_rk4_batch"):
+            return everything, "unsupported"
+        if not self.breaker.allow():
+            return everything, "circuit_open"
+
+        started = time.perf_counter()
+        try:
+            status, y_out, y_final = self.c_lib.integrate_batch(t, y0, kinetic, ops, state is not None)
+        except Exception as exc:  # ctypes/ABI errors surface here
+            self.breaker.record(False)
+            self._report_fallback(CFailure("exception", detail=f"{type(exc).__name__}: {exc}"), "batch")
+            return everything, "exception"
+        timings["integrate_c"] = time.perf_counter() - started
+
+        ok = (status == 0) & np.isfinite(y_final).all(axis=1)
+        if y_out is not None:
+            ok &= np.isfinite(y_out).all(axis=(1, 2))
+        final[ok] = y_final[ok]
+        if state is not None:
+            state[ok] = y_out[ok]
+        self.breaker.record(bool(ok.any()))
+        C_CIRCUIT_OPEN.set(1.0 if self.breaker.state == "open" else 0.0)
+        failed = np.flatnonzero(~ok)
+        if failed.size:
+            logger.bind(event="c_integrator_failure", reason="batch_rows", attempt="batch").warning(
+                "C batch integrator failed {} of {} scenario(s)", failed.size, ok.size
+            )
+        reason = "nonzero_status" if (status[failed] != 0).any() else "non_finite"
+        return failed, reason
+
+    def integrate(
+        self,
+        request: SimulationRequest,
+        t: np.ndarray,
+        y0: np.ndarray,
+        summary: bool = False,
+        materialize: bool = True,
+        dtype: str | None = None,
+    ) -> BatchSimulationResult:
+        """
+        Integrate `request` over grid `t` starting from state `y0` (chunked/resumed
+        runs). `summary` tracks key metrics during integration; without
+        `materialize` the result holds only the final time and state. `dtype`
+        overrides `request.output_precision` for the state array.
+        """
+        dtype = dtype or request.output_precision
+        timings: dict = {}
+        started = time.perf_counter()
+        kinetic, ops = self._build_structs(request)
+        timings["build_structs"] = time.perf_counter() - started
+        started = time.perf_counter()
+
+        s_threshold = request.depletion_threshold if summary else None
+        run, failure, rhs_evals = self._run_c_path(
+            t, y0, kinetic, ops, s_threshold, materialize, request.stop, dtype
+        )
+
+        if failure is not None:
+            self._report_fallback(failure, attempt="final")
+            if self.failure_policy == "fail_fast":
+                raise SolverError(failure.reason, failure.detail)
+            compiled = CompiledParams.from_request(request)
+            tracker = SummaryTracker(t[0], y0, s_threshold) if summary else None
+            monitor = StopMonitor(request.stop) if request.stop is not None else None
+            run = self._integrate_fallback(
+                t, y0, compiled, tracker, materialize, monitor, dtype
+            )
+            backend = "python"
+            rhs_evals += run.rhs_evals
+            if tracker is not None:
+                run.summary = tracker.finish(lambda tt, yy: self._derivatives(tt, yy, compiled))
+                rhs_evals += 1
         else:
             # If C core does not fill volume (older builds), backfill constant volume
-            if np.allclose(y_out[:, 5], 0):
-                y_out[:, 5] = request.volume
+            if np.allclose(run.state[:, 5], 0):
+                run.state[:, 5] = y0[5]
+            backend = "c"
+            if summary and run.summary is None:
+                # C build without the summary entry point: derive from the trajectory
+                compiled = CompiledParams.from_request(request)
+                run.summary = summary_from_trajectory(
+                    run.time,
+                    run.state,
+                    lambda tt, yy: self._derivatives(tt, yy, compiled),
+                    s_threshold,
+                )
+                if not materialize:
+                    run.time, run.state = run.time[-1:], run.state[-1:]
+        timings["integrate"] = time.perf_counter() - started
 
-        return BatchSimulationResult(time=t, state=y_out)
+        return BatchSimulationResult(
+            time=run.time,
+            state=run.state,
+            backend=backend,
+            rhs_evals=rhs_evals,
+            timings=timings,
+            fallback_reason=failure.reason if failure is not None else None,
+            summary=run.summary,
+            stop_reason=run.stop_reason,
+        )
@@ -1,11 +1,32 @@
 import ctypes
-from ctypes import POINTER, c_double, c_size_t, c_int
+import threading
+import time
+from ctypes import POINTER, c_double, c_float, c_size_t, c_int
 from pathlib import Path
 from typing import Tuple
 
 import numpy as np
+from loguru import logger
 
 from fermentation_sim.config import settings
+from fermentation_sim.utils.metrics import STARTUP_SECONDS
+
+# Exported symbols probed after loading; older builds may lack the newer entry points.
+REQUIRED_SYMBOLS = ("integrate_fermentation_rk4",)
+OPTIONAL_SYMBOLS: Tuple[str, ...] = (
+    "integrate_fermentation_rk4_ex",
+    "integrate_fermentation_rk4_f32",
+    "fermentation_workspace_integrate",
+    "integrate_fermentation_rk4_batch",
+)
+WORKSPACE_SYMBOLS = (
+    "fermentation_workspace_create",
+    "fermentation_workspace_destroy",
+    "fermentation_workspace_set_params",
+    "fermentation_workspace_integrate",
+)
+
+STOP_MAX_THRESHOLDS = 8
 
 
 class KineticParams(ctypes.Structure):
@@ -51,6 +72,64 @@ class OperatingConditions(ctypes.Structure):
     ]
 
 
+# Structured dtypes with the C layouts (padding included): a column-wise batch packs
+# straight into contiguous KineticParams / OperatingConditions arrays
+KINETIC_DTYPE = np.dtype(KineticParams)
+OPERATING_DTYPE = np.dtype(OperatingConditions)
+
+
+class SummaryMetrics(ctypes.Structure):
+    _fields_ = [
+        ("s_threshold", c_double),
+        ("t_depletion", c_double),
+        ("DO_min", c_double),
+        ("t_DO_min", c_double),
+        ("T_peak", c_double),
+        ("t_T_peak", c_double),
+        ("P_final", c_double),
+        ("t_final", c_double),
+        ("productivity", c_double),
+        ("y_final", c_double * 6),
+    ]
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name, _ in self._fields_[1:-1]}
+
+
+class StopConditions(ctypes.Structure):
+    _fields_ = [
+        ("n_thresholds", c_int),
+        ("threshold_var", c_int * STOP_MAX_THRESHOLDS),
+        ("threshold_dir", c_int * STOP_MAX_THRESHOLDS),
+        ("threshold_value", c_double * STOP_MAX_THRESHOLDS),
+        ("steady_tol", c_double),
+        ("steady_hold", c_double),
+        ("max_wall_seconds", c_double),
+        ("max_rhs_evals", c_size_t),
+        # outputs
+        ("reason", c_int),
+        ("which", c_int),
+        ("t_stop", c_double),
+        ("n_completed", c_size_t),
+    ]
+
+
+class _Workspace:
+    """One C FermentationWorkspace; destroyed with the owning thread's locals."""
+
+    def __init__(self, lib: ctypes.CDLL) -> None:
+        self._lib = lib
+        ptr = lib.fermentation_workspace_create()
+        if not ptr:
+            raise MemoryError("fermentation_workspace_create failed")
+        self.ptr = ctypes.c_void_p(ptr)
+
+    def __del__(self) -> None:
+        if getattr(self, "ptr", None) is not None:
+            self._lib.fermentation_workspace_destroy(self.ptr)
+            self.ptr = None
+
+
 class FermentationCLib:
     """Wrapper around the compiled C fermentation library."""
 
@@ -59,9 +138,22 @@ class FermentationCLib:
         if not lib_path.exists():
             raise FileNotFoundError(f"C library not found at {lib_path}")
 
+        self.path = lib_path
         self.lib = ctypes.CDLL(str(lib_path))
+        self.capabilities = frozenset(
+            name for name in REQUIRED_SYMBOLS + OPTIONAL_SYMBOLS if hasattr(self.lib, name)
+        )
+        if not all(hasattr(self.lib, name) for name in WORKSPACE_SYMBOLS):
+            self.capabilities -= {"fermentation_workspace_integrate"}
+        self._local = threading.local()  # per-thread workspace
+        missing = [name for name in REQUIRED_SYMBOLS if name not in self.capabilities]
+        if missing:
+            raise OSError(f"C library at {lib_path} lacks symbols: {', '.join(missing)}")
         self._configure_signatures()
 
+    def supports(self, symbol: str) -> bool:
+        return symbol in self.capabilities
+
     def _configure_signatures(self) -> None:
         self.lib.integrate_fermentation_rk4.argtypes = [
             POINTER(c_double),  # time_points
@@ -72,6 +164,85 @@ class FermentationCLib:
             POINTER(OperatingConditions),
         ]
         self.lib.integrate_fermentation_rk4.restype = c_int
+        if self.supports("integrate_fermentation_rk4_ex"):
+            self.lib.integrate_fermentation_rk4_ex.argtypes = [
+                POINTER(c_double),  # time_points
+                c_size_t,           # n_points
+                POINTER(c_double),  # y0
+                POINTER(c_double),  # y_out (NULL: do not materialize)
+                POINTER(KineticParams),
+                POINTER(OperatingConditions),
+                POINTER(SummaryMetrics),  # NULL: no summary
+                POINTER(StopConditions),  # NULL: run to the end
+            ]
+            self.lib.integrate_fermentation_rk4_ex.restype = c_int
+        if self.supports("integrate_fermentation_rk4_f32"):
+            self.lib.integrate_fermentation_rk4_f32.argtypes = [
+                POINTER(c_double),  # time_points
+                c_size_t,           # n_points
+                POINTER(c_double),  # y0
+                POINTER(c_float),   # y_out (float32 rows)
+                POINTER(KineticParams),
+                POINTER(OperatingConditions),
+                POINTER(SummaryMetrics),
+                POINTER(StopConditions),
+            ]
+            self.lib.integrate_fermentation_rk4_f32.restype = c_int
+        if self.supports("fermentation_workspace_integrate"):
+            self.lib.fermentation_workspace_create.argtypes = []
+            self.lib.fermentation_workspace_create.restype = ctypes.c_void_p
+            self.lib.fermentation_workspace_destroy.argtypes = [ctypes.c_void_p]
+            self.lib.fermentation_workspace_destroy.restype = None
+            self.lib.fermentation_workspace_set_params.argtypes = [
+                ctypes.c_void_p,
+                POINTER(KineticParams),
+                POINTER(OperatingConditions),
+            ]
+            self.lib.fermentation_workspace_set_params.restype = c_int
+            # Arrays go in as raw addresses (c_void_p): skips data_as() on the hot path
+            self.lib.fermentation_workspace_integrate.argtypes = [
+                ctypes.c_void_p,    # workspace
+                ctypes.c_void_p,    # time_points (double*)
+                c_size_t,           # n_points
+                ctypes.c_void_p,    # y0 (double*)
+                ctypes.c_void_p,    # y_out (double* rows or NULL)
+                ctypes.c_void_p,    # y_out_f32 (float* rows or NULL)
+                POINTER(KineticParams),        # NULL: reuse loaded scenario
+                POINTER(OperatingConditions),
+                POINTER(SummaryMetrics),
+                POINTER(StopConditions),
+            ]
+            self.lib.fermentation_workspace_integrate.restype = c_int
+        if self.supports("integrate_fermentation_rk4_batch"):
+            self.lib.integrate_fermentation_rk4_batch.argtypes = [
+                ctypes.c_void_p,    # time_points (double*)
+                c_size_t,           # n_points
+                c_size_t,           # n_scenarios
+                ctypes.c_void_p,    # y0 (n_scenarios x 6 doubles)
+                ctypes.c_void_p,    # y_out (n_scenarios x n_points x 6 doubles, or NULL)
+                ctypes.c_void_p,    # y_final (n_scenarios x 6 doubles, or NULL)
+                ctypes.c_void_p,    # params (KineticParams[n_scenarios])
+                ctypes.c_void_p,    # ops (OperatingConditions[n_scenarios])
+                ctypes.c_void_p,    # status (int[n_scenarios])
+            ]
+            self.lib.integrate_fermentation_rk4_batch.restype = ctypes.c_long
+
+    def _workspace(self) -> _Workspace:
+        ws = getattr(self._local, "workspace", None)
+        if ws is None:
+            ws = self._local.workspace = _Workspace(self.lib)
+        return ws
+
+    def load_params(self, kinetic: KineticParams, ops: OperatingConditions) -> None:
+        """
+        Load a scenario into this thread's workspace so repeated integrate_ex
+        calls with kinetic=ops=None skip copying and re-deriving parameters.
+        """
+        status = self.lib.fermentation_workspace_set_params(
+            self._workspace().ptr, ctypes.byref(kinetic), ctypes.byref(ops)
+        )
+        if status != 0:
+            raise ValueError(f"fermentation_workspace_set_params returned {status}")
 
     def integrate(
         self,
@@ -97,3 +268,139 @@ class FermentationCLib:
             ctypes.byref(ops),
         )
         return status, y_out
+
+    def integrate_ex(
+        self,
+        t: np.ndarray,
+        y0: np.ndarray,
+        kinetic: KineticParams | None,
+        ops: OperatingConditions | None,
+        summary: SummaryMetrics | None = None,
+        stop: StopConditions | None = None,
+        materialize: bool = True,
+        dtype: str = "float64",
+    ) -> Tuple[int, np.ndarray | None]:
+        """
+        Integrate with optional summary tracking and early termination; the
+        structs are filled in place. y_out is None when not materialized and
+        holds stop.n_completed valid rows when stopped early. dtype="float32"
+        integrates in double precision but writes float32 rows.
+
+        Libraries with the workspace API run on a per-thread workspace
+        (no allocation in C); there kinetic and ops may be None to reuse the
+        scenario from load_params().
+        """
+        t_c = np.ascontiguousarray(t, dtype="float64")
+        y0_c = np.ascontiguousarray(y0, dtype="float64")
+        y_out = np.zeros((t.size, y0.size), dtype=dtype) if materialize else None
+        if self.supports("fermentation_workspace_integrate"):
+            out_f64 = out_f32 = None
+            if y_out is not None and dtype == "float32":
+                out_f32 = y_out.ctypes.data
+            elif y_out is not None:
+                out_f64 = y_out.ctypes.data
+            status = self.lib.fermentation_workspace_integrate(
+                self._workspace().ptr,
+                t_c.ctypes.data,
+                t.size,
+                y0_c.ctypes.data,
+                out_f64,
+                out_f32,
+                ctypes.byref(kinetic) if kinetic is not None else None,
+                ctypes.byref(ops) if ops is not None else None,
+                ctypes.byref(summary) if summary is not None else None,
+                ctypes.byref(stop) if stop is not None else None,
+            )
+            return status, y_out
+        if kinetic is None or ops is None:
+            raise ValueError("kinetic and ops are required without the workspace API")
+        if dtype == "float32":
+            func, c_type = self.lib.integrate_fermentation_rk4_f32, c_float
+        else:
+            func, c_type = self.lib.integrate_fermentation_rk4_ex, c_double
+
+        status = func(
+            t_c.ctypes.data_as(POINTER(c_double)),
+            c_size_t(t.size),
+            y0_c.ctypes.data_as(POINTER(c_double)),
+            y_out.ctypes.data_as(POINTER(c_type)) if y_out is not None else None,
+            ctypes.byref(kinetic),
+            ctypes.byref(ops),
+            ctypes.byref(summary) if summary is not None else None,
+            ctypes.byref(stop) if stop is not None else None,
+        )
+        return status, y_out
+
+    def integrate_batch(
+        self,
+        t: np.ndarray,
+        y0: np.ndarray,
+        kinetic: np.ndarray,
+        ops: np.ndarray,
+        materialize: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray | None, np.ndarray]:
+        """
+        Integrate N scenarios over one grid in a single call. `y0` is (N, 6),
+        `kinetic` / `ops` are KINETIC_DTYPE / OPERATING_DTYPE arrays of length
+        N. Returns (status per scenario, y_out (N, n_points, 6) or None,
+        y_final (N, 6)); rows of failed scenarios are undefined.
+        """
+        n = y0.shape[0]
+        t_c = np.ascontiguousarray(t, dtype="float64")
+        y0_c = np.ascontiguousarray(y0, dtype="float64")
+        kinetic = np.ascontiguousarray(kinetic, dtype=KINETIC_DTYPE)
+        ops = np.ascontiguousarray(ops, dtype=OPERATING_DTYPE)
+        status = np.zeros(n, dtype=np.intc)
+        y_final = np.zeros((n, y0.shape[1]), dtype="float64")
+        y_out = np.zeros((n, t.size, y0.shape[1]), dtype="float64") if materialize else None
+        failed = self.lib.integrate_fermentation_rk4_batch(
+            t_c.ctypes.data,
+            t.size,
+            n,
+            y0_c.ctypes.data,
+            y_out.ctypes.data if y_out is not None else None,
+            y_final.ctypes.data,
+            kinetic.ctypes.data,
+            ops.ctypes.data,
+            status.ctypes.data,
+        )
+        if failed < 0:
+            raise ValueError("integrate_fermentation_rk4_batch rejected its arguments")
+        return status, y_out, y_final
+
+
+_load_lock = threading.Lock()
+_loaded: dict = {}  # path -> FermentationCLib | None
+_status: dict = {"state": "not_loaded", "path": None, "error": None, "capabilities": []}
+
+
+def load_c_library(library_path: str | Path | None = None) -> FermentationCLib | None:
+    """
+    Load the C library once per path; returns None (degraded mode) when it is
+    missing or unusable instead of raising.
+    """
+    path = str(library_path or settings.c_library_path)
+    if path in _loaded:
+        return _loaded[path]
+    with _load_lock:
+        if path in _loaded:
+            return _loaded[path]
+        started = time.perf_counter()
+        try:
+            lib: FermentationCLib | None = FermentationCLib(path)
+            _status.update(
+                state="available", path=path, error=None, capabilities=sorted(lib.capabilities)
+            )
+            logger.info("Loaded C library {} (capabilities: {})", path, sorted(lib.capabilities))
+        except (FileNotFoundError, OSError) as exc:
+            lib = None
+            _status.update(state="unavailable", path=path, error=str(exc), capabilities=[])
+            logger.warning("C library unavailable, using Python integrator: {}", exc)
+        STARTUP_SECONDS.set(time.perf_counter() - started, phase="c_library_load")
+        _loaded[path] = lib
+        return lib
+
+
+def c_library_status() -> dict:
+    """Current load state without triggering a load."""
+    return dict(_status)
@@ -1,8 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import numpy as np
 
 from .base import BaseFermentationModel
+from .batch_model import BatchFermentationModel, BatchSimulationResult
 from ..utils.validation import SimulationRequest
 
 
@@ -11,6 +12,13 @@ class FedBatchSimulationResult:
     time: np.ndarray
     state: np.ndarray
     volume: np.ndarray
+    backend: str = "python"
+    rhs_evals: int = 0
+    timings: dict = field(default_factory=dict)
+    fallback_reason: str | None = None
+    summary: dict | None = None
+    stop_reason: str | None = None
+    resumed_from: float | None = None
 
 
 class FedBatchFermentationModel(BaseFermentationModel):
@@ -18,16 +26,28 @@ class FedBatchFermentationModel(BaseFermentationModel):
     Fed-batch model built on the batch core with dilution and volume dynamics.
     """
 
-    def simulate(self, request: SimulationRequest) -> FedBatchSimulationResult:
-        t = np.linspace(request.t_start, request.t_end, request.n_points)
+    def __init__(self, batch_model: BatchFermentationModel | None = None) -> None:
+        # Share the batch core (and its lazily loaded C library and breaker)
+        self._batch_model = batch_model or BatchFermentationModel()
 
-        # Placeholder: copy batch behavior and add constant volume
-        from .batch_model import BatchFermentationModel
+    def simulate(
+        self, request: SimulationRequest, summary: bool = False, materialize: bool = True
+    ) -> FedBatchSimulationResult:
+        return self.from_batch(self._batch_model.simulate(request, summary, materialize))
 
-        batch_model = BatchFermentationModel()
-        batch_result = batch_model.simulate(request)
+    @staticmethod
+    def from_batch(batch_result: BatchSimulationResult) -> FedBatchSimulationResult:
         volume = batch_result.state[:, 5]
 
         return FedBatchSimulationResult(
-            time=batch_result.time, state=batch_result.state, volume=volume
+            time=batch_result.time,
+            state=batch_result.state,
+            volume=volume,
+            backend=batch_result.backend,
+            rhs_evals=batch_result.rhs_evals,
+            timings=batch_result.timings,
+            fallback_reason=batch_result.fallback_reason,
+            summary=batch_result.summary,
+            stop_reason=batch_result.stop_reason,
+            resumed_from=batch_result.resumed_from,
         )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import math
+import time
+
+import numpy as np
+
+from ..utils.validation import StopConditions
+
+# Python counterpart of the C StopTracker (fermentation_model.c); reason codes
+# match the STOP_* constants in fermentation_model.h.
+
+STATE_INDEX = {"X": 0, "S": 1, "P": 2, "DO": 3, "T": 4, "V": 5}
+STOP_REASONS = {1: "threshold", 2: "steady_state", 3: "max_wall_seconds", 4: "max_rhs_evals"}
+
+
+def threshold_reason(conditions: StopConditions, which: int) -> str:
+    th = conditions.thresholds[which]
+    return f"threshold:{th.variable}{th.op}{th.value:g}"
+
+
+class StopMonitor:
+    """Evaluates StopConditions after each integrator (sub-)step."""
+
+    def __init__(self, conditions: StopConditions) -> None:
+        self.conditions = conditions
+        self._thresholds = [
+            (STATE_INDEX[th.variable], -1 if th.op == "<=" else 1, th.value)
+            for th in conditions.thresholds
+        ]
+        self._wall_start = time.perf_counter()
+        self._steady_since = math.nan
+        self.reason: str | None = None
+
+    def check(
+        self, t_prev: float, dy_prev: np.ndarray, t: float, y: np.ndarray, rhs_evals: int
+    ) -> bool:
+        """True when the run should end after the step that finished at (t, y)."""
+        c = self.conditions
+        for k, (index, direction, limit) in enumerate(self._thresholds):
+            v = y[index]
+            if (direction < 0 and v <= limit) or (direction > 0 and v >= limit):
+                self.reason = threshold_reason(c, k)
+                return True
+        if c.steady_state_tol is not None:
+            if float(np.abs(dy_prev).max()) < c.steady_state_tol:
+                if math.isnan(self._steady_since):
+                    self._steady_since = t_prev
+                if t - self._steady_since >= c.steady_state_hold:
+                    self.reason = STOP_REASONS[2]
+                    return True
+            else:
+                self._steady_since = math.nan
+        if c.max_rhs_evals is not None and rhs_evals >= c.max_rhs_evals:
+            self.reason = STOP_REASONS[4]
+            return True
+        if c.max_wall_seconds is not None and time.perf_counter() - self._wall_start >= c.max_wall_seconds:
+            self.reason = STOP_REASONS[3]
+            return True
+        return False
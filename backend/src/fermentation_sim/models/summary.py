@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import math
+from typing import Callable, Optional
+
+import numpy as np
+
+# Python counterpart of the C SummaryTracker (fermentation_model.c): key metrics
+# updated step by step, with threshold crossings and interior extrema located on
+# the cubic Hermite interpolant of each step.
+
+Rhs = Callable[[float, np.ndarray], np.ndarray]
+
+SUMMARY_FIELDS = (
+    "t_depletion",
+    "DO_min",
+    "t_DO_min",
+    "T_peak",
+    "t_T_peak",
+    "P_final",
+    "t_final",
+    "productivity",
+)
+
+
+def _hermite(t0, t1, y0, y1, f0, f1, s):
+    h = t1 - t0
+    s2 = s * s
+    s3 = s2 * s
+    return (
+        (2 * s3 - 3 * s2 + 1) * y0
+        + (s3 - 2 * s2 + s) * h * f0
+        + (-2 * s3 + 3 * s2) * y1
+        + (s3 - s2) * h * f1
+    )
+
+
+def _hermite_extrema(t0, t1, y0, y1, f0, f1):
+    """(t, value) of interior stationary points of the Hermite cubic on (t0, t1)."""
+    h = t1 - t0
+    d = y0 - y1
+    a = 6 * d + 3 * h * f0 + 3 * h * f1
+    b = -6 * d - 4 * h * f0 - 2 * h * f1
+    c = h * f0
+    if abs(a) < 1e-300:
+        roots = [-c / b] if abs(b) > 1e-300 else []
+    else:
+        disc = b * b - 4 * a * c
+        if disc < 0:
+            return []
+        sq = math.sqrt(disc)
+        roots = [(-b - sq) / (2 * a), (-b + sq) / (2 * a)]
+    return [
+        (t0 + s * h, _hermite(t0, t1, y0, y1, f0, f1, s)) for s in roots if 0.0 < s < 1.0
+    ]
+
+
+class SummaryTracker:
+    """Incrementally tracks depletion time, DO minimum, T peak, final titer and productivity."""
+
+    def __init__(self, t0: float, y0: np.ndarray, s_threshold: float) -> None:
+        self.s_threshold = s_threshold
+        self.t_start = float(t0)
+        self.P0 = float(y0[2])
+        self.t_depletion: float = t0 if y0[1] <= s_threshold else math.nan
+        self.DO_min, self.t_DO_min = float(y0[3]), float(t0)
+        self.T_peak, self.t_T_peak = float(y0[4]), float(t0)
+        self.P_final, self.t_final = float(y0[2]), float(t0)
+        self.productivity = 0.0
+        self._pending: Optional[tuple] = None  # (t0, y0, f0, t1, y1) awaiting f1
+
+    def step(self, t0: float, y0: np.ndarray, f0: np.ndarray, t1: float, y1: np.ndarray) -> None:
+        """Record a completed step; f0 = f(t0, y0) doubles as f1 of the previous step."""
+        self._flush(f0)
+        self._pending = (t0, y0, f0, t1, y1)
+        if y1[3] < self.DO_min:
+            self.DO_min, self.t_DO_min = float(y1[3]), float(t1)
+        if y1[4] > self.T_peak:
+            self.T_peak, self.t_T_peak = float(y1[4]), float(t1)
+        self.P_final, self.t_final = float(y1[2]), float(t1)
+
+    def _flush(self, f1: np.ndarray) -> None:
+        if self._pending is None:
+            return
+        t0, y0, f0, t1, y1 = self._pending
+        self._pending = None
+        # Every interior stationary point is a candidate, as in the C tracker: a
+        # step can dip and recover with the same slope sign at both ends
+        for t, v in _hermite_extrema(t0, t1, y0[3], y1[3], f0[3], f1[3]):
+            if v < self.DO_min:
+                self.DO_min, self.t_DO_min = float(v), float(t)
+        for t, v in _hermite_extrema(t0, t1, y0[4], y1[4], f0[4], f1[4]):
+            if v > self.T_peak:
+                self.T_peak, self.t_T_peak = float(v), float(t)
+        if math.isnan(self.t_depletion) and y1[1] <= self.s_threshold:
+            lo, hi = 0.0, 1.0
+            for _ in range(60):
+                mid = 0.5 * (lo + hi)
+                if _hermite(t0, t1, y0[1], y1[1], f0[1], f1[1], mid) > self.s_threshold:
+                    lo = mid
+                else:
+                    hi = mid
+            self.t_depletion = float(t0 + hi * (t1 - t0))
+
+    def finish(self, rhs: Rhs) -> dict:
+        if self._pending is not None:
+            _, _, _, t1, y1 = self._pending
+            self._flush(rhs(t1, y1))
+        elapsed = self.t_final - self.t_start
+        self.productivity = (self.P_final - self.P0) / elapsed if elapsed > 0 else 0.0
+        return self.as_dict()
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in SUMMARY_FIELDS}
+
+
+def summary_from_trajectory(
+    t: np.ndarray, y: np.ndarray, rhs: Rhs, s_threshold: float
+) -> dict:
+    """
+    Summary of an already materialized trajectory (C builds without the summary
+    entry point). Grid-level candidates are found with NumPy; RHS evaluations
+    are spent only on the steps that need Hermite refinement.
+    """
+    tracker = SummaryTracker(t[0], y[0], s_threshold)
+    n = t.size
+    if n < 2:
+        return tracker.finish(rhs)
+    i_do = int(np.argmin(y[:, 3]))
+    i_T = int(np.argmax(y[:, 4]))
+    below = np.nonzero(y[:, 1] <= s_threshold)[0]
+    steps = {i for i in (i_do, i_do + 1, i_T, i_T + 1) if 1 <= i < n}
+    if below.size and below[0] > 0:
+        steps.add(int(below[0]))
+
+    tracker.DO_min, tracker.t_DO_min = float(y[i_do, 3]), float(t[i_do])
+    tracker.T_peak, tracker.t_T_peak = float(y[i_T, 4]), float(t[i_T])
+    for i in sorted(steps):
+        f0 = rhs(t[i - 1], y[i - 1])
+        f1 = rhs(t[i], y[i])
+        tracker._pending = (t[i - 1], y[i - 1], f0, t[i], y[i])
+        tracker._flush(f1)
+    tracker.P_final, tracker.t_final = float(y[-1, 2]), float(t[-1])
+    return tracker.finish(rhs)
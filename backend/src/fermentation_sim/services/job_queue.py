@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+import json
+import multiprocessing as mp
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from fermentation_sim.config import settings
+from fermentation_sim.utils.validation import SimulationRequest
+
+try:  # POSIX only; memory limits are skipped elsewhere
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+TERMINAL_STATES = ("succeeded", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    result_meta TEXT,
+    max_seconds REAL,
+    max_memory_mb INTEGER,
+    worker_pid INTEGER,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at);
+"""
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobTimeout(Exception):
+    pass
+
+
+class JobStore:
+    """SQLite-backed job table shared by the API process and worker processes."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.results_dir = self.root / "results"
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "jobs.sqlite"
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """An autocommit connection, closed on exit (sqlite3's own context manager does not close)."""
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(
+        self,
+        payload: SimulationRequest,
+        mode: str = "batch",
+        priority: int = 0,
+        max_seconds: float | None = None,
+        max_memory_mb: int | None = None,
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, priority, mode, payload, max_seconds, max_memory_mb,"
+                " created_at) VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    priority,
+                    mode,
+                    payload.model_dump_json(exclude_unset=True),
+                    max_seconds,
+                    max_memory_mb,
+                    time.time(),
+                ),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def list_jobs(self, status: str | None = None, limit: int = 100) -> List[dict]:
+        query, args = "SELECT * FROM jobs", ()
+        if status:
+            query, args = query + " WHERE status = ?", (status,)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY created_at DESC LIMIT ?", (*args, limit))
+            return [self._row_to_dict(r) for r in rows.fetchall()]
+
+    def claim_next(self, worker_pid: int, min_priority: int = 0) -> Optional[dict]:
+        """Atomically move the highest-priority queued job to running."""
+        with self._connect() as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' AND priority >= ?"
+                    " ORDER BY priority DESC, created_at LIMIT 1",
+                    (min_priority,),
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', worker_pid = ?, started_at = ? WHERE id = ?",
+                    (worker_pid, time.time(), row["id"]),
+                )
+                conn.execute("COMMIT")
+                job = self._row_to_dict(row)
+                job["status"] = "running"
+                return job
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """Cancel a queued job immediately; flag a running one for its supervisor."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id),
+            )
+            conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,)
+            )
+        return self.get(job_id)
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def update_progress(self, job_id: str, progress: float) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (progress, job_id))
+
+    def finish(
+        self, job_id: str, status: str, error: str | None = None, result_meta: dict | None = None
+    ) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, result_meta = ?, finished_at = ?,"
+                " progress = CASE WHEN ? = 'succeeded' THEN 1.0 ELSE progress END"
+                " WHERE id = ? AND status = 'running'",
+                (
+                    status,
+                    error,
+                    json.dumps(result_meta) if result_meta is not None else None,
+                    time.time(),
+                    status,
+                    job_id,
+                ),
+            )
+
+    def running_jobs(self) -> List[dict]:
+        return self.list_jobs(status="running", limit=10_000)
+
+    def requeue_orphans(self) -> None:
+        """Jobs whose worker process no longer exists go back to the queue."""
+        for job in self.running_jobs():
+            if not _pid_alive(job["worker_pid"]):
+                with self._connect() as conn:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'queued', worker_pid = NULL, progress = 0"
+                        " WHERE id = ? AND status = 'running'",
+                        (job["id"],),
+                    )
+
+    def result_path(self, job_id: str) -> Path:
+        return self.results_dir / f"{job_id}.npz"
+
+    def save_result(self, job_id: str, time_arr: np.ndarray, state: np.ndarray) -> Path:
+        path = self.result_path(job_id)
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez(tmp, time=time_arr, state=state)
+        os.replace(tmp, path)
+        return path
+
+    def load_result(self, job_id: str) -> Optional[Dict[str, np.ndarray]]:
+        path = self.result_path(job_id)
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            return {"time": data["time"], "state": data["state"]}
+
+    def result_bytes(self, job_id: str) -> Optional[bytes]:
+        path = self.result_path(job_id)
+        return path.read_bytes() if path.exists() else None
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result_meta"] = json.loads(job["result_meta"]) if job["result_meta"] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+
+def _pid_alive(pid: int | None) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _address_space_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _run_job(store: JobStore, service, job: dict, chunk_points: int) -> None:
+    from fermentation_sim.data.preset_service import merge_request_with_preset
+
+    job_id = job["id"]
+    deadline = job["started_at"] + job["max_seconds"] if job["max_seconds"] else None
+
+    def on_progress(fraction: float) -> None:
+        store.update_progress(job_id, fraction)
+        if store.is_cancel_requested(job_id):
+            raise JobCancelled()
+        if deadline is not None and time.time() > deadline:
+            raise JobTimeout(f"exceeded max_seconds={job['max_seconds']}")
+
+    previous_limit = None
+    if resource is not None and job["max_memory_mb"]:
+        base = _address_space_bytes()
+        if base is not None:
+            previous_limit = resource.getrlimit(resource.RLIMIT_AS)
+            resource.setrlimit(
+                resource.RLIMIT_AS, (base + job["max_memory_mb"] * 2**20, previous_limit[1])
+            )
+    try:
+        payload = merge_request_with_preset(SimulationRequest(**job["payload"]))
+        result = service.simulate_chunked(
+            payload, job["mode"], chunk_points=chunk_points, progress=on_progress
+        )
+        store.save_result(job_id, result.time, result.state)
+        meta = service.format_result(payload, job["mode"], result)["meta"]
+        store.finish(job_id, "succeeded", result_meta=meta)
+    except JobCancelled:
+        store.finish(job_id, "cancelled")
+    except JobTimeout as exc:
+        store.finish(job_id, "failed", error=f"timeout: {exc}")
+    except MemoryError:
+        store.finish(job_id, "failed", error=f"exceeded max_memory_mb={job['max_memory_mb']}")
+    except Exception as exc:
+        store.finish(job_id, "failed", error=f"{type(exc).__name__}: {exc}")
+    finally:
+        if previous_limit is not None:
+            resource.setrlimit(resource.RLIMIT_AS, previous_limit)
+
+
+def worker_main(root: str, min_priority: int, poll_interval: float, chunk_points: int) -> None:
+    """Entry point of a worker process: claim and run jobs until terminated."""
+    from fermentation_sim.services.simulation_service import SimulationService
+
+    store = JobStore(root)
+    service = SimulationService()  # one per process: shares the lazily loaded C library
+    pid = os.getpid()
+    while True:
+        job = store.claim_next(pid, min_priority=min_priority)
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        _run_job(store, service, job, chunk_points)
+
+
+class JobWorkerPool:
+    """
+    Local worker processes plus a supervisor thread in the API process.
+
+    The supervisor respawns dead workers, requeues their orphaned jobs, and
+    hard-stops workers whose job overran its wall-clock limit or was cancelled
+    without reaching a cooperative checkpoint.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = 2,
+        interactive_workers: int = 1,
+        interactive_priority: int = 5,
+        poll_interval: float = 0.2,
+        chunk_points: int = 2000,
+        kill_grace_s: float = 2.0,
+    ) -> None:
+        self.store = store
+        # The first `interactive_workers` only take priority >= interactive_priority,
+        # so interactive jobs never wait behind long batch jobs.
+        self._min_priorities = [
+            interactive_priority if i < interactive_workers else 0 for i in range(workers)
+        ]
+        self.poll_interval = poll_interval
+        self.chunk_points = chunk_points
+        self.kill_grace_s = kill_grace_s
+        self._ctx = mp.get_context("spawn")
+        self._procs: List[Optional[mp.Process]] = [None] * workers
+        self._stop = threading.Event()
+        self._supervisor: threading.Thread | None = None
+        self._cancel_seen: Dict[str, float] = {}
+
+    def _spawn(self, slot: int) -> None:
+        proc = self._ctx.Process(
+            target=worker_main,
+            args=(str(self.store.root), self._min_priorities[slot], self.poll_interval, self.chunk_points),
+            daemon=True,
+            name=f"fermentation-job-worker-{slot}",
+        )
+        proc.start()
+        self._procs[slot] = proc
+
+    def start(self) -> "JobWorkerPool":
+        self.store.requeue_orphans()
+        for slot in range(len(self._procs)):
+            self._spawn(slot)
+        self._supervisor = threading.Thread(target=self._supervise, daemon=True)
+        self._supervisor.start()
+        return self
+
+    def _supervise(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            now = time.time()
+            by_pid = {p.pid: (slot, p) for slot, p in enumerate(self._procs) if p is not None}
+            for job in self.store.running_jobs():
+                entry = by_pid.get(job["worker_pid"])
+                if entry is None:
+                    continue
+                limit = job["max_seconds"]
+                overrun = bool(limit) and now > job["started_at"] + limit + self.kill_grace_s
+                stuck = False
+                if job["cancel_requested"]:
+                    # Workers stop at their next chunk checkpoint; force it only after a grace period
+                    stuck = now - self._cancel_seen.setdefault(job["id"], now) > self.kill_grace_s
+                if not (overrun or stuck):
+                    continue
+                _, proc = entry
+                logger.warning("Stopping worker {} for job {}", proc.pid, job["id"])
+                proc.terminate()
+                proc.join(timeout=5)
+                self._cancel_seen.pop(job["id"], None)
+                if stuck:
+                    self.store.finish(job["id"], "cancelled")
+                else:
+                    self.store.finish(job["id"], "failed", error="timeout: worker terminated")
+            for slot, proc in enumerate(self._procs):
+                if proc is not None and not proc.is_alive():
+                    proc.join(timeout=0)  # reap so the pid no longer reads as alive
+                    self._spawn(slot)
+            self.store.requeue_orphans()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._supervisor is not None:
+            self._supervisor.join(timeout=5)
+        for proc in self._procs:
+            if proc is not None and proc.is_alive():
+                proc.terminate()
+                proc.join(timeout=5)
+
+
+_pool_lock = threading.Lock()
+_store: JobStore | None = None
+_pool: JobWorkerPool | None = None
+
+
+def get_job_store() -> JobStore:
+    global _store
+    with _pool_lock:
+        if _store is None:
+            _store = JobStore(settings.job_dir)
+        return _store
+
+
+def ensure_job_workers() -> JobWorkerPool:
+    """Start the local worker pool on first job submission."""
+    global _pool
+    store = get_job_store()
+    with _pool_lock:
+        if _pool is None:
+            _pool = JobWorkerPool(
+                store,
+                workers=settings.job_workers,
+                interactive_workers=settings.job_interactive_workers,
+                interactive_priority=settings.job_interactive_priority,
+                chunk_points=settings.job_chunk_points,
+            ).start()
+        return _pool
+
+
+def shutdown_job_workers() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.stop()
+            _pool = None
+
@@ -0,0 +1,75 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, List, Sequence, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from fermentation_sim.models.batch_model import BatchSimulationResult
+from fermentation_sim.utils.metrics import MICRO_BATCH_SIZE
+from fermentation_sim.utils.validation import SimulationRequest
+
+GridKey = Tuple[float, float, int]
+Dispatch = Callable[[Sequence[SimulationRequest]], list]
+
+
+@dataclass
+class _Group:
+    requests: List[SimulationRequest] = field(default_factory=list)
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class MicroBatcher:
+    """
+    Collects concurrent runs on the same output grid for up to `window`
+    seconds (or until `max_batch` are waiting) and hands each group to
+    `dispatch` in one thread-pool call. `dispatch` gets the requests and
+    returns one result, or exception, per request, in order. Runs differ
+    only in their grid for the solver; the mode is applied per result, so
+    batch and fed-batch runs share groups.
+    """
+
+    def __init__(self, dispatch: Dispatch, window: float = 0.002, max_batch: int = 64) -> None:
+        self._dispatch = dispatch
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict[GridKey, _Group] = {}
+
+    @staticmethod
+    def eligible(request: SimulationRequest, summary: bool, materialize: bool) -> bool:
+        # Plain trajectories only: summaries, stop conditions and dense output stay per request
+        return materialize and not summary and request.stop is None and not request.dense_output
+
+    async def submit(self, request: SimulationRequest) -> BatchSimulationResult:
+        key = (request.t_start, request.t_end, request.n_points)
+        group = self._pending.get(key)
+        if group is None:
+            group = self._pending[key] = _Group()
+            group.timer = asyncio.get_running_loop().call_later(self.window, self._flush, key)
+        waiter = asyncio.get_running_loop().create_future()
+        group.requests.append(request)
+        group.waiters.append(waiter)
+        if len(group.requests) >= self.max_batch:
+            self._flush(key)
+        return await waiter
+
+    def _flush(self, key: GridKey) -> None:
+        group = self._pending.pop(key, None)
+        if group is None:
+            return
+        group.timer.cancel()
+        asyncio.ensure_future(self._run(group))
+
+    async def _run(self, group: _Group) -> None:
+        MICRO_BATCH_SIZE.observe(len(group.requests))
+        try:
+            results = await run_in_threadpool(self._dispatch, group.requests)
+        except Exception as exc:
+            results = [exc] * len(group.requests)
+        for waiter, result in zip(group.waiters, results):
+            if waiter.done():  # caller went away
+                continue
+            if isinstance(result, BaseException):
+                waiter.set_exception(result)
+            else:
+                waiter.set_result(result)
@@ -0,0 +1,191 @@
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from fermentation_sim.models.vectorized import (
+    FEED_MODES,
+    derive_params,
+    initial_states,
+    integrate_batched,
+    stack_params,
+)
+from fermentation_sim.utils.hashing import request_hash
+from fermentation_sim.utils.lru import LRUCache
+from fermentation_sim.utils.validation import OptimizationRequest, SimulationRequest
+
+# Differential evolution (rand/1/bin) settings
+MUTATION = 0.7
+CROSSOVER = 0.9
+CACHE_SIZE = 4096
+
+
+class FeedStrategyOptimizer:
+    """
+    Searches feed parameters (per feed mode) that maximize titer, productivity or
+    yield subject to DO, temperature and volume limits. Each generation's
+    candidates for all modes are simulated together in one batched integration;
+    already-evaluated points come from the cache.
+    """
+
+    def __init__(self, cache: LRUCache | None = None) -> None:
+        # Evaluated candidates: (base hash, mode, tuned parameter names, point) -> metrics
+        self._cache = cache or LRUCache(CACHE_SIZE)
+
+    def optimize(self, request: OptimizationRequest) -> dict:
+        started = time.perf_counter()
+        rng = np.random.default_rng(request.seed)
+        names = list(request.bounds)
+        low = np.array([request.bounds[n][0] for n in names], dtype="float64")
+        high = np.array([request.bounds[n][1] for n in names], dtype="float64")
+        modes = list(dict.fromkeys(request.feed_modes))
+        base_key = request_hash(request.base, "optimize")
+        stats = {"evaluations": 0, "cache_hits": 0}
+        # integrate_batched takes ceil(dt / max_dt) RK4 sub-steps per output interval
+        grid = np.linspace(request.base.t_start, request.base.t_end, request.base.n_points)
+        evals_per_run = 4 * int(np.maximum(1, np.ceil(np.diff(grid) / 0.01)).sum())
+
+        def evaluate(candidates: List[Tuple[str, np.ndarray]]) -> List[tuple]:
+            # Metrics are cached, not scores, so other objectives/limits reuse them
+            keys = [(base_key, mode, tuple(names), tuple(np.round(x, 9))) for mode, x in candidates]
+            results: List[dict | None] = [self._cache.get(k) for k in keys]
+            missing = [i for i, r in enumerate(results) if r is None]
+            stats["cache_hits"] += len(candidates) - len(missing)
+            if missing:
+                fresh = self._simulate(request, names, [candidates[i] for i in missing])
+                stats["evaluations"] += len(missing)
+                for i, value in zip(missing, fresh):
+                    self._cache.put(keys[i], value)
+                    results[i] = value
+            return [self._score(request, metrics) for metrics in results]
+
+        size = request.population
+        population = {m: low + rng.random((size, len(names))) * (high - low) for m in modes}
+        scores = self._split(evaluate([(m, x) for m in modes for x in population[m]]), modes, size)
+        history = [self._generation_best(scores, modes)]
+
+        for _ in range(request.generations):
+            trials = {m: self._mutate(population[m], low, high, rng) for m in modes}
+            trial_scores = self._split(evaluate([(m, x) for m in modes for x in trials[m]]), modes, size)
+            for m in modes:
+                for i in range(size):
+                    if self._better(trial_scores[m][i], scores[m][i]):
+                        population[m][i] = trials[m][i]
+                        scores[m][i] = trial_scores[m][i]
+            history.append(self._generation_best(scores, modes))
+
+        per_mode: Dict[str, dict] = {}
+        for m in modes:
+            best = 0
+            for i in range(1, size):
+                if self._better(scores[m][i], scores[m][best]):
+                    best = i
+            objective, violation, metrics = scores[m][best]
+            params = dict(zip(names, population[m][best].tolist()))
+            per_mode[m] = {
+                "params": params,
+                "objective": objective,
+                "feasible": violation == 0.0,
+                "violation": violation,
+                "metrics": metrics,
+                "request": request.base.model_copy(update={"feed_mode": m, **params}).model_dump(),
+            }
+        winner = modes[0]
+        for m in modes[1:]:
+            if self._better(
+                (per_mode[m]["objective"], per_mode[m]["violation"]),
+                (per_mode[winner]["objective"], per_mode[winner]["violation"]),
+            ):
+                winner = m
+
+        return {
+            "best": {"feed_mode": winner, **per_mode[winner]},
+            "modes": per_mode,
+            "history": history,
+            "meta": {
+                "objective": request.objective,
+                "generations": request.generations,
+                "population": size,
+                "evaluations": stats["evaluations"],
+                "cache_hits": stats["cache_hits"],
+                "rhs_evals": stats["evaluations"] * evals_per_run,
+                "seconds": time.perf_counter() - started,
+            },
+        }
+
+    @staticmethod
+    def _mutate(pop: np.ndarray, low: np.ndarray, high: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        size, dim = pop.shape
+        trials = np.empty_like(pop)
+        for i in range(size):
+            a, b, c = rng.choice([j for j in range(size) if j != i], 3, replace=False)
+            mutant = pop[a] + MUTATION * (pop[b] - pop[c])
+            cross = rng.random(dim) < CROSSOVER
+            cross[rng.integers(dim)] = True  # at least one gene from the mutant
+            trials[i] = np.clip(np.where(cross, mutant, pop[i]), low, high)
+        return trials
+
+    @staticmethod
+    def _better(a: tuple, b: tuple) -> bool:
+        """Feasibility first: lower constraint violation wins, then higher objective."""
+        if a[1] != b[1]:
+            return a[1] < b[1]
+        return a[0] > b[0]
+
+    @staticmethod
+    def _split(results: List[tuple], modes: List[str], size: int) -> Dict[str, List[tuple]]:
+        return {m: results[k * size:(k + 1) * size] for k, m in enumerate(modes)}
+
+    def _generation_best(self, scores: Dict[str, List[tuple]], modes: List[str]) -> dict:
+        best_mode, best = modes[0], scores[modes[0]][0]
+        for m in modes:
+            for s in scores[m]:
+                if self._better(s, best):
+                    best_mode, best = m, s
+        return {"feed_mode": best_mode, "objective": best[0], "feasible": best[1] == 0.0}
+
+    @staticmethod
+    def _simulate(
+        request: OptimizationRequest, names: List[str], candidates: List[Tuple[str, np.ndarray]]
+    ) -> List[dict]:
+        """Metrics per candidate from one batched integration."""
+        base: SimulationRequest = request.base
+        n = len(candidates)
+        p = stack_params([base] * n)
+        for k, name in enumerate(names):
+            p[name] = np.array([x[k] for _, x in candidates], dtype="float64")
+        p["feed_mode"] = np.array([FEED_MODES[mode] for mode, _ in candidates])
+        derive_params(p)
+
+        t = np.linspace(base.t_start, base.t_end, base.n_points)
+        Y0 = initial_states([base] * n)
+        out = integrate_batched(t, Y0, p)
+
+        final = out[-1]
+        V0, V = Y0[:, 5], final[:, 5]
+        product = final[:, 2] * V - Y0[:, 2] * V0
+        consumed = Y0[:, 1] * V0 + p["feed_substrate_conc"] * (V - V0) - final[:, 1] * V
+        metrics = {
+            "titer": final[:, 2],
+            "productivity": (final[:, 2] - Y0[:, 2]) / max(base.t_end - base.t_start, 1e-12),
+            "yield": np.where(consumed > 1e-12, product / np.maximum(consumed, 1e-12), 0.0),
+            "DO_min": out[:, :, 3].min(axis=0),
+            "T_max": out[:, :, 4].max(axis=0),
+            "V_max": out[:, :, 5].max(axis=0),
+        }
+        return [{key: float(values[j]) for key, values in metrics.items()} for j in range(n)]
+
+    @staticmethod
+    def _score(request: OptimizationRequest, metrics: dict) -> tuple:
+        """(objective, violation, metrics); violation sums the relative excess over each limit."""
+        violation = 0.0
+        if request.min_DO is not None:
+            violation += max(request.min_DO - metrics["DO_min"], 0.0) / max(request.min_DO, 1e-9)
+        if request.max_T is not None:
+            violation += max(metrics["T_max"] - request.max_T, 0.0) / request.max_T
+        if request.max_volume is not None:
+            violation += max(metrics["V_max"] - request.max_volume, 0.0) / request.max_volume
+        objective = metrics[request.objective]
+        if not np.isfinite(objective) or not np.isfinite(violation):
+            return float("-inf"), float("inf"), metrics  # diverged candidate ranks last
+        return objective, violation, metrics
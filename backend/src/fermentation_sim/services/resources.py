@@ -0,0 +1,236 @@
+from dataclasses import asdict, dataclass
+from typing import Literal
+
+import numpy as np
+
+from fermentation_sim.config import settings
+from fermentation_sim.utils.validation import (
+    BulkSimulationRequest,
+    OptimizationRequest,
+    PlantRequest,
+    SimulationRequest,
+)
+
+# Cost model, calibrated on the reference container (peak RSS and wall time of
+# /simulation/run for 4e5 output points). An inline JSON response holds the
+# state array, seven Python float lists, their NaN-cleaned copies and the
+# encoded body at once.
+RESPONSE_BYTES_PER_POINT = 540
+DENSE_BYTES_PER_STEP = 3 * 6 * 8  # solver-grid states, derivatives and interpolant
+C_SECONDS_PER_RHS = 5e-8
+PYTHON_SECONDS_PER_RHS = 1.5e-6
+NUMPY_SECONDS_PER_RHS = 2e-7  # per scenario in a vectorized batch
+NUMPY_SECONDS_PER_BATCH_RHS = 5e-5  # fixed cost of one vectorized RHS call, whatever its size
+FALLBACK_MAX_DT = 0.01  # BatchFermentationModel sub-step
+
+Execution = Literal["inline", "stream", "job"]
+
+
+@dataclass(frozen=True)
+class ResourceEstimate:
+    """Predicted cost of a run, computed from the request alone."""
+
+    output_points: int
+    solver_steps: int
+    rhs_evals: int
+    memory_bytes: int  # peak while building the response in memory
+    chunked_memory_bytes: int  # peak of a chunked (job queue) run
+    cpu_seconds: float
+    backend: str  # integrator the estimate assumes: "c", "python" or "numpy"
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "memory_mb": round(self.memory_bytes / 2**20, 1)}
+
+
+class ResourceLimitExceeded(ValueError):
+    """A run exceeds every execution path allowed for it; `reasons` names the limits."""
+
+    def __init__(self, estimate: ResourceEstimate, reasons: list[str]) -> None:
+        super().__init__("; ".join(reasons))
+        self.estimate = estimate
+        self.reasons = reasons
+
+    def detail(self) -> dict:
+        return {"message": str(self), "estimate": self.estimate.as_dict(), "limits": limits()}
+
+
+def limits() -> dict:
+    return {
+        "max_inline_memory_mb": settings.max_inline_memory_mb,
+        "max_inline_cpu_seconds": settings.max_inline_cpu_seconds,
+        "max_job_memory_mb": settings.max_job_memory_mb,
+        "max_optimize_cpu_seconds": settings.max_optimize_cpu_seconds,
+        "oversize_policy": settings.oversize_policy,
+    }
+
+
+def _chunked_bytes(points: int, itemsize: int) -> int:
+    """A chunked run holds time and state rows twice while concatenating its chunks."""
+    return points * 2 * (8 + 6 * itemsize)
+
+
+def _steps(t_start: float, t_end: float, n_intervals: int, c_available: bool) -> int:
+    """Integrator steps over the grid: one per output interval in C, max_dt sub-steps in Python."""
+    if c_available:
+        return n_intervals
+    segment = (t_end - t_start) / max(n_intervals, 1)
+    return n_intervals * max(1, int(np.ceil(segment / FALLBACK_MAX_DT)))
+
+
+def estimate_run(
+    payload: SimulationRequest, c_available: bool = True, materialize: bool = True
+) -> ResourceEstimate:
+    """Cost of one /simulation/run request; without `materialize` only summaries are kept."""
+    output_points = len(payload.t_eval) if payload.t_eval is not None else payload.n_points
+    itemsize = np.dtype(payload.output_precision).itemsize
+    dense_bytes = selection_steps = 0
+    if payload.dense_output:
+        # A chosen step is at worst the finest, after coarser trial runs of fewer steps in all
+        solver_dt = payload.solver_dt or settings.dense_solver_dt
+        intervals = max(1, int(np.ceil((payload.t_end - payload.t_start) / solver_dt)))
+        dense_bytes = (intervals + 1) * DENSE_BYTES_PER_STEP
+        if payload.solver_dt is None and c_available:
+            selection_steps = intervals
+    else:
+        intervals = payload.n_points - 1
+    steps = _steps(payload.t_start, payload.t_end, intervals, c_available) + selection_steps
+    per_point = RESPONSE_BYTES_PER_POINT if materialize else 0
+    rhs_evals = 4 * steps
+    seconds_per_rhs = C_SECONDS_PER_RHS if c_available else PYTHON_SECONDS_PER_RHS
+    return ResourceEstimate(
+        output_points=output_points,
+        solver_steps=steps,
+        rhs_evals=rhs_evals,
+        memory_bytes=output_points * per_point + dense_bytes,
+        chunked_memory_bytes=_chunked_bytes(output_points, itemsize) + dense_bytes,
+        cpu_seconds=rhs_evals * seconds_per_rhs,
+        backend="c" if c_available else "python",
+    )
+
+
+def estimate_bulk(
+    request: BulkSimulationRequest, c_available: bool = True, trajectories: bool = False
+) -> ResourceEstimate:
+    """Cost of a /simulation/bulk submission; without `trajectories` only final states are returned."""
+    n = request.n_scenarios
+    output_points = n * (request.n_points if trajectories else 1)
+    steps = n * _steps(request.t_start, request.t_end, request.n_points - 1, c_available)
+    seconds_per_rhs = C_SECONDS_PER_RHS if c_available else NUMPY_SECONDS_PER_RHS
+    return ResourceEstimate(
+        output_points=output_points,
+        solver_steps=steps,
+        rhs_evals=4 * steps,
+        memory_bytes=output_points * RESPONSE_BYTES_PER_POINT,
+        chunked_memory_bytes=_chunked_bytes(output_points, np.dtype(request.output_precision).itemsize),
+        cpu_seconds=4 * steps * seconds_per_rhs,
+        backend="c" if c_available else "numpy",
+    )
+
+
+def estimate_plant(plant: PlantRequest) -> ResourceEstimate:
+    """
+    Cost of a /simulation/plant run: all vessels advance as one system with a
+    vectorized RHS, on the output grid split at every transfer.
+    """
+    n = len(plant.vessels)
+    output_points = plant.n_points * n
+    steps = _steps(plant.t_start, plant.t_end, plant.n_points - 1, c_available=False) + len(plant.transfers)
+    rhs_evals = 4 * steps  # counted per system evaluation, as in PlantSimulationResult
+    return ResourceEstimate(
+        output_points=output_points,
+        solver_steps=steps,
+        rhs_evals=rhs_evals,
+        memory_bytes=output_points * RESPONSE_BYTES_PER_POINT,
+        chunked_memory_bytes=_chunked_bytes(output_points, 8),
+        cpu_seconds=rhs_evals * (NUMPY_SECONDS_PER_BATCH_RHS + n * NUMPY_SECONDS_PER_RHS),
+        backend="numpy",
+    )
+
+
+def estimate_optimize(request: OptimizationRequest) -> ResourceEstimate:
+    """
+    Worst case (no cache hits) of a /simulation/optimize search: the initial
+    population and every generation each integrate population x feed modes
+    candidates together on the base grid, holding their trajectories at once.
+    """
+    base = request.base
+    candidates = request.population * len(set(request.feed_modes))
+    rounds = request.generations + 1
+    per_run = _steps(base.t_start, base.t_end, base.n_points - 1, c_available=False)
+    steps = rounds * candidates * per_run
+    batch_calls = 4 * rounds * per_run
+    held_bytes = base.n_points * candidates * 6 * 8
+    return ResourceEstimate(
+        output_points=base.n_points * candidates,
+        solver_steps=steps,
+        rhs_evals=4 * steps,
+        memory_bytes=held_bytes,
+        chunked_memory_bytes=held_bytes,
+        cpu_seconds=4 * steps * NUMPY_SECONDS_PER_RHS + batch_calls * NUMPY_SECONDS_PER_BATCH_RHS,
+        backend="numpy",
+    )
+
+
+def plan_execution(estimate: ResourceEstimate, deferrable: tuple = ("stream", "job")) -> Execution:
+    """
+    Where a run executes: "inline" within the inline limits; otherwise, per
+    Settings.oversize_policy and among the `deferrable` paths the caller
+    supports, "stream" (chunked NDJSON with bounded memory, when the CPU
+    estimate is within limits) or "job" (the job queue, when the chunked run
+    fits max_job_memory_mb). Raises ResourceLimitExceeded when no path fits.
+    """
+    reasons = _memory_reasons(estimate)
+    cpu_over = estimate.cpu_seconds > settings.max_inline_cpu_seconds
+    if cpu_over:
+        reasons.append(
+            f"estimated CPU time {estimate.cpu_seconds:.1f} s exceeds "
+            f"max_inline_cpu_seconds={settings.max_inline_cpu_seconds}"
+        )
+    if not reasons:
+        return "inline"
+    policy = settings.oversize_policy
+    if policy == "stream" and "stream" in deferrable and not cpu_over:
+        return "stream"
+    if policy in ("stream", "job") and "job" in deferrable:
+        job_reason = _job_reason(estimate)
+        if job_reason is None:
+            return "job"
+        reasons.append(job_reason)
+    raise ResourceLimitExceeded(estimate, reasons)
+
+
+def check_optimize(estimate: ResourceEstimate) -> None:
+    """Searches run inline only: within max_inline_memory_mb and max_optimize_cpu_seconds."""
+    reasons = _memory_reasons(estimate)
+    if estimate.cpu_seconds > settings.max_optimize_cpu_seconds:
+        reasons.append(
+            f"estimated CPU time {estimate.cpu_seconds:.1f} s exceeds "
+            f"max_optimize_cpu_seconds={settings.max_optimize_cpu_seconds}"
+        )
+    if reasons:
+        raise ResourceLimitExceeded(estimate, reasons)
+
+
+def check_job(estimate: ResourceEstimate) -> None:
+    """Job queue admission: the chunked run must fit max_job_memory_mb."""
+    reason = _job_reason(estimate)
+    if reason is not None:
+        raise ResourceLimitExceeded(estimate, [reason])
+
+
+def _memory_reasons(estimate: ResourceEstimate) -> list[str]:
+    if estimate.memory_bytes <= settings.max_inline_memory_mb * 2**20:
+        return []
+    return [
+        f"estimated response memory {estimate.memory_bytes / 2**20:.0f} MB exceeds "
+        f"max_inline_memory_mb={settings.max_inline_memory_mb}"
+    ]
+
+
+def _job_reason(estimate: ResourceEstimate) -> str | None:
+    if estimate.chunked_memory_bytes <= settings.max_job_memory_mb * 2**20:
+        return None
+    return (
+        f"estimated job memory {estimate.chunked_memory_bytes / 2**20:.0f} MB exceeds "
+        f"max_job_memory_mb={settings.max_job_memory_mb}"
+    )
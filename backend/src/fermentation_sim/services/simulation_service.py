@@ -1,12 +1,40 @@
+import time
 from dataclasses import asdict
-from typing import Literal
+from typing import Callable, Iterator, Literal
 
 import numpy as np
+from fastapi.concurrency import run_in_threadpool
 
-from fermentation_sim.data.preset_service import merge_request_with_preset
-from fermentation_sim.models.batch_model import BatchFermentationModel
-from fermentation_sim.models.fed_batch_model import FedBatchFermentationModel
-from fermentation_sim.utils.validation import SimulationRequest
+from fermentation_sim.config import settings
+from fermentation_sim.data.preset_service import merge_columns_with_presets, merge_request_with_preset
+from fermentation_sim.data.result_store import get_result_store
+from fermentation_sim.models.batch_model import (
+    BatchFermentationModel,
+    BatchSimulationResult,
+    BulkSimulationResult,
+)
+from fermentation_sim.models.fed_batch_model import (
+    FedBatchFermentationModel,
+    FedBatchSimulationResult,
+)
+from fermentation_sim.models.plant_model import PlantModel
+from fermentation_sim.services.incremental import IncrementalSimulator
+from fermentation_sim.services.micro_batch import MicroBatcher
+from fermentation_sim.services.optimizer import FeedStrategyOptimizer
+from fermentation_sim.utils.hashing import request_hash
+from fermentation_sim.utils.metrics import RHS_EVALUATIONS, SIMULATIONS
+from fermentation_sim.utils.profiling import PhaseTimer
+from fermentation_sim.utils.serialization import column_to_list
+from fermentation_sim.utils.validation import (
+    BulkSimulationRequest,
+    OptimizationRequest,
+    PlantRequest,
+    SimulationRequest,
+    column_arrays,
+    validate_columns,
+)
+
+STATE_NAMES = ("X", "S", "P", "DO", "T", "V")
 
 
 class SimulationService:
@@ -14,37 +42,360 @@ class SimulationService:
 
     def __init__(self) -> None:
         self._batch_model = BatchFermentationModel()
-        self._fed_batch_model = FedBatchFermentationModel()
+        self._fed_batch_model = FedBatchFermentationModel(self._batch_model)
+        self._plant_model = PlantModel()
+        self._optimizer = FeedStrategyOptimizer()
+        self._incremental = IncrementalSimulator(self._batch_model, settings.incremental_cache_entries)
+        self._micro_batcher = MicroBatcher(
+            self._simulate_group, settings.micro_batch_window_ms / 1000.0, settings.micro_batch_max
+        )
+
+    @property
+    def c_available(self) -> bool:
+        """Whether runs will use the C integrator (loads the library on first use)."""
+        return self._batch_model.c_lib is not None
 
     def run_simulation(
         self,
         payload: SimulationRequest,
         mode: Literal["batch", "fed_batch"] = "batch",
+        timer: PhaseTimer | None = None,
+        store: bool = False,
+        summary: bool = False,
+        summary_only: bool = False,
+    ) -> dict:
+        """
+        `summary` adds the integrator-tracked key metrics to the response;
+        `summary_only` returns just meta and summary without materializing the
+        trajectory (cannot be combined with `store`).
+        """
+        if summary_only and store:
+            raise ValueError("summary_only runs have no trajectory to store")
+        timer = timer or PhaseTimer()
+        with timer.phase("preset_merge"):
+            payload = merge_request_with_preset(payload)
+        result = self.simulate(
+            payload, mode, summary=summary or summary_only, materialize=not summary_only
+        )
+        return self.respond(payload, mode, result, timer, store=store, summary_only=summary_only)
+
+    def respond(
+        self,
+        payload: SimulationRequest,
+        mode: str,
+        result: BatchSimulationResult | FedBatchSimulationResult,
+        timer: PhaseTimer,
+        store: bool = False,
+        summary_only: bool = False,
     ) -> dict:
-        payload = merge_request_with_preset(payload)
-        if mode == "batch":
-            result = self._batch_model.simulate(payload)
-            state = result.state
+        """API response for a finished run of the preset-merged `payload`, archiving it if `store`."""
+        timer.merge(result.timings)
+        response = self.format_result(payload, mode, result, timer, summary_only=summary_only)
+        if store:
+            with timer.phase("store"):
+                response["meta"]["result_key"] = self.store_result(payload, mode, result)
+        return response
+
+    @staticmethod
+    def store_result(payload: SimulationRequest, mode: str, result) -> str:
+        """Archive the trajectory in the result store; returns its request-hash key."""
+        key = request_hash(payload, mode)
+        meta = {"backend": result.backend, "request": payload.model_dump(mode="json")}
+        get_result_store().write(key, result.time, result.state, mode=mode, meta=meta)
+        return key
+
+    def simulate(
+        self,
+        payload: SimulationRequest,
+        mode: Literal["batch", "fed_batch"] = "batch",
+        summary: bool = False,
+        materialize: bool = True,
+    ) -> BatchSimulationResult | FedBatchSimulationResult:
+        """
+        Run an already preset-merged request and record integrator counters.
+        Plain trajectory runs go through the incremental simulator, which
+        recomputes only what changed since a cached run of a matching request.
+        """
+        if mode in ("batch", "fed_batch") and self._incremental.eligible(payload, summary, materialize):
+            result = self._incremental.simulate(payload)
+            if mode == "fed_batch":
+                result = FedBatchFermentationModel.from_batch(result)
+        elif mode == "batch":
+            result = self._batch_model.simulate(payload, summary, materialize)
         elif mode == "fed_batch":
-            result = self._fed_batch_model.simulate(payload)
-            state = result.state
+            result = self._fed_batch_model.simulate(payload, summary, materialize)
         else:
             raise ValueError(f"Unsupported mode: {mode}")
+        self._record(result, mode)
+        return result
 
+    async def simulate_async(
+        self,
+        payload: SimulationRequest,
+        mode: Literal["batch", "fed_batch"] = "batch",
+        summary: bool = False,
+        materialize: bool = True,
+    ) -> BatchSimulationResult | FedBatchSimulationResult:
+        """
+        `simulate` for the event loop. Plain trajectory runs join the
+        micro-batcher, which integrates concurrent runs on the same grid in one
+        dispatch; everything else runs alone in the thread pool.
+        """
+        if mode not in ("batch", "fed_batch"):
+            raise ValueError(f"Unsupported mode: {mode}")
+        if self._micro_batcher.window <= 0 or not self._micro_batcher.eligible(payload, summary, materialize):
+            return await run_in_threadpool(self.simulate, payload, mode, summary, materialize)
+        result = await self._micro_batcher.submit(payload)
+        if mode == "fed_batch":
+            result = FedBatchFermentationModel.from_batch(result)
+        self._record(result, mode)
+        return result
+
+    def _simulate_group(self, payloads: list[SimulationRequest]) -> list:
+        """Micro-batcher dispatch: a lone run keeps the incremental cache, a group is integrated together."""
+        if len(payloads) == 1:
+            try:
+                return [self._incremental.simulate(payloads[0])]
+            except Exception as exc:
+                return [exc]
+        t = np.linspace(payloads[0].t_start, payloads[0].t_end, payloads[0].n_points)
+        return self._batch_model.integrate_many(payloads, t)
+
+    def simulate_chunked(
+        self,
+        payload: SimulationRequest,
+        mode: Literal["batch", "fed_batch"] = "batch",
+        chunk_points: int = 2000,
+        progress: Callable[[float], None] | None = None,
+    ) -> BatchSimulationResult:
+        """
+        `iter_chunks` collected into one result. `progress` is called with the
+        completed fraction after each chunk and may raise to abort the run.
+        """
+        if mode not in ("batch", "fed_batch"):
+            raise ValueError(f"Unsupported mode: {mode}")
+        if payload.dense_output:
+            # Output rows are interpolated, not stepped: one pass over the solver grid
+            result = self.simulate(payload, mode)
+            if progress is not None:
+                progress(1.0)
+            return result
+
+        times, states = [], []
+        rhs_evals, backends, fallback_reason, stop_reason = 0, set(), None, None
+        timings: dict = {}
+        rows = 0
+        for part in self.iter_chunks(payload, mode, chunk_points):
+            times.append(part.time)
+            states.append(part.state)
+            stop_reason = part.stop_reason
+            if part.rhs_evals == 0:
+                continue  # budget already exhausted: no integration happened
+            rows += part.time.size
+            rhs_evals += part.rhs_evals
+            backends.add(part.backend)
+            fallback_reason = fallback_reason or part.fallback_reason
+            for name, seconds in part.timings.items():
+                timings[name] = timings.get(name, 0.0) + seconds
+            if progress is not None:
+                progress((rows - 1) / (payload.n_points - 1))
+
+        return BatchSimulationResult(
+            time=np.concatenate(times),
+            state=np.concatenate(states),
+            backend="c" if backends == {"c"} else "python",
+            rhs_evals=rhs_evals,
+            timings=timings,
+            fallback_reason=fallback_reason,
+            stop_reason=stop_reason,
+        )
+
+    def iter_chunks(
+        self,
+        payload: SimulationRequest,
+        mode: Literal["batch", "fed_batch"] = "batch",
+        chunk_points: int = 2000,
+    ) -> Iterator[BatchSimulationResult]:
+        """
+        Integrate the output grid in consecutive chunks, resuming each from the
+        previous chunk's final state, and yield each chunk's new rows as soon
+        as it is done (the first chunk starts with the initial row), so only
+        one chunk is held at a time. Stop conditions apply to the whole run:
+        wall-clock and RHS budgets carry over between chunks and the chunk that
+        ends the run early carries its stop_reason; a budget exhausted between
+        chunks ends the run with a chunk without integration (rhs_evals=0).
+        Not for dense-output requests.
+        """
+        if payload.dense_output:
+            raise ValueError("dense-output runs are interpolated in one pass, not chunked")
+        t = np.linspace(payload.t_start, payload.t_end, payload.n_points)
+        y = self._batch_model.initial_state(payload)
+        chunk_points = max(int(chunk_points), 2)
+        # Chunks integrate and resume in float64; only the emitted rows are reduced
+        dtype = np.dtype(payload.output_precision)
+
+        rhs_evals, backends = 0, set()
+        started = time.perf_counter()
+        for lo in range(0, t.size - 1, chunk_points - 1):
+            first = 0 if lo == 0 else 1  # later chunks start on the previous chunk's last row
+            grid = t[lo : lo + chunk_points]
+            chunk_payload, exhausted = self._remaining_budget(
+                payload, time.perf_counter() - started, rhs_evals
+            )
+            if exhausted is not None:
+                rows = slice(0, 1 - first)
+                yield BatchSimulationResult(
+                    time=grid[rows], state=y[None, :][rows].astype(dtype), stop_reason=exhausted
+                )
+                break
+            part = self._batch_model.integrate(chunk_payload, grid, y, dtype="float64")
+            y = part.state[-1]
+            rhs_evals += part.rhs_evals
+            backends.add(part.backend)
+            RHS_EVALUATIONS.inc(part.rhs_evals, backend=part.backend)
+            part.time, part.state = part.time[first:], part.state[first:].astype(dtype)
+            yield part
+            if part.stop_reason is not None:
+                break
+        SIMULATIONS.inc(mode=mode, backend="c" if backends == {"c"} else "python")
+
+    @staticmethod
+    def _remaining_budget(
+        payload: SimulationRequest, elapsed: float, rhs_evals: int
+    ) -> tuple[SimulationRequest, str | None]:
+        """
+        `payload` with wall-clock/RHS limits reduced by what earlier chunks
+        used, plus the name of the limit that is already exhausted, if any.
+        """
+        stop = payload.stop
+        if stop is None or (stop.max_wall_seconds is None and stop.max_rhs_evals is None):
+            return payload, None
+        update = {}
+        if stop.max_wall_seconds is not None:
+            if elapsed >= stop.max_wall_seconds:
+                return payload, "max_wall_seconds"
+            update["max_wall_seconds"] = stop.max_wall_seconds - elapsed
+        if stop.max_rhs_evals is not None:
+            if rhs_evals >= stop.max_rhs_evals:
+                return payload, "max_rhs_evals"
+            update["max_rhs_evals"] = stop.max_rhs_evals - rhs_evals
+        return payload.model_copy(update={"stop": stop.model_copy(update=update)}), None
+
+    def run_bulk(
+        self, request: BulkSimulationRequest, timer: PhaseTimer | None = None, trajectories: bool = False
+    ) -> BulkSimulationResult:
+        """
+        Integrate a column-wise submission without building a SimulationRequest
+        per scenario: columns are preset-merged and validated as whole arrays
+        (BulkValidationError names the offending rows), then integrated in one
+        batch. Only final states are kept unless `trajectories`.
+        """
+        timer = timer or PhaseTimer()
+        with timer.phase("columns"):
+            columns = column_arrays(request)
+        with timer.phase("preset_merge"):
+            columns = merge_columns_with_presets(columns, request.n_scenarios)
+        with timer.phase("validate"):
+            validate_columns(columns)
+        t = np.linspace(request.t_start, request.t_end, request.n_points)
+        result = self._batch_model.integrate_columns(columns, t, trajectories, request.output_precision)
+        timer.merge(result.timings)
+        for backend in np.unique(result.backend):
+            rows = result.backend == backend
+            RHS_EVALUATIONS.inc(int(result.rhs_evals[rows].sum()), backend=str(backend))
+            SIMULATIONS.inc(int(rows.sum()), mode="bulk", backend=str(backend))
+        return result
+
+    def run_plant(self, plant: PlantRequest, timer: PhaseTimer | None = None) -> dict:
+        """Simulate coupled vessels; each vessel's params are preset-merged first."""
+        timer = timer or PhaseTimer()
+        with timer.phase("preset_merge"):
+            vessel_params = [merge_request_with_preset(v.params) for v in plant.vessels]
+        result = self._plant_model.simulate(plant, vessel_params)
+        timer.merge(result.timings)
+        RHS_EVALUATIONS.inc(result.rhs_evals, backend="numpy")
+        SIMULATIONS.inc(mode="plant", backend="numpy")
+
+        with timer.phase("tolist"):
+            vessels = {
+                name: {var: column_to_list(result.state[:, j, k]) for k, var in enumerate(STATE_NAMES)}
+                for j, name in enumerate(result.vessels)
+            }
+            utilities: dict = {}
+            if result.coolant_temp is not None:
+                utilities["coolant_temp"] = result.coolant_temp.tolist()
+            if result.aeration is not None:
+                utilities["aeration"] = {
+                    name: result.aeration[:, j].tolist() for j, name in enumerate(result.vessels)
+                }
         return {
             "meta": {
-                "mode": mode,
-                "n_points": int(state.shape[0]),
-                "state_dim": int(state.shape[1]),
-                "request": payload.model_dump(),
+                "mode": "plant",
+                "n_points": int(result.time.size),
+                "n_vessels": len(result.vessels),
+                "backend": "numpy",
+                "rhs_evals": int(result.rhs_evals),
+                "request": plant.model_dump(),
             },
             "time": result.time.tolist(),
-            "states": {
-                "X": state[:, 0].tolist(),
-                "S": state[:, 1].tolist(),
-                "P": state[:, 2].tolist(),
-                "DO": state[:, 3].tolist(),
-                "T": state[:, 4].tolist(),
-                "V": state[:, 5].tolist(),
-            },
+            "vessels": vessels,
+            "utilities": utilities,
+        }
+
+    def optimize(self, request: OptimizationRequest, timer: PhaseTimer | None = None) -> dict:
+        """Feed-strategy search over the preset-merged base recipe."""
+        timer = timer or PhaseTimer()
+        with timer.phase("preset_merge"):
+            request = request.model_copy(update={"base": merge_request_with_preset(request.base)})
+        with timer.phase("optimize"):
+            result = self._optimizer.optimize(request)
+        RHS_EVALUATIONS.inc(result["meta"]["rhs_evals"], backend="numpy")
+        SIMULATIONS.inc(mode="optimize", backend="numpy")
+        return result
+
+    @staticmethod
+    def _record(result, mode: str) -> None:
+        RHS_EVALUATIONS.inc(result.rhs_evals, backend=result.backend)
+        SIMULATIONS.inc(mode=mode, backend=result.backend)
+
+    @staticmethod
+    def format_result(
+        payload: SimulationRequest,
+        mode: str,
+        result: BatchSimulationResult | FedBatchSimulationResult,
+        timer: PhaseTimer | None = None,
+        summary_only: bool = False,
+    ) -> dict:
+        timer = timer or PhaseTimer()
+        state = result.state
+        requested_points = len(payload.t_eval) if payload.t_eval is not None else payload.n_points
+        meta = {
+            "mode": mode,
+            "n_points": int(requested_points if summary_only else state.shape[0]),
+            "state_dim": int(state.shape[1]),
+            "dtype": state.dtype.name,
+            "backend": result.backend,
+            "rhs_evals": int(result.rhs_evals),
+            "fallback_reason": result.fallback_reason,
+            "stop_reason": result.stop_reason,
+            "resumed_from": result.resumed_from,
+            "request": payload.model_dump(),
         }
+        if summary_only:
+            return {"meta": meta, "summary": result.summary}
+
+        with timer.phase("tolist"):
+            time_list = result.time.tolist()
+            states = {
+                "X": column_to_list(state[:, 0]),
+                "S": column_to_list(state[:, 1]),
+                "P": column_to_list(state[:, 2]),
+                "DO": column_to_list(state[:, 3]),
+                "T": column_to_list(state[:, 4]),
+                "V": column_to_list(state[:, 5]),
+            }
+
+        response = {"meta": meta, "time": time_list, "states": states}
+        if result.summary is not None:
+            response["summary"] = result.summary
+        return response
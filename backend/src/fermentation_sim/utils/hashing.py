@@ -0,0 +1,15 @@
+import hashlib
+import json
+
+from fermentation_sim.utils.validation import SimulationRequest
+
+
+def request_hash(payload: SimulationRequest, mode: str = "batch", exclude: frozenset = frozenset()) -> str:
+    """
+    Canonical hash of a (preset-merged) request: every effective field value,
+    key-sorted, plus the mode. Two requests that simulate the same thing hash
+    the same regardless of field order or which fields came from a preset.
+    """
+    data = payload.model_dump(mode="json", exclude=set(exclude) or None)
+    canonical = json.dumps({"mode": mode, "request": data}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from fermentation_sim.utils.metrics import PHASE_SECONDS
+
+
+class PhaseTimer:
+    """Accumulates wall-clock time per named phase and exports it as histograms."""
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        PHASE_SECONDS.observe(seconds, phase=name)
+
+    def merge(self, timings: Dict[str, float]) -> None:
+        for name, seconds in timings.items():
+            self.record(name, seconds)
+
+    def as_ms(self) -> Dict[str, float]:
+        return {name: round(seconds * 1e3, 4) for name, seconds in self.timings.items()}
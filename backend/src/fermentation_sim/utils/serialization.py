@@ -0,0 +1,31 @@
+import math
+
+import numpy as np
+
+
+def clean_non_finite(obj):
+    """Recursively replace NaN/Inf floats with None so the payload is valid JSON."""
+    if isinstance(obj, float):
+        if math.isnan(obj) or math.isinf(obj):
+            return None
+        return obj
+    if isinstance(obj, dict):
+        return {k: clean_non_finite(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [clean_non_finite(x) for x in obj]
+    return obj
+
+
+def column_to_list(values: np.ndarray) -> list:
+    """
+    Array column as a list of Python floats. float32 columns are rounded to 7
+    significant digits first so the JSON carries short decimals instead of the
+    float64 expansion of each float32 value.
+    """
+    if values.dtype != np.float32:
+        return values.tolist()
+    x = values.astype("float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exponent = np.floor(np.log10(np.abs(x)))
+    scale = 10.0 ** (6 - np.where(np.isfinite(exponent), exponent, 0.0))
+    return np.where(np.isfinite(x), np.round(x * scale) / scale, x).tolist()
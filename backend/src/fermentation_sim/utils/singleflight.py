@@ -0,0 +1,47 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from fermentation_sim.utils.metrics import COALESCED_REQUESTS
+
+
+class SingleFlight:
+    """
+    In-flight deduplication of identical calls. The first caller for a key
+    starts `fn()` as a task; callers arriving while it runs await the same
+    task and get the same result object, or the same exception. The task is
+    not tied to any caller, so a disconnecting first caller does not cancel
+    the others. Nothing is kept once the call completes.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def run(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]], timeout: float | None = None
+    ) -> Tuple[Any, bool]:
+        """
+        (result, shared): `shared` is True when the call joined one already in
+        flight. Joining callers wait at most `timeout` seconds
+        (asyncio.TimeoutError); the call itself keeps running for the others.
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            COALESCED_REQUESTS.inc()
+        else:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        wait = asyncio.shield(task)
+        if shared and timeout is not None:
+            return await asyncio.wait_for(wait, timeout), shared
+        return await wait, shared
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here so an unawaited failure is not logged as lost
@@ -1,4 +1,27 @@
-from pydantic import BaseModel, ConfigDict, Field
+import re
+from typing import Any, Dict, List, Literal, Tuple
+
+import annotated_types
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class StopThreshold(BaseModel):
+    variable: Literal["X", "S", "P", "DO", "T", "V"]
+    op: Literal["<=", ">="] = Field(..., description="Stop once `variable op value` holds")
+    value: float
+
+
+class StopConditions(BaseModel):
+    """Early termination; the trajectory is truncated at the first step that meets any criterion."""
+
+    thresholds: List[StopThreshold] = Field(default_factory=list, max_length=8)
+    steady_state_tol: float | None = Field(
+        None, gt=0, description="Stop when max |dy/dt| stays below this value..."
+    )
+    steady_state_hold: float = Field(0.5, ge=0, description="...for this long (h)")
+    max_wall_seconds: float | None = Field(None, gt=0)
+    max_rhs_evals: int | None = Field(None, gt=0)
 
 
 class SimulationRequest(BaseModel):
@@ -19,6 +42,21 @@ class SimulationRequest(BaseModel):
     t_start: float = Field(0, ge=0)
     t_end: float = Field(24.0, gt=0)
     n_points: int = Field(241, ge=2)
+    t_eval: List[float] | None = Field(
+        None,
+        min_length=1,
+        description="Irregular output times (h), non-decreasing within [t_start, t_end]; replaces n_points",
+    )
+    solver_dt: float | None = Field(
+        None,
+        gt=0,
+        description="Fixed internal solver step (h); outputs are interpolated. Implied by t_eval",
+    )
+    solver_rtol: float | None = Field(
+        None,
+        gt=0,
+        description="Relative tolerance of the solver step chosen for t_eval without solver_dt",
+    )
 
     # Kinetic parameters
     mu_max: float = Field(0.4, gt=0)
@@ -60,3 +98,254 @@ class SimulationRequest(BaseModel):
     coolant_flow: float = Field(1.0, ge=0)
     agit_power_coeff: float = Field(2.0, ge=0, description="Mechanical power coefficient (W/(L*rpm^3))")
     agit_heat_eff: float = Field(0.5, ge=0, le=1, description="Fraction of mechanical power to heat")
+
+    # Output
+    output_precision: str = Field(
+        "float64",
+        pattern="^(float64|float32)$",
+        description="Precision of the returned/stored trajectory; integration is always float64",
+    )
+
+    # Early termination
+    stop: StopConditions | None = Field(None, description="Optional early stop conditions")
+
+    # Summary metrics
+    depletion_threshold: float = Field(
+        0.01, gt=0, description="Substrate level (g/L) counted as depleted in the run summary"
+    )
+
+    @model_validator(mode="after")
+    def _check_t_eval(self) -> "SimulationRequest":
+        if self.t_eval is not None:
+            if any(b < a for a, b in zip(self.t_eval, self.t_eval[1:])):
+                raise ValueError("t_eval must be non-decreasing")
+            if self.t_eval[0] < self.t_start or self.t_eval[-1] > self.t_end:
+                raise ValueError("t_eval must lie within [t_start, t_end]")
+        return self
+
+    @property
+    def dense_output(self) -> bool:
+        """Whether outputs are interpolated from a solver grid of their own."""
+        return self.t_eval is not None or self.solver_dt is not None
+
+
+class VesselSpec(BaseModel):
+    name: str = Field(..., min_length=1, max_length=64)
+    params: SimulationRequest = Field(
+        default_factory=SimulationRequest,
+        description="Vessel parameters; the time grid fields are taken from the plant request",
+    )
+    start_time: float | None = Field(
+        None, ge=0, description="When the vessel starts running; defaults to its first inbound transfer, else t_start"
+    )
+
+
+class Transfer(BaseModel):
+    source: str
+    target: str
+    time: float = Field(..., ge=0, description="Transfer time (h)")
+    volume: float | None = Field(None, gt=0, description="Broth volume moved (L); default: all of it")
+
+
+class CoolantLoop(BaseModel):
+    """Coolant shared by all running vessels; its temperature rises with the total heat removed."""
+
+    supply_temp: float = Field(20.0, description="Coolant inlet temperature (°C)")
+    flow: float = Field(10.0, gt=0, description="Loop flow (L/h)")
+    heat_capacity: float = Field(4.18e3, gt=0, description="Heat capacity per unit flow (same units as U*A)")
+
+
+class AirSupply(BaseModel):
+    capacity: float = Field(..., gt=0, description="Total aeration shared by running vessels")
+
+
+class PlantRequest(BaseModel):
+    vessels: List[VesselSpec] = Field(..., min_length=1, max_length=200)
+    transfers: List[Transfer] = Field(default_factory=list)
+    coolant: CoolantLoop | None = None
+    air: AirSupply | None = None
+
+    t_start: float = Field(0, ge=0)
+    t_end: float = Field(24.0, gt=0)
+    n_points: int = Field(241, ge=2)
+
+    @model_validator(mode="after")
+    def _check_topology(self) -> "PlantRequest":
+        names = [v.name for v in self.vessels]
+        if len(set(names)) != len(names):
+            raise ValueError("vessel names must be unique")
+        for tr in self.transfers:
+            if tr.source not in names or tr.target not in names:
+                raise ValueError(f"transfer {tr.source}->{tr.target} references an unknown vessel")
+            if tr.source == tr.target:
+                raise ValueError("transfer source and target must differ")
+        if self.t_end <= self.t_start:
+            raise ValueError("t_end must be greater than t_start")
+        return self
+
+
+TunableFeedParam = Literal["feed_rate", "feed_rate_end", "feed_tau", "feed_start"]
+FeedMode = Literal["constant", "ramp", "exponential", "do_control"]
+
+
+class OptimizationRequest(BaseModel):
+    base: SimulationRequest = Field(
+        default_factory=SimulationRequest, description="Recipe whose feed strategy is optimized"
+    )
+    feed_modes: List[FeedMode] = Field(["constant"], min_length=1, max_length=4)
+    bounds: Dict[TunableFeedParam, Tuple[float, float]] = Field(
+        ..., description="Search box per tuned feed parameter: [low, high]"
+    )
+    objective: Literal["titer", "productivity", "yield"] = "titer"
+
+    # Constraints over the whole run
+    min_DO: float | None = Field(None, ge=0, description="Minimum dissolved oxygen (g/L)")
+    max_T: float | None = Field(None, gt=0, description="Maximum temperature (°C)")
+    max_volume: float | None = Field(None, gt=0, description="Maximum working volume (L)")
+
+    population: int = Field(16, ge=4, le=256, description="Candidates per feed mode and generation")
+    generations: int = Field(15, ge=1, le=200)
+    seed: int | None = None
+
+    @model_validator(mode="after")
+    def _check_bounds(self) -> "OptimizationRequest":
+        if not self.bounds:
+            raise ValueError("bounds must name at least one feed parameter")
+        for name, (low, high) in self.bounds.items():
+            if not 0 <= low <= high:
+                raise ValueError(f"bounds for {name} must satisfy 0 <= low <= high")
+        return self
+
+
+
+# Fields shared by every scenario of a bulk submission (the time grid and output options);
+# all other SimulationRequest fields may be given per scenario.
+BULK_SHARED_FIELDS = frozenset(
+    {
+        "t_start", "t_end", "n_points", "t_eval", "solver_dt", "solver_rtol",
+        "output_precision", "stop", "depletion_threshold",
+    }
+)
+SCENARIO_FIELDS = tuple(name for name in SimulationRequest.model_fields if name not in BULK_SHARED_FIELDS)
+STRING_FIELDS = frozenset(
+    name for name in SCENARIO_FIELDS if SimulationRequest.model_fields[name].annotation is not float
+)
+MAX_BULK_SCENARIOS = 100_000
+
+
+class BulkSimulationRequest(BaseModel):
+    """
+    Many scenarios on one time grid, column-wise: `columns` maps a
+    SimulationRequest field to one value per scenario, or to a single value
+    shared by all. Null entries are unset (filled from the preset, else the
+    field default). Values are validated vectorized by `validate_columns`.
+    """
+
+    columns: Dict[str, Any] = Field(..., description="Field -> list of per-scenario values, or a scalar")
+    t_start: float = Field(0, ge=0)
+    t_end: float = Field(24.0, gt=0)
+    n_points: int = Field(241, ge=2)
+    output_precision: str = Field("float64", pattern="^(float64|float32)$")
+
+    @model_validator(mode="after")
+    def _check_columns(self) -> "BulkSimulationRequest":
+        unknown = sorted(set(self.columns) - set(SCENARIO_FIELDS))
+        if unknown:
+            raise ValueError(f"not per-scenario fields: {', '.join(unknown)}")
+        lengths = {len(v) for v in self.columns.values() if isinstance(v, list)}
+        if len(lengths) > 1:
+            raise ValueError(f"columns differ in length: {sorted(lengths)}")
+        if lengths and not 1 <= lengths.pop() <= MAX_BULK_SCENARIOS:
+            raise ValueError(f"between 1 and {MAX_BULK_SCENARIOS} scenarios per submission")
+        return self
+
+    @property
+    def n_scenarios(self) -> int:
+        return next((len(v) for v in self.columns.values() if isinstance(v, list)), 1)
+
+
+class BulkValidationError(ValueError):
+    """Column constraint violations; `errors` follows pydantic's loc/msg/type layout."""
+
+    def __init__(self, errors: List[dict]) -> None:
+        super().__init__("; ".join(f"{'.'.join(map(str, e['loc'][1:]))}: {e['msg']}" for e in errors))
+        self.errors = errors
+
+
+def column_arrays(request: BulkSimulationRequest) -> Dict[str, np.ndarray]:
+    """
+    Given columns as arrays of length n_scenarios: float64 with NaN for unset
+    entries, object arrays for the string fields (None for unset).
+    """
+    n = request.n_scenarios
+    arrays: Dict[str, np.ndarray] = {}
+    errors: List[dict] = []
+    for name, values in request.columns.items():
+        values = values if isinstance(values, list) else [values] * n
+        if name in STRING_FIELDS:
+            bad = [row for row, v in enumerate(values) if v is not None and not isinstance(v, str)]
+            for row in bad[:5]:
+                msg = "Input should be a string or null"
+                errors.append({"loc": ["columns", name, row], "msg": msg, "type": "string_type"})
+            column = np.empty(len(values), dtype=object)
+            column[:] = values
+            arrays[name] = column
+            continue
+        try:
+            column = np.array(values, dtype="float64")
+        except (TypeError, ValueError):
+            column = None
+        if column is None or column.ndim != 1:
+            errors.append({"loc": ["columns", name], "msg": "Input should be numbers or null", "type": "float_type"})
+            continue
+        arrays[name] = column
+    if errors:
+        raise BulkValidationError(errors)
+    return arrays
+
+
+# (bound type, attribute, vectorized test, message, pydantic error type)
+_BOUNDS = (
+    (annotated_types.Gt, "gt", np.greater, "greater than", "greater_than"),
+    (annotated_types.Ge, "ge", np.greater_equal, "greater than or equal to", "greater_than_equal"),
+    (annotated_types.Lt, "lt", np.less, "less than", "less_than"),
+    (annotated_types.Le, "le", np.less_equal, "less than or equal to", "less_than_equal"),
+)
+
+
+def validate_columns(columns: Dict[str, np.ndarray], max_rows_reported: int = 5) -> None:
+    """
+    Apply SimulationRequest's field constraints to complete (merged) columns in
+    one vectorized pass per constraint: gt/ge/lt/le bounds, finiteness, and
+    string patterns (checked once per distinct value). Raises BulkValidationError
+    listing the first offending rows of each violated constraint.
+    """
+    errors: List[dict] = []
+
+    def report(name: str, bad: np.ndarray, msg: str, kind: str) -> None:
+        rows = np.flatnonzero(bad)
+        if rows.size:
+            for row in rows[:max_rows_reported]:
+                errors.append({"loc": ["columns", name, int(row)], "msg": msg, "type": kind})
+            if rows.size > max_rows_reported:
+                more = f"{rows.size - max_rows_reported} more rows: {msg}"
+                errors.append({"loc": ["columns", name], "msg": more, "type": kind})
+
+    for name, values in columns.items():
+        field = SimulationRequest.model_fields[name]
+        if name in STRING_FIELDS:
+            pattern = next((m.pattern for m in field.metadata if getattr(m, "pattern", None)), None)
+            if pattern is not None:
+                allowed = {v: isinstance(v, str) and re.fullmatch(pattern, v) is not None for v in set(values)}
+                bad = np.array([not allowed[v] for v in values])
+                report(name, bad, f"String should match pattern '{pattern}'", "string_pattern_mismatch")
+            continue
+        finite = np.isfinite(values)
+        report(name, ~finite, "Input should be a finite number", "finite_number")
+        for bound in field.metadata:
+            for kind, attr, test, text, error_type in _BOUNDS:
+                if isinstance(bound, kind):
+                    limit = getattr(bound, attr)
+                    report(name, finite & ~test(values, limit), f"Input should be {text} {limit}", error_type)
+    if errors:
+        raise BulkValidationError(errors)
@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from fermentation_sim.api.main import app
+from fermentation_sim.data.preset_store import get_preset_store
+
+client = TestClient(app)
+
+
+def test_preset_endpoints_return_etag_and_honor_if_none_match():
+    for url in (
+        "/presets/microbes",
+        "/presets/microbes/E_coli_K12/substrates",
+        "/presets/microbes/E_coli_K12/substrates/glucose",
+        "/meta/variables",
+    ):
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and "max-age" in first.headers["cache-control"]
+
+        second = client.get(url, headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+
+def test_preset_etag_carries_store_version():
+    resp = client.get("/presets/microbes")
+    assert get_preset_store().version in resp.headers["etag"]
+    assert resp.json()["microbes"][0]["id"] == "E_coli_K12"
+
+
+def test_unknown_preset_is_not_cached():
+    resp = client.get("/presets/microbes/nope/substrates/glucose")
+    assert resp.status_code == 404
+    assert "etag" not in resp.headers
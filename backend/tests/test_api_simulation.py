@@ -25,3 +25,45 @@ def test_simulation_run_default():
     assert "time" in data
     assert "states" in data
     assert len(data["time"]) == data["meta"]["n_points"]
+
+
+def test_simulation_run_reports_timings_and_metrics():
+    resp = client.post("/simulation/run?mode=batch&timings=true", json={"n_points": 11, "t_end": 1.0})
+    assert resp.status_code == 200
+    meta = resp.json()["meta"]
+    assert meta["backend"] in ("c", "python")
+    assert meta["rhs_evals"] > 0
+    for phase in ("preset_merge", "build_structs", "integrate", "tolist", "clean"):
+        assert phase in meta["timings"]
+    assert "serialize" not in meta["timings"]
+    assert resp.headers["Server-Timing"].startswith("serialize;dur=")
+
+    metrics = client.get("/meta/metrics")
+    assert metrics.status_code == 200
+    assert 'fermentation_phase_seconds_bucket{phase="integrate",le="+Inf"}' in metrics.text
+    assert "fermentation_rhs_evaluations_total" in metrics.text
+
+
+def test_simulation_run_summary_only_skips_trajectory():
+    resp = client.post("/simulation/run?summary_only=true", json={"n_points": 101, "t_end": 10.0})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert "time" not in data and "states" not in data
+    assert data["meta"]["n_points"] == 101
+    assert {"t_depletion", "DO_min", "T_peak", "P_final", "productivity"} <= set(data["summary"])
+
+    resp = client.post("/simulation/run?summary_only=true&store=true", json={})
+    assert resp.status_code == 422
+
+
+def test_simulation_run_at_irregular_sample_times():
+    t_eval = [0.0, 0.25, 1.1, 3.7, 4.0]
+    resp = client.post("/simulation/run", json={"t_end": 4.0, "t_eval": t_eval})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["time"] == t_eval
+    assert len(data["states"]["X"]) == len(t_eval)
+    assert data["meta"]["n_points"] == len(t_eval)
+
+    resp = client.post("/simulation/run", json={"t_end": 4.0, "t_eval": [0.0, 5.0]})
+    assert resp.status_code == 422
@@ -1,6 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+import pytest
 
+from fermentation_sim.config import settings
+from fermentation_sim.models.base import SolverError
 from fermentation_sim.models.batch_model import BatchFermentationModel
+from fermentation_sim.models.c_binding import load_c_library
+from fermentation_sim.models.circuit_breaker import CircuitBreaker
+from fermentation_sim.models.compiled import CompiledParams
+from fermentation_sim.models.summary import SummaryTracker
+from fermentation_sim.models.vectorized import stack_params
+from fermentation_sim.services.simulation_service import SimulationService
 from fermentation_sim.utils.validation import SimulationRequest
 
 
@@ -16,3 +27,244 @@ def test_batch_model_runs_and_has_reasonable_shapes():
     assert np.all(result.state[:, 0] >= 0)
     # volume should stay non-decreasing with non-negative feed
     assert np.all(np.diff(result.state[:, 5]) >= -1e-9)
+
+
+class _FailingCLib:
+    """Stand-in C library that reports a NaN at a fixed row."""
+
+    def __init__(self, status: int = 0, nan_row: int | None = 3) -> None:
+        self.status = status
+        self.nan_row = nan_row
+        self.calls = 0
+
+    def supports(self, symbol):
+        return False
+
+    def integrate(self, t, y0, kinetic, ops):
+        self.calls += 1
+        y = np.tile(y0, (t.size, 1))
+        if self.nan_row is not None:
+            y[self.nan_row:, 0] = np.nan
+        return self.status, y
+
+
+def test_c_failure_falls_back_and_reports_reason():
+    model = BatchFermentationModel(c_lib=_FailingCLib(), failure_policy="fallback")
+    result = model.simulate(SimulationRequest(t_end=1.0, n_points=11))
+
+    assert result.backend == "python"
+    assert result.fallback_reason == "non_finite"
+    assert np.isfinite(result.state).all()
+
+
+def test_c_failure_fail_fast_raises():
+    model = BatchFermentationModel(c_lib=_FailingCLib(status=2), failure_policy="fail_fast")
+    with pytest.raises(SolverError) as excinfo:
+        model.simulate(SimulationRequest(t_end=1.0, n_points=11))
+    assert excinfo.value.reason == "nonzero_status"
+
+
+def test_circuit_breaker_stops_calling_failing_c_path():
+    lib = _FailingCLib()
+    model = BatchFermentationModel(
+        c_lib=lib, failure_policy="fallback", breaker=CircuitBreaker(threshold=2, reset_after=3600)
+    )
+    req = SimulationRequest(t_end=0.5, n_points=6)
+    for _ in range(4):
+        result = model.simulate(req)
+
+    assert lib.calls == 2
+    assert result.fallback_reason == "circuit_open"
+
+
+def test_missing_c_library_degrades_to_python(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "c_library_path", str(tmp_path / "libmissing.so"))
+    model = BatchFermentationModel(failure_policy="fallback")  # must not raise
+    result = model.simulate(SimulationRequest(t_end=0.5, n_points=6))
+
+    assert load_c_library() is None
+    assert result.backend == "python"
+    assert result.fallback_reason == "missing_lib"
+
+
+def test_summary_matches_between_c_and_python_integrators():
+    req = SimulationRequest(n_points=481)
+    c_model = BatchFermentationModel()
+    if c_model.c_lib is None:
+        pytest.skip("C library not built")
+    c_result = c_model.simulate(req, summary=True)
+    py_result = BatchFermentationModel(c_lib=_FailingCLib(status=1)).simulate(req, summary=True)
+
+    c_sum, py_sum = c_result.summary, py_result.summary
+    # Depletion is located inside the step, not snapped to the output grid
+    t, S = c_result.time, c_result.state[:, 1]
+    i = int(np.argmax(S <= req.depletion_threshold))
+    assert t[i - 1] < c_sum["t_depletion"] <= t[i]
+    assert c_sum["t_depletion"] == pytest.approx(py_sum["t_depletion"], abs=0.05)
+    assert c_sum["P_final"] == pytest.approx(py_sum["P_final"], rel=1e-2)
+    assert c_sum["T_peak"] == pytest.approx(c_result.state[:, 4].max(), rel=1e-6)
+    for name in ("DO_min", "T_peak"):
+        assert c_sum[name] == pytest.approx(py_sum[name], rel=1e-3)
+        assert c_sum[f"t_{name}"] == pytest.approx(py_sum[f"t_{name}"], abs=0.05)
+
+
+def test_summary_tracker_finds_extrema_without_a_slope_sign_change():
+    # DO falls at both ends of the step yet dips below its end values in between
+    y = np.array([1.0, 10.0, 0.0, 0.5, 30.0, 1.0])
+    f = np.array([0.0, 0.0, 0.0, -1.0, 1.0, 0.0])
+    tracker = SummaryTracker(0.0, y, s_threshold=0.1)
+    tracker.step(0.0, y, f, 1.0, y.copy())
+    summary = tracker.finish(lambda t, state: f)
+    assert summary["DO_min"] < 0.45 and 0.0 < summary["t_DO_min"] < 0.5
+    assert summary["T_peak"] > 30.05 and 0.0 < summary["t_T_peak"] < 0.5
+
+
+def test_summary_without_materializing_keeps_final_state_only():
+    req = SimulationRequest(t_end=4.0, n_points=41)
+    model = BatchFermentationModel()
+    full = model.simulate(req, summary=True)
+    lean = model.simulate(req, summary=True, materialize=False)
+
+    assert lean.state.shape == (1, 6)
+    assert lean.time.tolist() == [4.0]
+    np.testing.assert_allclose(lean.state[0], full.state[-1])
+    assert lean.summary == full.summary
+
+
+@pytest.mark.parametrize("c_lib", [None, _FailingCLib(status=1)], ids=["c", "python"])
+def test_threshold_stop_truncates_run(c_lib):
+    stop = {"thresholds": [{"variable": "T", "op": ">=", "value": 60.0}]}
+    result = BatchFermentationModel(c_lib=c_lib).simulate(SimulationRequest(stop=stop), summary=True)
+
+    assert result.stop_reason == "threshold:T>=60"
+    assert result.time[-1] < 24.0
+    assert result.state.shape == (result.time.size, 6)
+    assert result.state[-1, 4] >= 60.0 > result.state[-2, 4]
+    assert result.summary["t_final"] == pytest.approx(result.time[-1])
+
+
+def test_steady_state_stop_agrees_between_integrators():
+    req = SimulationRequest(
+        kd=0, maintenance=0, agit_power_coeff=0, delta_H=0, n_points=2401,
+        stop={"steady_state_tol": 1e-3, "steady_state_hold": 1.0},
+    )
+    c_result = BatchFermentationModel().simulate(req)
+    py_result = BatchFermentationModel(c_lib=_FailingCLib(status=1)).simulate(req)
+
+    assert c_result.stop_reason == py_result.stop_reason == "steady_state"
+    assert c_result.time[-1] == pytest.approx(py_result.time[-1], abs=0.05)
+
+
+def test_rhs_budget_caps_chunked_runs():
+    req = SimulationRequest(stop={"max_rhs_evals": 100})
+    result = SimulationService().simulate_chunked(req, chunk_points=20)
+
+    assert result.stop_reason == "max_rhs_evals"
+    assert result.rhs_evals <= 100 + 4
+    assert result.time.size < req.n_points
+
+
+@pytest.mark.parametrize("c_lib", [None, _FailingCLib(status=1)], ids=["c", "python"])
+def test_float32_output_matches_float64_run(c_lib):
+    model = BatchFermentationModel(c_lib=c_lib)
+    full = model.simulate(SimulationRequest(t_end=6.0, n_points=61))
+    compact = model.simulate(SimulationRequest(t_end=6.0, n_points=61, output_precision="float32"))
+
+    assert compact.state.dtype == np.float32
+    assert compact.time.dtype == np.float64
+    # Integration stays in float64: only the output rows are rounded
+    np.testing.assert_allclose(compact.state, full.state, rtol=1e-6, atol=1e-9)
+
+
+def test_workspace_integration_matches_one_shot_entry_point():
+    lib = load_c_library()
+    if lib is None or not lib.supports("fermentation_workspace_integrate"):
+        pytest.skip("C library without the workspace API")
+    model = BatchFermentationModel()
+    requests = [
+        SimulationRequest(t_end=5.0, n_points=51),
+        SimulationRequest(
+            t_end=5.0, n_points=51, feed_mode="ramp", feed_rate=0.01, feed_rate_end=0.05, feed_tau=2.0
+        ),
+    ]
+    t = np.linspace(0.0, 5.0, 51)
+
+    for req in requests:
+        kinetic, ops = model._build_structs(req)
+        y0 = np.array([req.X0, req.S0, req.P0, req.DO0, req.T0, req.volume])
+        _, expected = lib.integrate(t, y0, kinetic, ops)
+        status, y = lib.integrate_ex(t, y0, kinetic, ops)
+        assert status == 0
+        np.testing.assert_array_equal(y, expected)  # precomputed terms change no bits
+
+    # The loaded scenario is reused when kinetic/ops are omitted, per thread
+    lib.load_params(kinetic, ops)
+    _, reused = lib.integrate_ex(t, y0, None, None)
+    np.testing.assert_array_equal(reused, expected)
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: lib.integrate_ex(t, y0, kinetic, ops)[1], range(8)))
+    for y in results:
+        np.testing.assert_array_equal(y, expected)
+
+
+def test_compiled_params_are_immutable_and_shared_with_batched_engine():
+    req = SimulationRequest(feed_mode="ramp", feed_rate=0.01, feed_rate_end=0.05, feed_tau=2.0)
+    p = CompiledParams.from_request(req)
+
+    assert p.kla_effective == pytest.approx(req.Kla * req.aeration_rate**0.5 * (req.agitation_speed / 300.0) ** 0.7)
+    assert p.ramp_slope == pytest.approx(0.02)
+    with pytest.raises(AttributeError):
+        p.mu_max = 1.0
+    assert not hasattr(p, "__dict__")
+
+    from_requests, from_compiled = stack_params([req]), stack_params([p])
+    for name in ("kla_base", "UA", "ramp_slope", "mu_max", "feed_mode"):
+        np.testing.assert_array_equal(from_compiled[name], from_requests[name])
+
+
+@pytest.mark.parametrize("c_lib", [None, _FailingCLib(status=1)], ids=["c", "python"])
+def test_dense_output_samples_irregular_times_between_solver_steps(c_lib):
+    model = BatchFermentationModel(c_lib=c_lib)
+    t_eval = [0.0, 0.37, 1.2, 2.05, 3.333, 5.9, 6.0]
+    dense = model.simulate(SimulationRequest(t_end=6.0, t_eval=t_eval, solver_dt=0.01))
+    reference = model.simulate(SimulationRequest(t_end=6.0, n_points=601))
+
+    np.testing.assert_array_equal(dense.time, t_eval)
+    expected = np.column_stack([np.interp(t_eval, reference.time, reference.state[:, k]) for k in range(6)])
+    # Step points agree exactly; between them the cubic beats linear interpolation of the reference
+    np.testing.assert_allclose(dense.state[[0, -1]], reference.state[[0, -1]], rtol=1e-12)
+    np.testing.assert_allclose(dense.state, expected, rtol=1e-3, atol=1e-6)
+
+    # Output resolution no longer drives solver cost
+    many = model.simulate(SimulationRequest(t_end=6.0, n_points=50_000, solver_dt=0.01))
+    assert many.state.shape == (50_000, 6)
+    assert many.rhs_evals < dense.rhs_evals + 10
+    np.testing.assert_allclose(many.dense(t_eval), dense.state)
+
+
+def test_dense_solver_step_is_chosen_to_tolerance():
+    model = BatchFermentationModel()
+    if model.c_lib is None:
+        pytest.skip("C library not built")
+    t_eval = [0.0, 3.0, 6.0, 10.0]
+    # The default kLa keeps RK4 at the finest step: no coarser trial runs are spent
+    stiff = model.simulate(SimulationRequest(t_end=10.0, t_eval=t_eval))
+    fixed = model.simulate(SimulationRequest(t_end=10.0, t_eval=t_eval, solver_dt=settings.dense_solver_dt))
+    assert stiff.dense.t.size == fixed.dense.t.size and stiff.rhs_evals == fixed.rhs_evals
+
+    slow = dict(t_end=10.0, t_eval=t_eval, Kla=10.0)
+    reference = model.simulate(SimulationRequest(**slow, solver_dt=0.0005)).state
+    loose = model.simulate(SimulationRequest(**slow, solver_rtol=1e-2))
+    tight = model.simulate(SimulationRequest(**slow, solver_rtol=1e-4))
+    assert loose.dense.t.size < tight.dense.t.size and loose.rhs_evals < fixed.rhs_evals
+    scale = np.abs(reference).max(axis=0)
+    assert (np.abs(loose.state - reference) <= 1e-2 * scale).all()
+    assert (np.abs(tight.state - reference) <= 1e-3 * scale).all()
+
+
+def test_t_eval_is_validated():
+    with pytest.raises(ValueError):
+        SimulationRequest(t_end=6.0, t_eval=[1.0, 0.5])
+    with pytest.raises(ValueError):
+        SimulationRequest(t_end=6.0, t_eval=[0.0, 7.0])
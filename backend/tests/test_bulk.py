@@ -0,0 +1,145 @@
+import io
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from fermentation_sim.api.main import app
+from fermentation_sim.data.preset_service import merge_columns_with_presets, merge_request_with_preset
+from fermentation_sim.data.preset_store import get_preset_store
+from fermentation_sim.models.base import SolverError
+from fermentation_sim.models.batch_model import BatchFermentationModel
+from fermentation_sim.models.vectorized import initial_states, integrate_batched, stack_params
+from fermentation_sim.utils.validation import (
+    SCENARIO_FIELDS,
+    BulkSimulationRequest,
+    BulkValidationError,
+    SimulationRequest,
+    column_arrays,
+    validate_columns,
+)
+
+client = TestClient(app)
+
+
+def _columns(requests: list[SimulationRequest]) -> dict:
+    return {name: [getattr(r, name) for r in requests] for name in SCENARIO_FIELDS}
+
+
+def _merged(columns: dict) -> dict:
+    request = BulkSimulationRequest(columns=columns)
+    return merge_columns_with_presets(column_arrays(request), request.n_scenarios)
+
+
+def test_request_shape_checks():
+    assert BulkSimulationRequest(columns={"S0": [1.0, 2.0], "Ks": 0.2}).n_scenarios == 2
+    for columns in ({"S0": [1.0], "Ks": [0.1, 0.2]}, {"t_end": [1.0]}, {"S0": []}):
+        with pytest.raises(ValueError):
+            BulkSimulationRequest(columns=columns)
+    malformed = (
+        {"S0": ["a lot"]},
+        {"mu_max": [[0.3, 0.1], [0.4, 0.2]]},
+        {"microbe_id": [[1], [2]]},
+        {"feed_mode": ["constant", {"a": 1}]},
+    )
+    for columns in malformed:
+        with pytest.raises(BulkValidationError):
+            column_arrays(BulkSimulationRequest(columns=columns))
+
+
+def test_vectorized_validation_reports_failing_rows():
+    columns = _merged({"S0": [10.0, -1.0, 0.0, 5.0], "agit_heat_eff": 1.5, "feed_mode": "ramp"})
+    columns["feed_mode"][3] = "pulsed"
+    with pytest.raises(BulkValidationError) as info:
+        validate_columns(columns)
+    errors = {(e["loc"][1], e["loc"][2]): e["type"] for e in info.value.errors if len(e["loc"]) == 3}
+    assert errors[("S0", 1)] == errors[("S0", 2)] == "greater_than"
+    assert ("S0", 0) not in errors
+    assert errors[("feed_mode", 3)] == "string_pattern_mismatch"
+    assert sum(key[0] == "agit_heat_eff" for key in errors) == 4
+
+    with pytest.raises(BulkValidationError) as info:
+        validate_columns(_merged({"Ks": [-1.0] * 8}), max_rows_reported=2)
+    assert [e["loc"] for e in info.value.errors] == [["columns", "Ks", 0], ["columns", "Ks", 1], ["columns", "Ks"]]
+
+
+def test_columnwise_preset_merge_matches_per_request_merge():
+    microbe_id, substrates = next(iter(get_preset_store().index().items()))
+    substrate_id = next(iter(substrates))
+    explicit = [
+        SimulationRequest(microbe_id=microbe_id, substrate_id=substrate_id),
+        SimulationRequest(microbe_id=microbe_id, substrate_id=substrate_id, S0=33.0, feed_mode="ramp"),
+        SimulationRequest(S0=12.0),
+    ]
+    columns = _merged({
+        "microbe_id": [microbe_id, microbe_id, None],
+        "substrate_id": [substrate_id, substrate_id, None],
+        "S0": [None, 33.0, 12.0],
+        "feed_mode": [None, "ramp", None],
+    })
+    for row, request in enumerate(explicit):
+        expected = merge_request_with_preset(request)
+        for name in SCENARIO_FIELDS:
+            assert columns[name][row] == getattr(expected, name), (row, name)
+
+
+def test_c_batch_matches_single_runs():
+    requests = [
+        SimulationRequest(t_end=6.0, n_points=61, S0=15.0 + k, feed_mode=mode, feed_rate=0.01, feed_rate_end=0.04)
+        for k, mode in enumerate(("constant", "ramp", "exponential", "do_control"))
+    ]
+    columns = _merged(_columns(requests))
+    model = BatchFermentationModel()
+    if model.c_lib is None or not model.c_lib.supports("integrate_fermentation_rk4_batch"):
+        pytest.skip("C library without the batch entry point")
+    t = np.linspace(0.0, 6.0, 61)
+    result = model.integrate_columns(columns, t, materialize=True)
+    assert list(result.backend) == ["c"] * 4
+    for k, request in enumerate(requests):
+        single = model.simulate(request)
+        np.testing.assert_array_equal(result.state[k], single.state)
+        np.testing.assert_array_equal(result.final[k], single.state[-1])
+
+    summary = model.integrate_columns(columns, t, dtype="float32")
+    assert summary.state is None and summary.final.dtype == np.float32
+    np.testing.assert_array_equal(summary.final, result.final.astype("float32"))
+
+
+def test_fallback_rows_use_the_vectorized_integrator():
+    requests = [SimulationRequest(t_end=4.0, n_points=41, S0=10.0 + k, feed_rate=0.01) for k in range(3)]
+    columns = _merged(_columns(requests))
+    t = np.linspace(0.0, 4.0, 41)
+    model = BatchFermentationModel(use_c=False)
+    result = model.integrate_columns(columns, t, materialize=True)
+    expected = integrate_batched(t, initial_states(requests), stack_params(requests), model._max_dt)
+    assert list(result.backend) == ["numpy"] * 3
+    np.testing.assert_array_equal(result.state, expected.transpose(1, 0, 2))
+    steps = np.maximum(1, np.ceil(np.diff(t) / model._max_dt)).sum()
+    assert (result.rhs_evals == 4 * steps).all()
+
+    failing = BatchFermentationModel(failure_policy="fail_fast", use_c=False)
+    with pytest.raises(SolverError):
+        failing.integrate_columns(columns, t)
+
+
+def test_bulk_endpoint():
+    body = {"columns": {"S0": [10.0, 20.0, None], "feed_mode": "constant"}, "t_end": 4.0, "n_points": 41}
+    res = client.post("/simulation/bulk?trajectories=true", json=body)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["meta"]["n_scenarios"] == 3 and sum(data["meta"]["backends"].values()) == 3
+    assert data["states"]["S"][0][0] == 10.0 and data["states"]["S"][2][0] == 20.0  # default S0
+    assert [row[-1] for row in data["states"]["X"]] == data["final"]["X"]
+
+    res = client.post("/simulation/bulk?format=npz", json=body)
+    with np.load(io.BytesIO(res.content)) as npz:
+        assert npz["final"].shape == (3, 6) and "state" not in npz
+
+    body["columns"]["Ks"] = [0.1, 0.0, 0.1]
+    res = client.post("/simulation/bulk", json=body)
+    assert res.status_code == 422
+    assert res.json()["detail"][0]["loc"] == ["columns", "Ks", 1]
+
+    for columns in ({"mu_max": [[0.3, 0.1], [0.4, 0.2]]}, {"feed_mode": ["constant", {"a": 1}]}):
+        res = client.post("/simulation/bulk", json={"columns": columns})
+        assert res.status_code == 422 and res.json()["detail"][0]["loc"][1] in columns
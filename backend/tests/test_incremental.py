@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from fermentation_sim.models.batch_model import BatchFermentationModel
+from fermentation_sim.services.incremental import IncrementalSimulator
+from fermentation_sim.utils.validation import SimulationRequest
+
+
+@pytest.mark.parametrize("python_only", [False, True], ids=["c", "python"])
+def test_feed_tweak_recomputes_only_the_suffix(python_only):
+    model = BatchFermentationModel(failure_policy="fallback", use_c=not python_only)
+    sim = IncrementalSimulator(model)
+    base = dict(t_end=12.0, n_points=121, feed_mode="constant", feed_rate=0.02, feed_start=8.0)
+
+    first = sim.simulate(SimulationRequest(**base))
+    assert first.resumed_from is None
+
+    tweaked = SimulationRequest(**dict(base, feed_rate=0.05, feed_start=9.0))
+    resumed = sim.simulate(tweaked)
+    full = model.simulate(tweaked)
+
+    assert resumed.resumed_from == pytest.approx(7.9)  # last row before min(feed_start) = 8
+    np.testing.assert_allclose(resumed.state, full.state, rtol=1e-12, atol=1e-15)
+    assert resumed.rhs_evals < full.rhs_evals / 2
+
+    # Identical request: served entirely from the checkpoint
+    again = sim.simulate(tweaked)
+    assert again.rhs_evals == 0
+    np.testing.assert_array_equal(again.state, resumed.state)
+
+
+def test_early_acting_change_runs_in_full():
+    sim = IncrementalSimulator(BatchFermentationModel(failure_policy="fallback", use_c=False))
+    sim.simulate(SimulationRequest(t_end=4.0, n_points=41, feed_start=2.0))
+    changed = sim.simulate(SimulationRequest(t_end=4.0, n_points=41, feed_start=2.0, mu_max=0.5))
+    assert changed.resumed_from is None
+    assert changed.rhs_evals > 0
+    # Not eligible: summaries cannot be resumed from a row checkpoint
+    assert not sim.eligible(SimulationRequest(), summary=True, materialize=True)
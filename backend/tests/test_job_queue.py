@@ -0,0 +1,82 @@
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from fermentation_sim.api.main import app
+from fermentation_sim.config import settings
+from fermentation_sim.services import job_queue
+from fermentation_sim.services.job_queue import JobStore, JobWorkerPool
+from fermentation_sim.services.simulation_service import SimulationService
+from fermentation_sim.utils.validation import SimulationRequest
+
+
+def _wait_for(store: JobStore, job_id: str, timeout: float = 60.0) -> dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = store.get(job_id)
+        if job["status"] in job_queue.TERMINAL_STATES:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish: {store.get(job_id)}")
+
+
+def test_claim_order_respects_priority_and_reserved_floor(tmp_path):
+    store = JobStore(tmp_path)
+    low = store.submit(SimulationRequest(), priority=0)
+    high = store.submit(SimulationRequest(), priority=7)
+
+    assert store.claim_next(worker_pid=1, min_priority=5)["id"] == high
+    assert store.claim_next(worker_pid=1, min_priority=5) is None
+    assert store.claim_next(worker_pid=2)["id"] == low
+
+
+def test_cancel_queued_job(tmp_path):
+    store = JobStore(tmp_path)
+    job_id = store.submit(SimulationRequest())
+    assert store.cancel(job_id)["status"] == "cancelled"
+    assert store.claim_next(worker_pid=1) is None
+
+
+def test_worker_pool_runs_job_and_stores_result(tmp_path):
+    store = JobStore(tmp_path)
+    pool = JobWorkerPool(store, workers=1, interactive_workers=0, chunk_points=50).start()
+    try:
+        req = SimulationRequest(t_end=5.0, n_points=201)
+        job = _wait_for(store, store.submit(req, mode="fed_batch"))
+    finally:
+        pool.stop()
+
+    assert job["status"] == "succeeded"
+    assert job["progress"] == pytest.approx(1.0)
+    arrays = store.load_result(job["id"])
+    expected = SimulationService().simulate(req, "fed_batch")
+    np.testing.assert_allclose(arrays["state"], expected.state)
+
+
+def test_job_api_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "job_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "job_workers", 1)
+    monkeypatch.setattr(settings, "job_interactive_workers", 0)
+    monkeypatch.setattr(job_queue, "_store", None)
+    client = TestClient(app)
+    try:
+        resp = client.post("/simulation/jobs?priority=3", json={"t_end": 2.0, "n_points": 21})
+        assert resp.status_code == 202
+        job_id = resp.json()["id"]
+        job = _wait_for(job_queue.get_job_store(), job_id)
+        assert job["status"] == "succeeded"
+
+        data = client.get(f"/simulation/jobs/{job_id}/result").json()
+        assert data["meta"]["job_id"] == job_id
+        assert len(data["time"]) == 21 and len(data["states"]["X"]) == 21
+
+        npz = client.get(f"/simulation/jobs/{job_id}/result?format=npz")
+        assert npz.headers["content-type"] == "application/x-npz"
+
+        events = client.get(f"/simulation/jobs/{job_id}/events")
+        assert '"status": "succeeded"' in events.text
+    finally:
+        job_queue.shutdown_job_workers()
+        monkeypatch.setattr(job_queue, "_store", None)
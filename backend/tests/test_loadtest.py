@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from fermentation_sim.loadtest import (
+    SCENARIOS,
+    Sample,
+    build_request,
+    format_report,
+    parse_mix,
+    preset_pairs,
+    run_load_test,
+    summarize,
+)
+from fermentation_sim.utils.validation import SimulationRequest
+
+
+def test_parse_mix():
+    assert parse_mix("preset=4, short=1,long") == {"preset": 4.0, "short": 1.0, "long": 1.0}
+    for bad in ("warp=1", "short=-1", "preset=0", ""):
+        with pytest.raises(ValueError):
+            parse_mix(bad)
+
+
+def test_generated_requests_are_valid():
+    rng, pairs = random.Random(1), preset_pairs()
+    assert pairs
+    for scenario in SCENARIOS:
+        method, path, body = build_request(scenario, rng, pairs)
+        if scenario == "preset":
+            assert method == "GET" and body is None
+        else:
+            request = SimulationRequest(**body)
+            assert (request.microbe_id, request.substrate_id) in pairs
+            assert path.endswith("fed_batch") == (scenario == "fed_batch")
+
+
+def test_summary_and_comparison():
+    samples = [Sample("short", 0.0, 0.010 * k, 200) for k in range(1, 101)]
+    samples.append(Sample("preset", 0.5, 0.001, 500))
+    report = {
+        "config": {"concurrency": 4},
+        "environment": {"commit": "abc"},
+        "elapsed_s": 2.0,
+        "latency": summarize(samples, 2.0),
+        "server": {"rss_peak_mb": 100.0, "cpu_percent_mean": 50.0},
+    }
+    total = report["latency"]["total"]
+    assert total["count"] == 101 and total["errors"] == 1 and total["rps"] == pytest.approx(50.5)
+    short = report["latency"]["scenarios"]["short"]
+    assert short["p50_ms"] == pytest.approx(505.0) and short["max_ms"] == pytest.approx(1000.0)
+    assert sum(short["histogram_ms"].values()) == 100
+
+    faster = {**report, "latency": summarize([Sample("short", 0.0, 0.005, 200)] * 100, 1.0)}
+    text = format_report(faster, baseline=report)
+    assert "short" in text and "(-" in text and "(+" in text
+
+
+def test_end_to_end_against_local_server():
+    report = run_load_test(parse_mix("preset=1,short=1"), concurrency=2, duration=1.0, warmup=0.0, max_requests=12)
+    total = report["latency"]["total"]
+    assert 0 < total["count"] <= 12 and total["errors"] == 0
+    assert set(report["latency"]["scenarios"]) <= {"preset", "short"}
+    assert report["server"] == {} or report["server"]["rss_peak_mb"] > 0
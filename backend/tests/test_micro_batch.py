@@ -0,0 +1,102 @@
+import asyncio
+
+import httpx
+import numpy as np
+
+from fermentation_sim.api.dependencies import get_simulation_service
+from fermentation_sim.api.main import app
+from fermentation_sim.models.base import SolverError
+from fermentation_sim.models.batch_model import BatchFermentationModel
+from fermentation_sim.services.micro_batch import MicroBatcher
+from fermentation_sim.utils.metrics import MICRO_BATCH_SIZE
+from fermentation_sim.utils.validation import SimulationRequest
+
+
+def test_requests_are_grouped_by_grid_and_scattered_back():
+    groups = []
+
+    def dispatch(requests):
+        groups.append(len(requests))
+        return [r.S0 for r in requests]
+
+    async def main():
+        batcher = MicroBatcher(dispatch, window=0.01, max_batch=4)
+        fine = [batcher.submit(SimulationRequest(S0=10 + k, n_points=11)) for k in range(6)]
+        coarse = [batcher.submit(SimulationRequest(S0=50 + k, n_points=5)) for k in range(2)]
+        return await asyncio.gather(*fine, *coarse)
+
+    results = asyncio.run(main())
+    assert results == [10, 11, 12, 13, 14, 15, 50, 51]
+    assert sorted(groups) == [2, 2, 4]  # max_batch flushes early, the rest after the window
+
+
+def test_per_request_errors_reach_only_their_waiter():
+    def dispatch(requests):
+        return [SolverError("nonzero_status") if r.S0 == 13 else r.S0 for r in requests]
+
+    async def main():
+        batcher = MicroBatcher(dispatch, window=0.005)
+        runs = [batcher.submit(SimulationRequest(S0=s)) for s in (12, 13, 14)]
+        return await asyncio.gather(*runs, return_exceptions=True)
+
+    ok, failed, also_ok = asyncio.run(main())
+    assert (ok, also_ok) == (12, 14)
+    assert isinstance(failed, SolverError)
+
+
+def test_integrate_many_matches_single_runs(monkeypatch):
+    requests = [
+        SimulationRequest(t_end=6.0, n_points=61, S0=15.0),
+        SimulationRequest(t_end=6.0, n_points=61, feed_mode="ramp", feed_rate=0.01, feed_rate_end=0.04),
+        SimulationRequest(t_end=6.0, n_points=61, output_precision="float32"),
+    ]
+    t = np.linspace(0.0, 6.0, 61)
+
+    c_model = BatchFermentationModel()
+    c_lib = c_model.c_lib
+    batch_calls = []
+    if c_lib is not None and c_lib.supports("integrate_fermentation_rk4_batch"):
+        integrate_batch = c_lib.integrate_batch
+        monkeypatch.setattr(c_lib, "integrate_batch", lambda *a: batch_calls.append(a) or integrate_batch(*a))
+    for request, result in zip(requests, c_model.integrate_many(requests, t)):
+        single = c_model.simulate(request)
+        assert result.backend == single.backend and result.state.dtype == single.state.dtype
+        np.testing.assert_array_equal(result.state, single.state)
+    if batch_calls:
+        assert len(batch_calls) == 1  # the whole group in one C call
+        # Builds without the batch entry point integrate request by request
+        monkeypatch.setattr(c_lib, "supports", lambda name: name != "integrate_fermentation_rk4_batch")
+        for request, result in zip(requests, c_model.integrate_many(requests, t)):
+            np.testing.assert_array_equal(result.state, c_model.simulate(request).state)
+        assert len(batch_calls) == 1
+
+    # Fallback rows run the scalar integrator, as the same request would alone
+    py_model = BatchFermentationModel(failure_policy="fallback", use_c=False)
+    for request, result in zip(requests, py_model.integrate_many(requests, t)):
+        single = py_model.simulate(request)
+        assert result.backend == single.backend == "python" and result.fallback_reason == "missing_lib"
+        assert result.rhs_evals == single.rhs_evals and result.state.dtype == single.state.dtype
+        np.testing.assert_array_equal(result.state, single.state)
+
+    failures = BatchFermentationModel(failure_policy="fail_fast", use_c=False).integrate_many(requests[:2], t)
+    assert all(isinstance(r, SolverError) for r in failures)
+
+
+def test_concurrent_api_runs_share_a_dispatch(monkeypatch):
+    monkeypatch.setattr(get_simulation_service()._micro_batcher, "window", 0.05)
+    dispatches = MICRO_BATCH_SIZE.count()
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            bodies = [{"n_points": 31, "t_end": 3.0, "S0": 10.0 + k} for k in range(8)]
+            return await asyncio.gather(
+                *(client.post("/simulation/run?mode=fed_batch", json=b) for b in bodies)
+            )
+
+    responses = asyncio.run(main())
+    assert all(r.status_code == 200 for r in responses)
+    s0 = [r.json()["states"]["S"][0] for r in responses]
+    assert s0 == [10.0 + k for k in range(8)]
+    assert all(r.json()["meta"]["mode"] == "fed_batch" for r in responses)
+    assert MICRO_BATCH_SIZE.count() - dispatches < len(responses)
@@ -0,0 +1,79 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from fermentation_sim.api.main import app
+from fermentation_sim.services.optimizer import FeedStrategyOptimizer
+from fermentation_sim.utils.lru import LRUCache
+from fermentation_sim.utils.validation import OptimizationRequest
+
+
+def _request(**overrides) -> OptimizationRequest:
+    data = {
+        "base": {"t_end": 4.0, "n_points": 21, "S0": 2.0, "feed_substrate_conc": 200.0},
+        "feed_modes": ["constant", "ramp"],
+        "bounds": {"feed_rate": [0.0, 0.05], "feed_rate_end": [0.0, 0.1]},
+        "population": 6,
+        "generations": 3,
+        "seed": 1,
+    }
+    data.update(overrides)
+    return OptimizationRequest(**data)
+
+
+def test_optimizer_improves_on_no_feed_and_caches_points():
+    cache = LRUCache()
+    optimizer = FeedStrategyOptimizer(cache)
+    result = optimizer.optimize(_request())
+
+    assert set(result["modes"]) == {"constant", "ramp"}
+    best = result["best"]
+    assert 0.0 <= best["params"]["feed_rate"] <= 0.05
+    history = [h["objective"] for h in result["history"]]
+    assert history == sorted(history)  # elitist selection never loses the best
+
+    baseline = optimizer.optimize(_request(feed_modes=["constant"], bounds={"feed_rate": [0.0, 0.0]}))
+    assert best["objective"] >= baseline["best"]["objective"]
+
+    # Same seed and base: every point is served from the cache
+    again = optimizer.optimize(_request())
+    assert again["meta"]["evaluations"] == 0
+    assert again["meta"]["cache_hits"] == 6 * 2 * 4
+    assert again["best"]["objective"] == best["objective"]
+
+
+def test_searches_over_different_parameters_do_not_share_cache_entries():
+    optimizer = FeedStrategyOptimizer()
+    options = dict(feed_modes=["constant"], population=4, generations=1)
+    optimizer.optimize(_request(bounds={"feed_rate": [0.0, 0.5]}, **options))
+    other = optimizer.optimize(_request(bounds={"feed_start": [0.0, 0.5]}, **options))
+    fresh = FeedStrategyOptimizer().optimize(_request(bounds={"feed_start": [0.0, 0.5]}, **options))
+    assert other["meta"]["cache_hits"] == 0 and other["meta"]["evaluations"] == 4 * 2
+    assert other["best"]["objective"] == fresh["best"]["objective"]
+
+
+def test_volume_limit_is_respected():
+    result = FeedStrategyOptimizer().optimize(
+        _request(feed_modes=["constant"], bounds={"feed_rate": [0.0, 0.5]}, max_volume=6.0)
+    )
+    best = result["best"]
+    assert best["feasible"]
+    assert best["metrics"]["V_max"] <= 6.0 + 1e-9
+
+
+def test_bounds_are_validated():
+    with pytest.raises(ValidationError):
+        _request(bounds={})
+    with pytest.raises(ValidationError):
+        _request(bounds={"feed_rate": [0.2, 0.1]})
+
+
+def test_optimize_endpoint():
+    client = TestClient(app)
+    payload = _request(feed_modes=["constant"], generations=1).model_dump()
+    resp = client.post("/simulation/optimize", json=payload)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["best"]["feed_mode"] == "constant"
+    assert data["best"]["request"]["feed_rate"] == data["best"]["params"]["feed_rate"]
+    assert data["meta"]["rhs_evals"] > 0
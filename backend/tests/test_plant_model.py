@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from fermentation_sim.api.main import app
+from fermentation_sim.models.batch_model import BatchFermentationModel
+from fermentation_sim.models.plant_model import PlantModel
+from fermentation_sim.models.vectorized import integrate_batched, initial_states, stack_params
+from fermentation_sim.utils.validation import PlantRequest, SimulationRequest
+
+
+def test_batched_rhs_matches_scalar_fallback():
+    requests = [
+        SimulationRequest(t_end=6.0, n_points=61),
+        SimulationRequest(t_end=6.0, n_points=61, feed_mode="do_control", feed_rate=0.05, do_setpoint=0.003, do_Kp=5),
+    ]
+    t = np.linspace(0.0, 6.0, 61)
+    batched = integrate_batched(t, initial_states(requests), stack_params(requests))
+
+    for j, req in enumerate(requests):
+        scalar = BatchFermentationModel(failure_policy="fallback", use_c=False).simulate(req)
+        np.testing.assert_allclose(batched[:, j], scalar.state, rtol=1e-9, atol=1e-12)
+
+
+def test_seed_transfer_moves_broth_and_starts_target():
+    plant = PlantRequest(
+        vessels=[
+            {"name": "seed", "params": {"volume": 1.0}},
+            {"name": "main", "params": {"volume": 9.0, "X0": 0.01}},
+        ],
+        transfers=[{"source": "seed", "target": "main", "time": 4.0, "volume": 0.5}],
+        t_end=6.0,
+        n_points=61,
+    )
+    result = PlantModel().simulate(plant)
+    V = result.state[:, :, 5]
+    X_main = result.state[:, 1, 0]
+
+    before, after = 40, 41  # t = 4.0 and 4.1
+    assert V[before, 0] == pytest.approx(0.5) and V[before, 1] == pytest.approx(9.5)
+    assert np.all(X_main[:before] == X_main[0])  # idle until the transfer
+    assert X_main[before] > 10 * X_main[0]  # inoculated
+    assert X_main[after] > X_main[before]  # and growing
+
+
+def test_shared_air_supply_is_rationed():
+    vessels = [{"name": f"v{i}", "params": {"aeration_rate": 2.0}} for i in range(5)]
+    plant = PlantRequest(vessels=vessels, air={"capacity": 4.0}, coolant={}, t_end=1.0, n_points=11)
+    result = PlantModel().simulate(plant)
+
+    np.testing.assert_allclose(result.aeration.sum(axis=1), 4.0)
+    # Vessels share one loop: coolant warms above its supply temperature
+    assert np.all(result.coolant_temp > 20.0)
+
+
+def test_plant_endpoint_returns_vessels_and_utilities():
+    client = TestClient(app)
+    payload = {
+        "vessels": [{"name": "seed"}, {"name": "prod"}],
+        "transfers": [{"source": "seed", "target": "prod", "time": 1.0}],
+        "air": {"capacity": 1.5},
+        "t_end": 2.0,
+        "n_points": 21,
+    }
+    resp = client.post("/simulation/plant", json=payload)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["meta"]["n_vessels"] == 2
+    assert len(data["vessels"]["prod"]["X"]) == 21
+    assert set(data["utilities"]["aeration"]) == {"seed", "prod"}
+
+    bad = dict(payload, transfers=[{"source": "seed", "target": "nope", "time": 1.0}])
+    assert client.post("/simulation/plant", json=bad).status_code == 422
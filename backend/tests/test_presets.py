@@ -1,6 +1,7 @@
 import pytest
 
 from fermentation_sim.data.preset_service import merge_request_with_preset, get_preset
+from fermentation_sim.data.preset_store import PresetStore, export_sqlite, get_preset_store
 from fermentation_sim.utils.validation import SimulationRequest
 
 
@@ -28,3 +29,27 @@ def test_merge_respects_user_overrides():
     assert merged.mu_max == pytest.approx(1.23)
     # non-overridden still come from preset
     assert merged.X0 == get_preset("E_coli_K12", "glucose")["default_initials"]["X0"]
+
+
+def test_compiled_preset_is_immutable_and_validated():
+    compiled = get_preset_store().get("E_coli_K12", "glucose")
+    assert compiled is not None
+    assert compiled.defaults["mu_max"] == get_preset("E_coli_K12", "glucose")["kinetics"]["mu_max"]
+    with pytest.raises(TypeError):
+        compiled.defaults["mu_max"] = 1.0  # type: ignore[index]
+    assert get_preset_store().get("E_coli_K12", "does_not_exist") is None
+
+
+def test_sqlite_store_matches_json_store(tmp_path):
+    json_store = get_preset_store()
+    db_path = export_sqlite(json_store, tmp_path / "presets.sqlite")
+    sqlite_store = PresetStore(db_path)
+
+    assert sqlite_store.list_microbes() == json_store.list_microbes()
+    assert sqlite_store.list_substrates("Pichia_pastoris") == json_store.list_substrates("Pichia_pastoris")
+    assert sqlite_store.compile_all() == json_store.compile_all()
+
+    req = SimulationRequest(microbe_id="Pichia_pastoris", substrate_id="methanol", X0=2.0)
+    merged = sqlite_store.get("Pichia_pastoris", "methanol").apply(req)
+    assert merged.X0 == 2.0
+    assert merged.mu_max == json_store.get("Pichia_pastoris", "methanol").defaults["mu_max"]
@@ -0,0 +1,140 @@
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from fermentation_sim.api.main import app
+from fermentation_sim.config import settings
+from fermentation_sim.services import job_queue
+from fermentation_sim.services.resources import (
+    ResourceLimitExceeded,
+    estimate_bulk,
+    estimate_optimize,
+    estimate_plant,
+    estimate_run,
+    plan_execution,
+)
+from fermentation_sim.services.simulation_service import SimulationService
+from fermentation_sim.utils.validation import (
+    BulkSimulationRequest,
+    OptimizationRequest,
+    PlantRequest,
+    SimulationRequest,
+)
+
+client = TestClient(app)
+
+
+def test_estimates_scale_with_the_request():
+    small = estimate_run(SimulationRequest(n_points=1001))
+    large = estimate_run(SimulationRequest(n_points=50_000_000))
+    assert large.memory_bytes > 2**30 > small.memory_bytes
+    assert estimate_run(SimulationRequest(n_points=50_000_000), materialize=False).memory_bytes == 0
+    reduced = estimate_run(SimulationRequest(n_points=1001, output_precision="float32"))
+    assert reduced.chunked_memory_bytes < small.chunked_memory_bytes
+
+    python = estimate_run(SimulationRequest(n_points=241, t_end=24.0), c_available=False)
+    assert python.solver_steps == 240 * 10 and python.cpu_seconds > estimate_run(SimulationRequest()).cpu_seconds
+    dense = estimate_run(SimulationRequest(t_eval=[0.0, 1.0], t_end=1.0, solver_dt=0.001))
+    assert dense.output_points == 2 and dense.solver_steps == 1000
+    chosen = estimate_run(SimulationRequest(t_eval=[0.0, 1.0], t_end=1.0))
+    assert chosen.solver_steps == 2 * 100  # trial runs, then at worst the finest step
+
+    bulk = estimate_bulk(BulkSimulationRequest(columns={"S0": [1.0] * 10}, n_points=101), trajectories=True)
+    assert bulk.output_points == 1010 and bulk.solver_steps == 1000
+
+
+def test_plan_execution_follows_policy(monkeypatch):
+    monkeypatch.setattr(settings, "max_inline_memory_mb", 1.0)
+    small = estimate_run(SimulationRequest(n_points=1001))
+    large = estimate_run(SimulationRequest(n_points=100_001, t_end=1000.0))
+    assert plan_execution(small) == "inline"
+
+    assert plan_execution(large) == "job"
+    assert plan_execution(large, deferrable=("job",)) == "job"
+    monkeypatch.setattr(settings, "oversize_policy", "stream")
+    assert plan_execution(large) == "stream"
+    assert plan_execution(large, deferrable=("job",)) == "job"
+    monkeypatch.setattr(settings, "max_inline_cpu_seconds", large.cpu_seconds / 2)
+    assert plan_execution(large) == "job"  # CPU-bound runs are not kept on the API workers
+
+    monkeypatch.setattr(settings, "max_job_memory_mb", 1.0)
+    with pytest.raises(ResourceLimitExceeded, match="max_job_memory_mb"):
+        plan_execution(large)
+    monkeypatch.setattr(settings, "oversize_policy", "reject")
+    with pytest.raises(ResourceLimitExceeded, match="max_inline_memory_mb") as info:
+        plan_execution(large)
+    assert info.value.detail()["estimate"]["output_points"] == 100_001
+
+
+def test_oversized_run_is_streamed_in_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "max_inline_memory_mb", 1.0)
+    monkeypatch.setattr(settings, "oversize_policy", "stream")
+    monkeypatch.setattr(settings, "stream_chunk_points", 1000)
+    body = {"n_points": 4001, "t_end": 8.0}
+    res = client.post("/simulation/run", json=body)
+    assert res.status_code == 200 and res.headers["X-Execution"] == "stream"
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    assert lines[0]["meta"]["execution"] == "stream" and "end" in lines[-1]
+    chunks = lines[1:-1]
+    assert len(chunks) == 5 and lines[-1]["end"]["n_points"] == 4001
+
+    expected = SimulationService().simulate_chunked(SimulationRequest(**body), chunk_points=1000)
+    np.testing.assert_array_equal(np.concatenate([c["time"] for c in chunks]), expected.time)
+    np.testing.assert_array_equal(np.concatenate([c["states"]["X"] for c in chunks]), expected.state[:, 0])
+
+    res = client.post("/simulation/run?store=true", json=body)
+    assert res.status_code == 413 and "max_inline_memory_mb" in res.json()["detail"]["message"]
+
+
+def test_oversized_run_is_queued_as_a_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "max_inline_memory_mb", 1.0)
+    monkeypatch.setattr(settings, "job_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "job_autostart_workers", False)
+    monkeypatch.setattr(job_queue, "_store", None)
+    try:
+        res = client.post("/simulation/run?mode=fed_batch", json={"n_points": 4001})
+        assert res.status_code == 202 and res.headers["X-Execution"] == "job"
+        job = job_queue.get_job_store().get(res.json()["id"])
+        assert res.headers["Location"] == f"/simulation/jobs/{job['id']}"
+        assert job["status"] == "queued" and job["mode"] == "fed_batch"
+
+        monkeypatch.setattr(settings, "max_job_memory_mb", 0.1)
+        assert client.post("/simulation/jobs", json={"n_points": 4001}).status_code == 413
+    finally:
+        monkeypatch.setattr(job_queue, "_store", None)
+
+
+def test_oversized_bulk_submission_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "max_inline_memory_mb", 1.0)
+    body = {"columns": {"S0": [10.0] * 50}, "n_points": 101}
+    assert client.post("/simulation/bulk", json=body).status_code == 200
+    res = client.post("/simulation/bulk?trajectories=true", json=body)
+    assert res.status_code == 413 and res.json()["detail"]["estimate"]["output_points"] == 5050
+
+
+def test_oversized_optimization_is_rejected(monkeypatch):
+    body = {"bounds": {"feed_rate": [0.0, 0.05]}, "base": {"t_end": 4.0, "n_points": 41}, "generations": 2}
+    small = estimate_optimize(OptimizationRequest(**body))
+    assert small.solver_steps == 3 * 16 * 400
+    large = estimate_optimize(OptimizationRequest(**{**body, "feed_modes": ["constant", "ramp"]}))
+    assert large.solver_steps == 2 * small.solver_steps and large.cpu_seconds > small.cpu_seconds
+
+    monkeypatch.setattr(settings, "max_optimize_cpu_seconds", small.cpu_seconds / 2)
+    res = client.post("/simulation/optimize", json=body)
+    assert res.status_code == 413 and "max_optimize_cpu_seconds" in res.json()["detail"]["message"]
+    assert res.json()["detail"]["estimate"]["backend"] == "numpy"
+
+
+def test_oversized_plant_run_is_rejected(monkeypatch):
+    body = {"vessels": [{"name": "seed"}, {"name": "main"}], "t_end": 4.0, "n_points": 41}
+    body["transfers"] = [{"source": "seed", "target": "main", "time": 2.0}]
+    estimate = estimate_plant(PlantRequest(**body))
+    assert estimate.output_points == 82 and estimate.solver_steps == 401
+    assert client.post("/simulation/plant", json=body).status_code == 200
+
+    monkeypatch.setattr(settings, "max_inline_memory_mb", 1.0)
+    res = client.post("/simulation/plant", json={**body, "n_points": 10_001})
+    assert res.status_code == 413 and "max_inline_memory_mb" in res.json()["detail"]["message"]
+    assert res.json()["detail"]["estimate"]["output_points"] == 20_002
@@ -0,0 +1,71 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from fermentation_sim.api.main import app
+from fermentation_sim.config import settings
+from fermentation_sim.data import result_store
+from fermentation_sim.data.result_store import ResultStore
+
+
+def _trajectory(n: int = 100):
+    t = np.linspace(0.0, 9.9, n)
+    state = np.column_stack([t * (i + 1) for i in range(6)])
+    return t, state
+
+
+def test_read_slices_across_and_within_chunks(tmp_path):
+    store = ResultStore(tmp_path, chunk_rows=16)
+    t, state = _trajectory()
+    info = store.write("abc123", t, state, mode="batch")
+    assert info.n_chunks == 7
+
+    full = store.read("abc123")
+    np.testing.assert_array_equal(full["S"], state[:, 1])
+
+    window = store.read("abc123", ["DO"], t_min=2.0, t_max=6.0)
+    mask = (t >= 2.0) & (t <= 6.0)
+    np.testing.assert_array_equal(window["time"], t[mask])
+    np.testing.assert_array_equal(window["DO"], state[mask, 3])
+
+    # inside one chunk: a read-only view onto the memory-mapped file
+    inner = store.read("abc123", ["X"], t_min=0.0, t_max=1.0)["X"]
+    assert isinstance(inner.base, np.memmap) or isinstance(inner, np.memmap)
+    assert not inner.flags.writeable
+
+
+def test_read_many_skips_unknown_keys(tmp_path):
+    store = ResultStore(tmp_path, chunk_rows=32)
+    t, state = _trajectory()
+    store.write("k1", t, state)
+    store.write("k2", t, state * 2)
+
+    found = store.read_many(["k1", "k2", "missing"], "T", t_min=5.0)
+    assert set(found) == {"k1", "k2"}
+    np.testing.assert_array_equal(found["k2"]["T"], state[t >= 5.0, 4] * 2)
+
+
+def test_run_with_store_then_fetch_slice(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "result_store_dir", str(tmp_path))
+    result_store.get_result_store.cache_clear()
+    client = TestClient(app)
+    try:
+        resp = client.post("/simulation/run?store=true", json={"t_end": 2.0, "n_points": 21})
+        key = resp.json()["meta"]["result_key"]
+
+        sliced = client.get(f"/simulation/results/{key}?variables=X,DO&t_min=1.0").json()
+        assert sliced["time"] == resp.json()["time"][10:]
+        assert sliced["X"] == resp.json()["states"]["X"][10:]
+        assert "S" not in sliced
+    finally:
+        result_store.get_result_store.cache_clear()
+
+
+def test_float32_trajectories_keep_their_dtype(tmp_path):
+    store = ResultStore(tmp_path, chunk_rows=16)
+    t, state = _trajectory()
+    info = store.write("f32", t, state.astype(np.float32))
+
+    assert info.dtype == "<f4"
+    data = store.read("f32", ["T"], t_min=1.0, t_max=5.0)
+    assert data["T"].dtype == np.float32
+    assert data["time"].dtype == np.float64
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi.concurrency import run_in_threadpool
+
+from fermentation_sim.api.dependencies import get_simulation_service
+from fermentation_sim.api.main import app
+from fermentation_sim.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    async def main():
+        flight = SingleFlight()
+        runs = (flight.run("k", lambda: run_in_threadpool(work)) for _ in range(10))
+        results = await asyncio.gather(*runs)
+        return flight, results
+
+    flight, results = asyncio.run(main())
+    assert len(calls) == 1
+    assert len({id(value) for value, _ in results}) == 1
+    assert sum(shared for _, shared in results) == 9
+    assert flight.in_flight() == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    attempts = []
+
+    def fail():
+        attempts.append(1)
+        time.sleep(0.02)
+        raise ValueError("boom")
+
+    async def main():
+        flight = SingleFlight()
+        call = lambda: flight.run("k", lambda: run_in_threadpool(fail))  # noqa: E731
+        outcomes = await asyncio.gather(*(call() for _ in range(5)), return_exceptions=True)
+        again = await asyncio.gather(call(), return_exceptions=True)
+        return outcomes, again
+
+    outcomes, again = asyncio.run(main())
+    assert all(isinstance(exc, ValueError) for exc in outcomes)
+    assert len(attempts) == 2 and isinstance(again[0], ValueError)
+
+
+def test_joining_callers_wait_bounded_time():
+    release = threading.Event()
+
+    async def main():
+        flight = SingleFlight()
+        slow = lambda: release.wait(5) and "done"  # noqa: E731
+        first = asyncio.ensure_future(flight.run("k", lambda: run_in_threadpool(slow)))
+        await asyncio.sleep(0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.run("k", lambda: run_in_threadpool(lambda: "other"), timeout=0.05)
+        release.set()
+        return await first
+
+    assert asyncio.run(main()) == ("done", False)
+
+
+def test_identical_api_requests_collapse_to_one_simulation(monkeypatch):
+    svc = get_simulation_service()
+    original = svc.simulate_async
+    runs = []
+
+    async def slow_run(*args, **kwargs):
+        runs.append(1)
+        await asyncio.sleep(0.1)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(svc, "simulate_async", slow_run)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            body = {"n_points": 51, "t_end": 5.0, "S0": 17.5}
+            return await asyncio.gather(*(client.post("/simulation/run", json=body) for _ in range(20)))
+
+    responses = asyncio.run(main())
+    assert len(runs) == 1
+    assert all(r.status_code == 200 for r in responses)
+    assert len({r.content for r in responses}) == 1
+    assert sorted(r.headers["X-Coalesced"] for r in responses).count("true") == 19
@@ -46,6 +46,53 @@ typedef struct {
     double agit_heat_eff;   // fraction to heat
 } OperatingConditions;
 
+/**
+ * Key metrics tracked during integration. s_threshold is an input; every
+ * other field is written by the integrator. Threshold crossings and interior
+ * extrema are located on the cubic Hermite interpolant of each step.
+ */
+typedef struct {
+    double s_threshold;  // substrate level counted as depleted (g/L)
+    double t_depletion;  // first time S <= s_threshold, NAN if never
+    double DO_min;       // minimum dissolved oxygen (g/L)
+    double t_DO_min;
+    double T_peak;       // maximum temperature (°C)
+    double t_T_peak;
+    double P_final;      // product titer at t_final (g/L)
+    double t_final;
+    double productivity; // (P_final - P0) / (t_final - t_start), g/L/h
+    double y_final[6];   // state at t_final (kept even when y_out is NULL)
+} SummaryMetrics;
+
+#define STOP_MAX_THRESHOLDS 8
+
+/* StopConditions.reason values */
+#define STOP_NONE        0
+#define STOP_THRESHOLD   1  // a state threshold was crossed (index in `which`)
+#define STOP_STEADY      2  // max |dy/dt| stayed below steady_tol for steady_hold
+#define STOP_WALL_CLOCK  3  // max_wall_seconds elapsed
+#define STOP_RHS_EVALS   4  // max_rhs_evals reached
+
+/**
+ * Early termination checked after every step. Disabled criteria are 0
+ * (n_thresholds, steady_tol, max_wall_seconds, max_rhs_evals). The last
+ * four fields are written by the integrator.
+ */
+typedef struct {
+    int n_thresholds;
+    int threshold_var[STOP_MAX_THRESHOLDS];      // state index 0..5
+    int threshold_dir[STOP_MAX_THRESHOLDS];      // -1: stop when y <= value, +1: y >= value
+    double threshold_value[STOP_MAX_THRESHOLDS];
+    double steady_tol;        // max-norm of dy/dt counted as steady
+    double steady_hold;       // time (h) the norm must stay below steady_tol
+    double max_wall_seconds;
+    size_t max_rhs_evals;
+    int reason;               // STOP_*
+    int which;                // threshold index for STOP_THRESHOLD
+    double t_stop;            // time of the last stored point
+    size_t n_completed;       // rows of y_out filled, including y0
+} StopConditions;
+
 /**
  * Computes derivatives for a state vector:
  * state[0] = X (biomass, g/L)
@@ -79,6 +126,109 @@ int integrate_fermentation_rk4(
     const OperatingConditions *ops
 );
 
+/**
+ * integrate_fermentation_rk4 that also fills *summary incrementally.
+ * y_out may be NULL to skip materializing the trajectory.
+ */
+int integrate_fermentation_rk4_summary(
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    SummaryMetrics *summary
+);
+
+/**
+ * General entry point: optional summary tracking (summary may be NULL),
+ * optional early termination (stop may be NULL) and optional trajectory
+ * (y_out may be NULL). When stopped early only stop->n_completed rows of
+ * y_out are written.
+ */
+int integrate_fermentation_rk4_ex(
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    SummaryMetrics *summary,
+    StopConditions *stop
+);
+
+/**
+ * integrate_fermentation_rk4_ex with a float32 trajectory: the state is
+ * integrated in double precision and each row is rounded on output.
+ */
+int integrate_fermentation_rk4_f32(
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    float *y_out,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    SummaryMetrics *summary,
+    StopConditions *stop
+);
+
+/**
+ * Reusable per-thread integration state: the parameter context (with the
+ * scenario-invariant RHS terms precomputed) and the RK4 scratch vectors,
+ * allocated once. Not safe to share between threads.
+ */
+typedef struct FermentationWorkspace FermentationWorkspace;
+
+FermentationWorkspace *fermentation_workspace_create(void);
+void fermentation_workspace_destroy(FermentationWorkspace *ws);
+
+/* Load a scenario and precompute its invariant terms. */
+int fermentation_workspace_set_params(
+    FermentationWorkspace *ws,
+    const KineticParams *params,
+    const OperatingConditions *ops
+);
+
+/**
+ * integrate_fermentation_rk4_ex / _f32 on a workspace; performs no
+ * allocation. At most one of y_out (double) and y_out_f32 (float) may be
+ * non-NULL. params and ops may both be NULL to reuse the scenario last
+ * loaded (returns -3 if none was).
+ */
+int fermentation_workspace_integrate(
+    FermentationWorkspace *ws,
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    float *y_out_f32,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    SummaryMetrics *summary,
+    StopConditions *stop
+);
+
+/**
+ * Integrate n_scenarios independent scenarios over one time grid with one
+ * reusable context. params, ops and y0 are contiguous arrays with one
+ * struct / STATE_DIM row per scenario. y_out (optional) receives
+ * n_scenarios blocks of n_points x 6 rows, y_final (optional) the
+ * n_scenarios x 6 final states; status[i] gets each scenario's integrator
+ * status. Returns the number of scenarios with a nonzero status, or -1 for
+ * invalid arguments.
+ */
+long integrate_fermentation_rk4_batch(
+    const double *time_points,
+    size_t n_points,
+    size_t n_scenarios,
+    const double *y0,
+    double *y_out,
+    double *y_final,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    int *status
+);
+
 #ifdef __cplusplus
 }
 #endif
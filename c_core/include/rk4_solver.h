@@ -10,6 +10,41 @@ typedef void (*ode_func)(
     void *user_data
 );
 
+/**
+ * Called after every completed step with the step's start point (t_prev,
+ * y_prev, dy_prev = f(t_prev, y_prev)) and end point (t, y). Return non-zero
+ * to stop the integration after this step.
+ */
+typedef int (*rk4_step_observer)(
+    size_t step,
+    double t_prev,
+    const double *y_prev,
+    const double *dy_prev,
+    double t,
+    const double *y,
+    void *observer_data
+);
+
+/**
+ * Scratch space for one integration: RK4_WORKSPACE_VECTORS vectors of
+ * state_dim doubles. Reusable across calls with the same state_dim, so hot
+ * loops avoid a malloc/free per call.
+ */
+#define RK4_WORKSPACE_VECTORS 7
+
+typedef struct {
+    size_t state_dim;
+    double *scratch;  // RK4_WORKSPACE_VECTORS * state_dim doubles
+    int owns_scratch;
+} Rk4Workspace;
+
+/* Heap workspace; NULL on allocation failure. */
+Rk4Workspace *rk4_workspace_create(size_t state_dim);
+void rk4_workspace_destroy(Rk4Workspace *ws);
+
+/* Workspace over caller-provided scratch (e.g. a stack array); nothing to free. */
+void rk4_workspace_init(Rk4Workspace *ws, size_t state_dim, double *scratch);
+
 int rk4_integrate(
     ode_func f,
     void *user_data,
@@ -20,4 +55,37 @@ int rk4_integrate(
     double *y_out
 );
 
+/**
+ * rk4_integrate with an optional per-step observer. y_out may be NULL when
+ * only the observer's view of the trajectory is needed. n_completed (may be
+ * NULL) receives the number of time points reached, including the initial one.
+ */
+int rk4_integrate_observed(
+    ode_func f,
+    void *user_data,
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    size_t state_dim,
+    double *y_out,
+    rk4_step_observer observer,
+    void *observer_data,
+    size_t *n_completed
+);
+
+/* rk4_integrate_observed using preallocated scratch: performs no allocation. On
+ * return the first state_dim doubles of ws->scratch hold the last state. */
+int rk4_integrate_ws(
+    Rk4Workspace *ws,
+    ode_func f,
+    void *user_data,
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    rk4_step_observer observer,
+    void *observer_data,
+    size_t *n_completed
+);
+
 #endif
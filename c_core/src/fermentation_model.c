@@ -1,13 +1,30 @@
 #include "fermentation_model.h"
 #include "rk4_solver.h"
 #include <math.h>
+#include <stdlib.h>
 #include <string.h>
+#include <time.h>
 
+#define STATE_DIM 6
+
+/* Parameters plus the terms of the RHS that are constant for a scenario. */
 typedef struct {
     KineticParams params;
     OperatingConditions ops;
+    double kla_corr;   // Kla * aeration^0.5 * (agitation / 300)^0.7, >= 0
+    double agit_pow3;  // max(agitation, 0)^3
+    double UA;
 } ModelContext;
 
+static void model_context_init(ModelContext *ctx, const KineticParams *params, const OperatingConditions *ops) {
+    memcpy(&ctx->params, params, sizeof(KineticParams));
+    memcpy(&ctx->ops, ops, sizeof(OperatingConditions));
+    double kla_corr = params->Kla * pow(fmax(ops->aeration_rate, 1e-6), 0.5) * pow(fmax(ops->agitation_speed, 1e-6) / 300.0, 0.7);
+    ctx->kla_corr = kla_corr < 0.0 ? 0.0 : kla_corr;
+    ctx->agit_pow3 = pow(fmax(ops->agitation_speed, 0.0), 3.0);
+    ctx->UA = params->U * params->A;
+}
+
 static double compute_feed_rate(double t, const OperatingConditions *ops, double DO) {
     if (t < ops->feed_start) {
         return 0.0;
@@ -40,24 +57,9 @@ static double compute_feed_rate(double t, const OperatingConditions *ops, double
     }
 }
 
-static void fermentation_ode_wrapper(
-    double t,
-    const double *state,
-    double *dstate_dt,
-    void *user_data
-) {
-    (void)t; // unused
-    ModelContext *ctx = (ModelContext *)user_data;
-    fermentation_odes(t, state, dstate_dt, &ctx->params, &ctx->ops);
-}
-
-void fermentation_odes(
-    double t,
-    const double *state,
-    double *dstate_dt,
-    const KineticParams *params,
-    const OperatingConditions *ops
-) {
+static void model_odes(double t, const double *state, double *dstate_dt, const ModelContext *ctx) {
+    const KineticParams *params = &ctx->params;
+    const OperatingConditions *ops = &ctx->ops;
     double X  = state[0];
     double S  = state[1];
     double P  = state[2];
@@ -90,11 +92,7 @@ double S_safe = fmax(S, 1e-8);
 
     // Oxygen uptake rate
     double OUR = params->O2_maintenance * X;
-    double Kla = params->Kla;
-    double C_star = params->C_star;
-    double kla_corr = Kla * pow(fmax(ops->aeration_rate, 1e-6), 0.5) * pow(fmax(ops->agitation_speed, 1e-6) / 300.0, 0.7);
-    if (kla_corr < 0.0) kla_corr = 0.0;
-    double OTR = kla_corr * fmax(C_star - DO, 0.0);
+    double OTR = ctx->kla_corr * fmax(params->C_star - DO, 0.0);
 
     double dXdt  = rX;
     double dSdt  = rS;
@@ -103,10 +101,10 @@ double S_safe = fmax(S, 1e-8);
 
     // Heat balance (simplified)
     double Q_gen = params->delta_H * mu * X * V_safe;
-    double Q_loss = params->U * params->A * (T - ops->cooling_temp);
+    double Q_loss = ctx->UA * (T - ops->cooling_temp);
 
     // Agitation heat input (mechanical power -> heat)
-    double agit_power = ops->agit_power_coeff * V_safe * pow(fmax(ops->agitation_speed, 0.0), 3.0);
+    double agit_power = ops->agit_power_coeff * V_safe * ctx->agit_pow3;
     double Q_agit = ops->agit_heat_eff * agit_power;
 
     double dTdt = (Q_gen + Q_agit - Q_loss) / (params->rho * V_safe * params->Cp);
@@ -120,27 +118,469 @@ double S_safe = fmax(S, 1e-8);
     dstate_dt[5] = dVdt;
 }
 
-int integrate_fermentation_rk4(
-    const double *time_points,
-    size_t n_points,
-    const double *y0,
-    double *y_out,
+static void fermentation_ode_wrapper(
+    double t,
+    const double *state,
+    double *dstate_dt,
+    void *user_data
+) {
+    model_odes(t, state, dstate_dt, (const ModelContext *)user_data);
+}
+
+void fermentation_odes(
+    double t,
+    const double *state,
+    double *dstate_dt,
     const KineticParams *params,
     const OperatingConditions *ops
 ) {
     ModelContext ctx;
-    memcpy(&ctx.params, params, sizeof(KineticParams));
-    memcpy(&ctx.ops, ops, sizeof(OperatingConditions));
+    model_context_init(&ctx, params, ops);
+    model_odes(t, state, dstate_dt, &ctx);
+}
+
+/* ---- Summary metrics ---------------------------------------------------- */
+
+typedef struct {
+    ModelContext *ctx;
+    SummaryMetrics *m;
+    double t_start;
+    double P0;
+    int depleted;
+    int has_pending;
+    double t0, t1;
+    double y0[STATE_DIM], f0[STATE_DIM], y1[STATE_DIM];
+} SummaryTracker;
 
-    size_t state_dim = 6;
+/* Cubic Hermite interpolant of component j on [t0, t1] at s in [0, 1]. */
+static double hermite(const SummaryTracker *tr, const double *f1, int j, double s) {
+    double h = tr->t1 - tr->t0;
+    double s2 = s * s, s3 = s2 * s;
+    return (2.0 * s3 - 3.0 * s2 + 1.0) * tr->y0[j]
+        + (s3 - 2.0 * s2 + s) * h * tr->f0[j]
+        + (-2.0 * s3 + 3.0 * s2) * tr->y1[j]
+        + (s3 - s2) * h * f1[j];
+}
 
-    return rk4_integrate(
+/* Interior extremum of component j (sign = -1 for min, +1 for max). */
+static void hermite_extremum(
+    const SummaryTracker *tr, const double *f1, int j, double sign, double *best, double *t_best
+) {
+    double h = tr->t1 - tr->t0;
+    double d = tr->y0[j] - tr->y1[j];
+    double a = 6.0 * d + 3.0 * h * tr->f0[j] + 3.0 * h * f1[j];
+    double b = -6.0 * d - 4.0 * h * tr->f0[j] - 2.0 * h * f1[j];
+    double c = h * tr->f0[j];
+    double roots[2];
+    int n_roots = 0;
+    if (fabs(a) < 1e-300) {
+        if (fabs(b) > 1e-300) roots[n_roots++] = -c / b;
+    } else {
+        double disc = b * b - 4.0 * a * c;
+        if (disc >= 0.0) {
+            double sq = sqrt(disc);
+            roots[n_roots++] = (-b - sq) / (2.0 * a);
+            roots[n_roots++] = (-b + sq) / (2.0 * a);
+        }
+    }
+    for (int r = 0; r < n_roots; ++r) {
+        double s = roots[r];
+        if (s <= 0.0 || s >= 1.0) continue;
+        double v = hermite(tr, f1, j, s);
+        if (sign * (v - *best) > 0.0) {
+            *best = v;
+            *t_best = tr->t0 + s * h;
+        }
+    }
+}
+
+static void summary_update_point(SummaryTracker *tr, double t, const double *y) {
+    SummaryMetrics *m = tr->m;
+    if (y[3] < m->DO_min) { m->DO_min = y[3]; m->t_DO_min = t; }
+    if (y[4] > m->T_peak) { m->T_peak = y[4]; m->t_T_peak = t; }
+    m->P_final = y[2];
+    m->t_final = t;
+    memcpy(m->y_final, y, sizeof(m->y_final));
+}
+
+/* Process the pending step now that f1 = f(t1, y1) is known. */
+static void summary_flush(SummaryTracker *tr, const double *f1) {
+    if (!tr->has_pending) return;
+    SummaryMetrics *m = tr->m;
+    hermite_extremum(tr, f1, 3, -1.0, &m->DO_min, &m->t_DO_min);
+    hermite_extremum(tr, f1, 4, 1.0, &m->T_peak, &m->t_T_peak);
+    if (!tr->depleted && tr->y1[1] <= m->s_threshold) {
+        double lo = 0.0, hi = 1.0;
+        for (int it = 0; it < 60; ++it) {
+            double mid = 0.5 * (lo + hi);
+            if (hermite(tr, f1, 1, mid) > m->s_threshold) lo = mid; else hi = mid;
+        }
+        m->t_depletion = tr->t0 + hi * (tr->t1 - tr->t0);
+        tr->depleted = 1;
+    }
+    tr->has_pending = 0;
+}
+
+static int summary_observer(
+    size_t step,
+    double t_prev,
+    const double *y_prev,
+    const double *dy_prev,
+    double t,
+    const double *y,
+    void *observer_data
+) {
+    (void)step;
+    SummaryTracker *tr = (SummaryTracker *)observer_data;
+    /* dy_prev is f at the previous step's end point: exactly the pending f1 */
+    summary_flush(tr, dy_prev);
+    tr->t0 = t_prev;
+    tr->t1 = t;
+    memcpy(tr->y0, y_prev, sizeof(tr->y0));
+    memcpy(tr->f0, dy_prev, sizeof(tr->f0));
+    memcpy(tr->y1, y, sizeof(tr->y1));
+    tr->has_pending = 1;
+    summary_update_point(tr, t, y);
+    return 0;
+}
+
+static void summary_init(SummaryTracker *tr, ModelContext *ctx, SummaryMetrics *m, double t0, const double *y0) {
+    memset(tr, 0, sizeof(*tr));
+    tr->ctx = ctx;
+    tr->m = m;
+    tr->t_start = t0;
+    tr->P0 = y0[2];
+    m->t_depletion = NAN;
+    m->DO_min = y0[3];
+    m->t_DO_min = t0;
+    m->T_peak = y0[4];
+    m->t_T_peak = t0;
+    m->P_final = y0[2];
+    m->t_final = t0;
+    m->productivity = 0.0;
+    memcpy(m->y_final, y0, sizeof(m->y_final));
+    if (y0[1] <= m->s_threshold) {
+        m->t_depletion = t0;
+        tr->depleted = 1;
+    }
+}
+
+static void summary_finish(SummaryTracker *tr) {
+    if (tr->has_pending) {
+        double f1[STATE_DIM];
+        model_odes(tr->t1, tr->y1, f1, tr->ctx);
+        summary_flush(tr, f1);
+    }
+    SummaryMetrics *m = tr->m;
+    double elapsed = m->t_final - tr->t_start;
+    m->productivity = elapsed > 0.0 ? (m->P_final - tr->P0) / elapsed : 0.0;
+}
+
+/* ---- Early termination ------------------------------------------------- */
+
+static double monotonic_seconds(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + 1e-9 * (double)ts.tv_nsec;
+}
+
+typedef struct {
+    StopConditions *c;
+    double wall_start;
+    double steady_since;  // NAN while not steady
+} StopTracker;
+
+static void stop_init(StopTracker *st, StopConditions *c, double t0) {
+    st->c = c;
+    st->wall_start = c->max_wall_seconds > 0.0 ? monotonic_seconds() : 0.0;
+    st->steady_since = NAN;
+    c->reason = STOP_NONE;
+    c->which = -1;
+    c->t_stop = t0;
+    c->n_completed = 1;
+}
+
+/* Non-zero when the run should end after the step that finished at (t, y). */
+static int stop_check(StopTracker *st, size_t step, double t_prev, const double *dy_prev, double t, const double *y) {
+    StopConditions *c = st->c;
+    c->t_stop = t;
+    c->n_completed = step + 1;
+
+    int n = c->n_thresholds < STOP_MAX_THRESHOLDS ? c->n_thresholds : STOP_MAX_THRESHOLDS;
+    for (int k = 0; k < n; ++k) {
+        double v = y[c->threshold_var[k]];
+        double limit = c->threshold_value[k];
+        if ((c->threshold_dir[k] < 0 && v <= limit) || (c->threshold_dir[k] > 0 && v >= limit)) {
+            c->reason = STOP_THRESHOLD;
+            c->which = k;
+            return 1;
+        }
+    }
+    if (c->steady_tol > 0.0) {
+        double norm = 0.0;
+        for (int j = 0; j < STATE_DIM; ++j) {
+            norm = fmax(norm, fabs(dy_prev[j]));
+        }
+        if (norm < c->steady_tol) {
+            if (isnan(st->steady_since)) st->steady_since = t_prev;
+            if (t - st->steady_since >= c->steady_hold) {
+                c->reason = STOP_STEADY;
+                return 1;
+            }
+        } else {
+            st->steady_since = NAN;
+        }
+    }
+    if (c->max_rhs_evals > 0 && 4 * step >= c->max_rhs_evals) {
+        c->reason = STOP_RHS_EVALS;
+        return 1;
+    }
+    if (c->max_wall_seconds > 0.0 && monotonic_seconds() - st->wall_start >= c->max_wall_seconds) {
+        c->reason = STOP_WALL_CLOCK;
+        return 1;
+    }
+    return 0;
+}
+
+typedef struct {
+    SummaryTracker *summary;
+    StopTracker *stop;
+    float *y_out_f32;  // reduced-precision trajectory written step by step
+} StepObservers;
+
+static int combined_observer(
+    size_t step,
+    double t_prev,
+    const double *y_prev,
+    const double *dy_prev,
+    double t,
+    const double *y,
+    void *observer_data
+) {
+    StepObservers *obs = (StepObservers *)observer_data;
+    if (obs->y_out_f32) {
+        float *row = &obs->y_out_f32[step * STATE_DIM];
+        for (int j = 0; j < STATE_DIM; ++j) row[j] = (float)y[j];
+    }
+    if (obs->summary) {
+        summary_observer(step, t_prev, y_prev, dy_prev, t, y, obs->summary);
+    }
+    return obs->stop ? stop_check(obs->stop, step, t_prev, dy_prev, t, y) : 0;
+}
+
+/* Shared driver: y_out (double) and y_out_f32 (float) are both optional. */
+static int integrate_observed(
+    ModelContext *ctx,
+    Rk4Workspace *rk4,
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    float *y_out_f32,
+    SummaryMetrics *summary,
+    StopConditions *stop
+) {
+    if (n_points < 2) {
+        return -1;
+    }
+    SummaryTracker summary_tracker;
+    StopTracker stop_tracker;
+    StepObservers obs = {NULL, NULL, y_out_f32};
+    if (summary) {
+        summary_init(&summary_tracker, ctx, summary, time_points[0], y0);
+        obs.summary = &summary_tracker;
+    }
+    if (stop) {
+        stop_init(&stop_tracker, stop, time_points[0]);
+        obs.stop = &stop_tracker;
+    }
+    if (y_out_f32) {
+        for (int j = 0; j < STATE_DIM; ++j) y_out_f32[j] = (float)y0[j];
+    }
+
+    int status = rk4_integrate_ws(
+        rk4,
         fermentation_ode_wrapper,
-        (void *)&ctx,
+        (void *)ctx,
         time_points,
         n_points,
         y0,
-        state_dim,
-        y_out
+        y_out,
+        (summary || stop || y_out_f32) ? combined_observer : NULL,
+        (void *)&obs,
+        NULL
     );
+    if (status == 0 && summary) {
+        summary_finish(&summary_tracker);
+    }
+    return status;
+}
+
+/* One-shot entry points: context and scratch live on the stack. */
+static int integrate_once(
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    float *y_out_f32,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    SummaryMetrics *summary,
+    StopConditions *stop
+) {
+    ModelContext ctx;
+    double scratch[RK4_WORKSPACE_VECTORS * STATE_DIM];
+    Rk4Workspace rk4;
+    model_context_init(&ctx, params, ops);
+    rk4_workspace_init(&rk4, STATE_DIM, scratch);
+    return integrate_observed(&ctx, &rk4, time_points, n_points, y0, y_out, y_out_f32, summary, stop);
+}
+
+int integrate_fermentation_rk4(
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    const KineticParams *params,
+    const OperatingConditions *ops
+) {
+    return integrate_once(time_points, n_points, y0, y_out, NULL, params, ops, NULL, NULL);
+}
+
+int integrate_fermentation_rk4_ex(
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    SummaryMetrics *summary,
+    StopConditions *stop
+) {
+    return integrate_once(time_points, n_points, y0, y_out, NULL, params, ops, summary, stop);
+}
+
+int integrate_fermentation_rk4_f32(
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    float *y_out,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    SummaryMetrics *summary,
+    StopConditions *stop
+) {
+    return integrate_once(time_points, n_points, y0, NULL, y_out, params, ops, summary, stop);
+}
+
+int integrate_fermentation_rk4_summary(
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    SummaryMetrics *summary
+) {
+    if (!summary) {
+        return -1;
+    }
+    return integrate_fermentation_rk4_ex(time_points, n_points, y0, y_out, params, ops, summary, NULL);
+}
+
+/* ---- Reusable workspace ------------------------------------------------ */
+
+struct FermentationWorkspace {
+    ModelContext ctx;
+    int has_params;
+    Rk4Workspace rk4;
+    double scratch[RK4_WORKSPACE_VECTORS * STATE_DIM];
+};
+
+FermentationWorkspace *fermentation_workspace_create(void) {
+    FermentationWorkspace *ws = (FermentationWorkspace *)malloc(sizeof(FermentationWorkspace));
+    if (!ws) {
+        return NULL;
+    }
+    ws->has_params = 0;
+    rk4_workspace_init(&ws->rk4, STATE_DIM, ws->scratch);
+    return ws;
+}
+
+void fermentation_workspace_destroy(FermentationWorkspace *ws) {
+    free(ws);
+}
+
+int fermentation_workspace_set_params(
+    FermentationWorkspace *ws,
+    const KineticParams *params,
+    const OperatingConditions *ops
+) {
+    if (!ws || !params || !ops) {
+        return -1;
+    }
+    model_context_init(&ws->ctx, params, ops);
+    ws->has_params = 1;
+    return 0;
+}
+
+int fermentation_workspace_integrate(
+    FermentationWorkspace *ws,
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    float *y_out_f32,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    SummaryMetrics *summary,
+    StopConditions *stop
+) {
+    if (!ws || (y_out && y_out_f32)) {
+        return -1;
+    }
+    if (params && ops) {
+        fermentation_workspace_set_params(ws, params, ops);
+    } else if (!ws->has_params) {
+        return -3;
+    }
+    return integrate_observed(&ws->ctx, &ws->rk4, time_points, n_points, y0, y_out, y_out_f32, summary, stop);
+}
+
+/* ---- Scenario batches --------------------------------------------------- */
+
+long integrate_fermentation_rk4_batch(
+    const double *time_points,
+    size_t n_points,
+    size_t n_scenarios,
+    const double *y0,
+    double *y_out,
+    double *y_final,
+    const KineticParams *params,
+    const OperatingConditions *ops,
+    int *status
+) {
+    if (!time_points || !y0 || !params || !ops || !status || n_points < 2) {
+        return -1;
+    }
+    ModelContext ctx;
+    double scratch[RK4_WORKSPACE_VECTORS * STATE_DIM];
+    Rk4Workspace rk4;
+    rk4_workspace_init(&rk4, STATE_DIM, scratch);
+
+    long failed = 0;
+    for (size_t i = 0; i < n_scenarios; ++i) {
+        model_context_init(&ctx, &params[i], &ops[i]);
+        double *rows = y_out ? &y_out[i * n_points * STATE_DIM] : NULL;
+        status[i] = integrate_observed(
+            &ctx, &rk4, time_points, n_points, &y0[i * STATE_DIM], rows, NULL, NULL, NULL
+        );
+        if (status[i] != 0) {
+            ++failed;
+        } else if (y_final) {
+            /* rk4_integrate_ws leaves the final state in the first scratch vector */
+            memcpy(&y_final[i * STATE_DIM], scratch, STATE_DIM * sizeof(double));
+        }
+    }
+    return failed;
 }
@@ -2,6 +2,38 @@
 #include <stdlib.h>
 #include <string.h>
 
+Rk4Workspace *rk4_workspace_create(size_t state_dim) {
+    if (state_dim == 0) {
+        return NULL;
+    }
+    Rk4Workspace *ws = (Rk4Workspace *)malloc(sizeof(Rk4Workspace));
+    double *scratch = (double *)malloc(RK4_WORKSPACE_VECTORS * state_dim * sizeof(double));
+    if (!ws || !scratch) {
+        free(ws); free(scratch);
+        return NULL;
+    }
+    ws->state_dim = state_dim;
+    ws->scratch = scratch;
+    ws->owns_scratch = 1;
+    return ws;
+}
+
+void rk4_workspace_destroy(Rk4Workspace *ws) {
+    if (!ws) {
+        return;
+    }
+    if (ws->owns_scratch) {
+        free(ws->scratch);
+    }
+    free(ws);
+}
+
+void rk4_workspace_init(Rk4Workspace *ws, size_t state_dim, double *scratch) {
+    ws->state_dim = state_dim;
+    ws->scratch = scratch;
+    ws->owns_scratch = 0;
+}
+
 int rk4_integrate(
     ode_func f,
     void *user_data,
@@ -10,26 +42,68 @@ int rk4_integrate(
     const double *y0,
     size_t state_dim,
     double *y_out
+) {
+    return rk4_integrate_observed(
+        f, user_data, time_points, n_points, y0, state_dim, y_out, NULL, NULL, NULL
+    );
+}
+
+int rk4_integrate_observed(
+    ode_func f,
+    void *user_data,
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    size_t state_dim,
+    double *y_out,
+    rk4_step_observer observer,
+    void *observer_data,
+    size_t *n_completed
 ) {
     if (n_points < 2 || state_dim == 0) {
         return -1;
     }
-
-    double *y = (double *)malloc(state_dim * sizeof(double));
-    double *k1 = (double *)malloc(state_dim * sizeof(double));
-    double *k2 = (double *)malloc(state_dim * sizeof(double));
-    double *k3 = (double *)malloc(state_dim * sizeof(double));
-    double *k4 = (double *)malloc(state_dim * sizeof(double));
-    double *tmp = (double *)malloc(state_dim * sizeof(double));
-
-    if (!y || !k1 || !k2 || !k3 || !k4 || !tmp) {
-        free(y); free(k1); free(k2); free(k3); free(k4); free(tmp);
+    Rk4Workspace *ws = rk4_workspace_create(state_dim);
+    if (!ws) {
         return -2;
     }
+    int status = rk4_integrate_ws(
+        ws, f, user_data, time_points, n_points, y0, y_out, observer, observer_data, n_completed
+    );
+    rk4_workspace_destroy(ws);
+    return status;
+}
+
+int rk4_integrate_ws(
+    Rk4Workspace *ws,
+    ode_func f,
+    void *user_data,
+    const double *time_points,
+    size_t n_points,
+    const double *y0,
+    double *y_out,
+    rk4_step_observer observer,
+    void *observer_data,
+    size_t *n_completed
+) {
+    if (!ws || n_points < 2 || ws->state_dim == 0) {
+        return -1;
+    }
+    size_t state_dim = ws->state_dim;
+    double *y = ws->scratch;
+    double *y_prev = y + state_dim;
+    double *k1 = y_prev + state_dim;
+    double *k2 = k1 + state_dim;
+    double *k3 = k2 + state_dim;
+    double *k4 = k3 + state_dim;
+    double *tmp = k4 + state_dim;
 
     memcpy(y, y0, state_dim * sizeof(double));
-    memcpy(&y_out[0], y0, state_dim * sizeof(double));
+    if (y_out) {
+        memcpy(&y_out[0], y0, state_dim * sizeof(double));
+    }
 
+    size_t completed = 1;
     for (size_t i = 1; i < n_points; ++i) {
         double t = time_points[i - 1];
         double dt = time_points[i] - time_points[i - 1];
@@ -51,13 +125,25 @@ int rk4_integrate(
         }
         f(t + dt, tmp, k4, user_data);
 
+        if (observer) {
+            memcpy(y_prev, y, state_dim * sizeof(double));
+        }
         for (size_t j = 0; j < state_dim; ++j) {
             y[j] += dt * (k1[j] + 2.0 * k2[j] + 2.0 * k3[j] + k4[j]) / 6.0;
         }
 
-        memcpy(&y_out[i * state_dim], y, state_dim * sizeof(double));
+        if (y_out) {
+            memcpy(&y_out[i * state_dim], y, state_dim * sizeof(double));
+        }
+        completed = i + 1;
+
+        if (observer && observer(i, t, y_prev, k1, time_points[i], y, observer_data)) {
+            break;
+        }
     }
 
-    free(y); free(k1); free(k2); free(k3); free(k4); free(tmp);
+    if (n_completed) {
+        *n_completed = completed;
+    }
     return 0;
 }
@@ -1,5 +1,17 @@
 import { useState, useCallback } from "react";
 import { runSimulation } from "../api/client.js";
+import { canSimulateLocally, loadFermentationCore, simulateLocal } from "../wasm/fermentationCore.js";
+
+// Small runs use the WebAssembly core in the browser; anything else, or any
+// local failure, goes through the API.
+async function simulateLocalOrRemote(payload, mode) {
+  if (canSimulateLocally(payload)) {
+    const core = await loadFermentationCore();
+    const local = core && simulateLocal(core, payload, mode);
+    if (local) return local;
+  }
+  return runSimulation(payload, mode);
+}
 
 export function useSimulation() {
   const [loading, setLoading] = useState(false);
@@ -10,7 +22,7 @@ export function useSimulation() {
     try {
       setLoading(true);
       setError(null);
-      const data = await runSimulation(payload, mode);
+      const data = await simulateLocalOrRemote(payload, mode);
       setResult(data);
       return data;
     } catch (err) {
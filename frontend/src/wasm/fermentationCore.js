@@ -0,0 +1,150 @@
+// JS binding for the WebAssembly build of the C core (`make wasm` in c_core).
+// Mirrors FermentationCLib.integrate in backend/src/fermentation_sim/models/c_binding.py.
+
+// Field order of the C structs in c_core/include/fermentation_model.h. Every
+// field is a double except OperatingConditions.feed_mode (int32, padded to 8).
+export const KINETIC_FIELDS = [
+  "mu_max", "Ks", "Yxs", "Ypx", "kd", "Kio", "Kp", "maintenance", "Q10", "T_ref",
+  "Kla", "C_star", "O2_maintenance", "delta_H", "Cp", "U", "A", "rho"
+];
+export const OPERATING_FIELDS = [
+  "volume", "feed_rate", "feed_substrate_conc", "feed_start", "feed_rate_end", "feed_tau",
+  "feed_mode", "do_setpoint", "do_Kp", "aeration_rate", "agitation_speed", "cooling_temp",
+  "coolant_flow", "agit_power_coeff", "agit_heat_eff"
+];
+export const FEED_MODES = { constant: 0, ramp: 1, exponential: 2, do_control: 3 };
+export const STATE_NAMES = ["X", "S", "P", "DO", "T", "V"];
+
+const STATE_DIM = 6;
+const KINETIC_BYTES = KINETIC_FIELDS.length * 8;
+const OPERATING_BYTES = OPERATING_FIELDS.length * 8;
+
+function wasiImports(memory) {
+  return {
+    wasi_snapshot_preview1: {
+      // Only the stop-condition wall clock reads time
+      clock_time_get(_clockId, _precision, resultPtr) {
+        const ns = BigInt(Math.round(performance.now() * 1e6));
+        new DataView(memory().buffer).setBigUint64(resultPtr, ns, true);
+        return 0;
+      }
+    }
+  };
+}
+
+async function wasmBytes(source) {
+  if (source instanceof ArrayBuffer || ArrayBuffer.isView(source)) return source;
+  const resp = source instanceof Response ? source : await fetch(source);
+  if (!resp.ok) throw new Error(`Failed to fetch ${source}: ${resp.status}`);
+  return resp.arrayBuffer();
+}
+
+export class FermentationCore {
+  constructor(instance) {
+    this.exports = instance.exports;
+    if (this.exports._initialize) this.exports._initialize();
+  }
+
+  /** Instantiate from a URL, Response or the .wasm bytes. */
+  static async load(source = "/fermentation.wasm") {
+    let instance = null;
+    const imports = wasiImports(() => instance.exports.memory);
+    ({ instance } = await WebAssembly.instantiate(await wasmBytes(source), imports));
+    return new FermentationCore(instance);
+  }
+
+  /**
+   * Run integration; returns { status, y } with y a Float64Array of
+   * t.length x 6 row-major states. `kinetic` and `ops` are plain objects keyed
+   * by the C field names; feed_mode may be the name or the integer code.
+   */
+  integrate(t, y0, kinetic, ops) {
+    const { malloc, free, integrate_fermentation_rk4: integrate } = this.exports;
+    const n = t.length;
+    const outBytes = n * STATE_DIM * 8;
+    const tPtr = malloc(n * 8);
+    const y0Ptr = malloc(STATE_DIM * 8);
+    const outPtr = malloc(outBytes);
+    const kPtr = malloc(KINETIC_BYTES);
+    const oPtr = malloc(OPERATING_BYTES);
+    try {
+      if (!tPtr || !y0Ptr || !outPtr || !kPtr || !oPtr) throw new Error("wasm malloc failed");
+      // Views are taken after every malloc: memory growth detaches old buffers
+      const buffer = this.exports.memory.buffer;
+      new Float64Array(buffer, tPtr, n).set(t);
+      new Float64Array(buffer, y0Ptr, STATE_DIM).set(y0);
+      const view = new DataView(buffer);
+      KINETIC_FIELDS.forEach((name, i) => view.setFloat64(kPtr + 8 * i, Number(kinetic[name]), true));
+      OPERATING_FIELDS.forEach((name, i) => {
+        if (name === "feed_mode") {
+          const mode = ops.feed_mode;
+          view.setInt32(oPtr + 8 * i, typeof mode === "string" ? FEED_MODES[mode] : mode, true);
+        } else {
+          view.setFloat64(oPtr + 8 * i, Number(ops[name]), true);
+        }
+      });
+
+      const status = integrate(tPtr, n, y0Ptr, outPtr, kPtr, oPtr);
+      const y = new Float64Array(n * STATE_DIM);
+      y.set(new Float64Array(this.exports.memory.buffer, outPtr, n * STATE_DIM));
+      return { status, y };
+    } finally {
+      [tPtr, y0Ptr, outPtr, kPtr, oPtr].forEach((ptr) => ptr && free(ptr));
+    }
+  }
+}
+
+// Larger runs, and payloads the C core cannot run as-is (presets, t_eval,
+// stop conditions, summaries), go to the API
+export const LOCAL_MAX_POINTS = 5000;
+const INITIAL_FIELDS = ["X0", "S0", "P0", "DO0", "T0"];
+const TIME_FIELDS = ["t_start", "t_end", "n_points"];
+
+/** True when `payload` carries every model field and fits a local run. */
+export function canSimulateLocally(payload) {
+  const required = [...INITIAL_FIELDS, ...TIME_FIELDS, ...KINETIC_FIELDS, ...OPERATING_FIELDS];
+  return (
+    required.every((name) => payload[name] !== undefined && payload[name] !== "") &&
+    payload.t_eval == null &&
+    payload.solver_dt == null &&
+    payload.stop == null &&
+    Number(payload.n_points) >= 2 &&
+    Number(payload.n_points) <= LOCAL_MAX_POINTS
+  );
+}
+
+/**
+ * Run `payload` on the wasm core and return the /simulation/run response
+ * shape, or null when the core failed or produced non-finite values.
+ */
+export function simulateLocal(core, payload, mode = "batch") {
+  const n = Number(payload.n_points);
+  const t0 = Number(payload.t_start);
+  const step = (Number(payload.t_end) - t0) / (n - 1);
+  const t = Float64Array.from({ length: n }, (_, i) => (i === n - 1 ? Number(payload.t_end) : t0 + i * step));
+  const y0 = [...INITIAL_FIELDS.map((name) => Number(payload[name])), Number(payload.volume)];
+  const { status, y } = core.integrate(t, y0, payload, payload);
+  if (status !== 0 || !y.every(Number.isFinite)) return null;
+
+  const states = Object.fromEntries(
+    STATE_NAMES.map((name, k) => [name, Array.from({ length: n }, (_, i) => y[i * STATE_DIM + k])])
+  );
+  return {
+    meta: { mode, n_points: n, state_dim: STATE_DIM, dtype: "float64", backend: "wasm", request: payload },
+    time: Array.from(t),
+    states
+  };
+}
+
+let corePromise = null;
+
+/** Shared instance for the app; resolves to null when the module is unavailable. */
+export function loadFermentationCore(source = "/fermentation.wasm") {
+  if (!corePromise) {
+    corePromise = FermentationCore.load(source).catch((err) => {
+      console.warn("WebAssembly core unavailable, using the API:", err);
+      return null;
+    });
+  }
+  return corePromise;
+}
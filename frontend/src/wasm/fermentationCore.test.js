@@ -0,0 +1,48 @@
+import { describe, it, expect } from "vitest";
+import { existsSync, readFileSync } from "node:fs";
+import { fileURLToPath } from "node:url";
+import {
+  FermentationCore,
+  LOCAL_MAX_POINTS,
+  STATE_NAMES,
+  canSimulateLocally,
+  simulateLocal
+} from "./fermentationCore.js";
+import reference from "./fermentationCore.reference.json";
+
+// Built by `make wasm` in c_core; the reference trajectory comes from the native library
+const wasmPath = fileURLToPath(new URL("../../public/fermentation.wasm", import.meta.url));
+const hasWasm = existsSync(wasmPath);
+
+describe("local simulation routing", () => {
+  it("accepts complete small payloads only", () => {
+    expect(canSimulateLocally(reference.payload)).toBe(true);
+    expect(canSimulateLocally({ ...reference.payload, n_points: LOCAL_MAX_POINTS + 1 })).toBe(false);
+    expect(canSimulateLocally({ ...reference.payload, t_eval: [0, 1] })).toBe(false);
+    const { Kla, ...partial } = reference.payload;
+    expect(canSimulateLocally(partial)).toBe(false);
+  });
+});
+
+describe.skipIf(!hasWasm)("wasm core", () => {
+  it("matches the native C library", async () => {
+    const core = await FermentationCore.load(readFileSync(wasmPath));
+    const result = simulateLocal(core, reference.payload, "fed_batch");
+
+    expect(result.meta).toMatchObject({ mode: "fed_batch", backend: "wasm", n_points: 49 });
+    expect(result.time).toEqual(reference.time);
+    STATE_NAMES.forEach((name, k) => {
+      result.states[name].forEach((value, i) => {
+        const expected = reference.state[i][k];
+        expect(Math.abs(value - expected)).toBeLessThanOrEqual(1e-9 * Math.max(1, Math.abs(expected)));
+      });
+    });
+  });
+
+  it("reuses memory across runs", async () => {
+    const core = await FermentationCore.load(readFileSync(wasmPath));
+    const first = simulateLocal(core, reference.payload);
+    const second = simulateLocal(core, reference.payload);
+    expect(second.states).toEqual(first.states);
+  });
+});